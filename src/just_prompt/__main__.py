@@ -8,9 +8,14 @@ import logging
 import os
 import sys
 from dotenv import load_dotenv
-from .server import serve
+from .server import serve, DEFAULT_MAX_CONCURRENT_TOOLS, DEFAULT_MAX_QUEUED_TOOLS
 from .atoms.shared.utils import DEFAULT_MODEL
 from .atoms.shared.validator import print_provider_availability
+from .atoms.shared.execution import parse_provider_concurrency, PROVIDER_CONCURRENCY_ENV
+from .atoms.shared.model_catalog import CATALOG_SNAPSHOT_ENV
+from .atoms.shared.correction_memo import CORRECTION_DB_ENV
+from .atoms.shared.response_cache import RESPONSE_CACHE_ENV, RESPONSE_CACHE_TTL_ENV
+from .atoms.shared.startup_profile import profile_startup, format_startup_profile
 
 # Load environment variables
 load_dotenv()
@@ -40,6 +45,78 @@ def main():
         default="INFO",
         help="Logging level"
     )
+    parser.add_argument(
+        "--max-concurrent-tools",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT_TOOLS,
+        help="Maximum number of tool calls executing concurrently"
+    )
+    parser.add_argument(
+        "--max-queued-tools",
+        type=int,
+        default=DEFAULT_MAX_QUEUED_TOOLS,
+        help="Maximum number of tool calls waiting for a free slot before new calls are rejected"
+    )
+    parser.add_argument(
+        "--provider-concurrency",
+        default=os.environ.get(PROVIDER_CONCURRENCY_ENV),
+        help="Comma-separated per-provider concurrency limits, e.g. 'ollama=1,openai=32'"
+    )
+    parser.add_argument(
+        "--hedge-requests",
+        action="store_true",
+        default=None,
+        help="Send a duplicate request when an async model call outlives its p95 latency (capped per provider)"
+    )
+    parser.add_argument(
+        "--catalog-ttl",
+        type=float,
+        default=None,
+        help="Seconds a provider's model list is cached before it is refreshed in the background (default: 600)"
+    )
+    parser.add_argument(
+        "--catalog-snapshot",
+        default=os.environ.get(CATALOG_SNAPSHOT_ENV),
+        help="JSON file to persist model catalogs to, so a restarted server starts with warm catalogs"
+    )
+    parser.add_argument(
+        "--correction-db",
+        default=os.environ.get(CORRECTION_DB_ENV),
+        help="SQLite file remembering model name corrections (default: ~/.cache/just-prompt/corrections.sqlite3)"
+    )
+    parser.add_argument(
+        "--response-cache",
+        default=os.environ.get(RESPONSE_CACHE_ENV),
+        help="Cache model responses in this SQLite file (':memory:' keeps them in memory only); disabled by default"
+    )
+    parser.add_argument(
+        "--response-cache-ttl",
+        type=float,
+        default=float(os.environ[RESPONSE_CACHE_TTL_ENV]) if os.environ.get(RESPONSE_CACHE_TTL_ENV) else None,
+        help="Seconds a cached response stays valid (default: 86400)"
+    )
+    parser.add_argument(
+        "--similarity-threshold",
+        type=float,
+        default=None,
+        help="Also match cached prompts that are near-duplicates (estimated Jaccard similarity at or above this, e.g. 0.9)"
+    )
+    parser.add_argument(
+        "--similar-prompts",
+        choices=["serve", "offer"],
+        default="serve",
+        help="Answer near-duplicate prompts from the cache ('serve') or call the model and show the cached answer too ('offer')"
+    )
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Don't import providers and prefetch their model catalogs in the background at startup"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report the import and client construction cost of the server and each provider, then exit"
+    )
     parser.add_argument(
         "--show-providers",
         action="store_true",
@@ -51,6 +128,11 @@ def main():
     # Set logging level
     logging.getLogger().setLevel(getattr(logging, args.log_level))
     
+    # If --profile-startup flag is provided, exit after reporting the startup cost
+    if args.profile_startup:
+        print(format_startup_profile(profile_startup()))
+        sys.exit(0)
+    
     # Show provider availability
     print_provider_availability()
     
@@ -60,7 +142,21 @@ def main():
     
     try:
         # Start server (asyncio)
-        asyncio.run(serve(args.default_models))
+        asyncio.run(serve(
+            args.default_models,
+            max_concurrent_tools=args.max_concurrent_tools,
+            max_queued_tools=args.max_queued_tools,
+            provider_concurrency=parse_provider_concurrency(args.provider_concurrency),
+            hedge_requests=args.hedge_requests,
+            catalog_ttl=args.catalog_ttl,
+            catalog_snapshot=args.catalog_snapshot,
+            correction_db=args.correction_db,
+            response_cache=args.response_cache,
+            response_cache_ttl=args.response_cache_ttl,
+            similarity_threshold=args.similarity_threshold,
+            similar_prompts=args.similar_prompts,
+            warmup=not args.no_warmup,
+        ))
     except Exception as e:
         logger.error(f"Error starting server: {e}")
         sys.exit(1)
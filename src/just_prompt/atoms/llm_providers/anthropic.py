@@ -4,19 +4,46 @@ Anthropic provider implementation.
 
 import os
 import re
-import anthropic
-from typing import List, Tuple
+from typing import List, Tuple, Union
 import logging
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from ..shared.rate_limiter import estimate_tokens, observe_headers
+from ..shared.deadline import timeout_options
+from ..shared.prompt_cache import CacheablePrompt, record_cache_usage
+from ..shared.lazy import Lazy
+from ..shared.data_types import ModelSpec
+from ..shared.utils import as_model_spec
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize Anthropic client
-client = anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+# Shortest prefix Anthropic caches; a breakpoint before a shorter one is ignored
+MIN_CACHEABLE_TOKENS = 1024
+
+
+# Anthropic clients are built, and the SDK imported, on first use
+# SDK retries are disabled; the router applies the shared retry policy
+def _build_client():
+    import anthropic
+    return anthropic.Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"), max_retries=0)
+
+
+def _build_async_client():
+    import anthropic
+    return anthropic.AsyncAnthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"), max_retries=0)
+
+
+_client = Lazy(_build_client)
+_async_client = Lazy(_build_async_client)
+
+
+def get_client():
+    """Get the shared Anthropic client, building it on first use."""
+    return _client.get()
+
+
+def get_async_client():
+    """Get the shared async Anthropic client, building it on first use."""
+    return _async_client.get()
 
 
 def parse_thinking_suffix(model: str) -> Tuple[str, int]:
@@ -75,6 +102,42 @@ def parse_thinking_suffix(model: str) -> Tuple[str, int]:
         return base_model, 0
 
 
+def _user_message(text: str) -> dict:
+    """
+    Build the user message, with a cache breakpoint after the stable prefix of a CacheablePrompt
+    when the prefix is long enough to be cached.
+    
+    Args:
+        text: The prompt text
+        
+    Returns:
+        Message dictionary for the Messages API
+    """
+    if (
+        isinstance(text, CacheablePrompt)
+        and text.suffix
+        and estimate_tokens(text.prefix) >= MIN_CACHEABLE_TOKENS
+    ):
+        return {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": text.prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": text.suffix},
+            ],
+        }
+    return {"role": "user", "content": str(text)}
+
+
+def _record_usage(model: str, message) -> None:
+    """Report the input tokens the call read from Anthropic's prompt cache."""
+    usage = getattr(message, "usage", None)
+    cache_read = getattr(usage, "cache_read_input_tokens", None)
+    if not isinstance(cache_read, int):
+        return
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    record_cache_usage("anthropic", model, usage.input_tokens + cache_read + cache_write, cache_read)
+
+
 def prompt_with_thinking(text: str, model: str, thinking_budget: int) -> str:
     """
     Send a prompt to Anthropic Claude with thinking enabled and get a response.
@@ -93,15 +156,19 @@ def prompt_with_thinking(text: str, model: str, thinking_budget: int) -> str:
         max_tokens = thinking_budget + 1000  # Adding 1000 tokens for the response
         
         logger.info(f"Sending prompt to Anthropic model {model} with thinking budget {thinking_budget}")
-        message = client.messages.create(
+        raw_response = get_client().messages.with_raw_response.create(
             model=model,
             max_tokens=max_tokens,
             thinking={
                 "type": "enabled",
                 "budget_tokens": thinking_budget,
             },
-            messages=[{"role": "user", "content": text}]
+            messages=[_user_message(text)],
+            **timeout_options(),
         )
+        observe_headers("anthropic", raw_response.headers)
+        message = raw_response.parse()
+        _record_usage(model, message)
         
         # Extract the response from the message content
         # Filter out thinking blocks and only get text blocks
@@ -113,10 +180,10 @@ def prompt_with_thinking(text: str, model: str, thinking_budget: int) -> str:
         return text_blocks[0].text
     except Exception as e:
         logger.error(f"Error sending prompt with thinking to Anthropic: {e}")
-        raise ValueError(f"Failed to get response from Anthropic with thinking: {str(e)}")
+        raise ValueError(f"Failed to get response from Anthropic with thinking: {str(e)}") from e
 
 
-def prompt(text: str, model: str) -> str:
+def prompt(text: str, model: Union[str, ModelSpec]) -> str:
     """
     Send a prompt to Anthropic Claude and get a response.
     
@@ -124,13 +191,14 @@ def prompt(text: str, model: str) -> str:
     
     Args:
         text: The prompt text
-        model: The model name, optionally with thinking suffix
+        model: The model name, optionally with thinking suffix, or its parsed ModelSpec
         
     Returns:
         Response string from the model
     """
-    # Parse the model name to check for thinking suffixes
-    base_model, thinking_budget = parse_thinking_suffix(model)
+    # Model strings are parsed once, by the router or here
+    spec = as_model_spec("anthropic", model)
+    base_model, thinking_budget = spec.base_model, spec.thinking_budget
     
     # If thinking budget is specified, use prompt_with_thinking
     if thinking_budget > 0:
@@ -139,9 +207,13 @@ def prompt(text: str, model: str) -> str:
     # Otherwise, use regular prompt
     try:
         logger.info(f"Sending prompt to Anthropic model: {base_model}")
-        message = client.messages.create(
-            model=base_model, max_tokens=4096, messages=[{"role": "user", "content": text}]
+        raw_response = get_client().messages.with_raw_response.create(
+            model=base_model, max_tokens=4096, messages=[_user_message(text)],
+            **timeout_options(),
         )
+        observe_headers("anthropic", raw_response.headers)
+        message = raw_response.parse()
+        _record_usage(base_model, message)
 
         # Extract the response from the message content
         # Get only text blocks
@@ -153,7 +225,88 @@ def prompt(text: str, model: str) -> str:
         return text_blocks[0].text
     except Exception as e:
         logger.error(f"Error sending prompt to Anthropic: {e}")
-        raise ValueError(f"Failed to get response from Anthropic: {str(e)}")
+        raise ValueError(f"Failed to get response from Anthropic: {str(e)}") from e
+
+
+async def aprompt_with_thinking(text: str, model: str, thinking_budget: int) -> str:
+    """
+    Send a prompt to Anthropic Claude with thinking enabled using the async client.
+    
+    Args:
+        text: The prompt text
+        model: The base model name (without thinking suffix)
+        thinking_budget: The token budget for thinking
+        
+    Returns:
+        Response string from the model
+    """
+    try:
+        max_tokens = thinking_budget + 1000  # Adding 1000 tokens for the response
+        
+        logger.info(f"Sending async prompt to Anthropic model {model} with thinking budget {thinking_budget}")
+        raw_response = await get_async_client().messages.with_raw_response.create(
+            model=model,
+            max_tokens=max_tokens,
+            thinking={
+                "type": "enabled",
+                "budget_tokens": thinking_budget,
+            },
+            messages=[_user_message(text)],
+            **timeout_options(),
+        )
+        observe_headers("anthropic", raw_response.headers)
+        message = raw_response.parse()
+        _record_usage(model, message)
+        
+        text_blocks = [block for block in message.content if block.type == "text"]
+        
+        if not text_blocks:
+            raise ValueError("No text content found in response")
+            
+        return text_blocks[0].text
+    except Exception as e:
+        logger.error(f"Error sending async prompt with thinking to Anthropic: {e}")
+        raise ValueError(f"Failed to get response from Anthropic with thinking: {str(e)}") from e
+
+
+async def aprompt(text: str, model: Union[str, ModelSpec]) -> str:
+    """
+    Send a prompt to Anthropic Claude using the async client and get a response.
+    
+    Automatically handles thinking suffixes in the model name (e.g., claude-3-7-sonnet-20250219:4k)
+    
+    Args:
+        text: The prompt text
+        model: The model name, optionally with thinking suffix, or its parsed ModelSpec
+        
+    Returns:
+        Response string from the model
+    """
+    spec = as_model_spec("anthropic", model)
+    base_model, thinking_budget = spec.base_model, spec.thinking_budget
+    
+    if thinking_budget > 0:
+        return await aprompt_with_thinking(text, base_model, thinking_budget)
+    
+    try:
+        logger.info(f"Sending async prompt to Anthropic model: {base_model}")
+        raw_response = await get_async_client().messages.with_raw_response.create(
+            model=base_model, max_tokens=4096, messages=[_user_message(text)],
+            **timeout_options(),
+        )
+        observe_headers("anthropic", raw_response.headers)
+        message = raw_response.parse()
+        _record_usage(base_model, message)
+
+        text_blocks = [block for block in message.content if block.type == "text"]
+        
+        if not text_blocks:
+            raise ValueError("No text content found in response")
+            
+        return text_blocks[0].text
+    except Exception as e:
+        logger.error(f"Error sending async prompt to Anthropic: {e}")
+        raise ValueError(f"Failed to get response from Anthropic: {str(e)}") from e
 
 
 def list_models() -> List[str]:
@@ -165,7 +318,7 @@ def list_models() -> List[str]:
     """
     try:
         logger.info("Listing Anthropic models")
-        response = client.models.list()
+        response = get_client().models.list()
 
         models = [model.id for model in response.data]
         return models
@@ -181,4 +334,22 @@ def list_models() -> List[str]:
             "claude-3-sonnet-20240229",
             "claude-3-haiku-20240307",
             "claude-3-5-haiku",
-        ]
\ No newline at end of file
+        ]
+
+
+async def alist_models() -> List[str]:
+    """
+    List available Anthropic models using the async client.
+
+    Opens the async client's pooled connection, which the server's prompt calls reuse.
+
+    Returns:
+        List of model names
+    """
+    try:
+        logger.info("Listing Anthropic models (async)")
+        response = await get_async_client().models.list()
+        return [model.id for model in response.data]
+    except Exception as e:
+        logger.error(f"Error listing Anthropic models: {e}")
+        raise ValueError(f"Failed to list Anthropic models: {str(e)}") from e
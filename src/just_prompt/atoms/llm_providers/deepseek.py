@@ -3,50 +3,124 @@ DeepSeek provider implementation.
 """
 
 import os
-from typing import List
+from typing import List, Union
 import logging
-from openai import OpenAI
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from ..shared.rate_limiter import observe_headers
+from ..shared.deadline import timeout_options
+from ..shared.prompt_cache import record_cache_usage
+from ..shared.lazy import Lazy
+from ..shared.data_types import ModelSpec
+from ..shared.utils import as_model_spec
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize DeepSeek client with OpenAI-compatible interface
-client = OpenAI(
-    api_key=os.environ.get("DEEPSEEK_API_KEY"),
-    base_url="https://api.deepseek.com"
-)
 
+# DeepSeek clients use the OpenAI-compatible interface; they are built, and the
+# SDK imported, on first use
+# SDK retries are disabled; the router applies the shared retry policy
+def _build_client():
+    from openai import OpenAI
+    return OpenAI(
+        api_key=os.environ.get("DEEPSEEK_API_KEY"),
+        base_url="https://api.deepseek.com",
+        max_retries=0,
+    )
+
+
+def _build_async_client():
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(
+        api_key=os.environ.get("DEEPSEEK_API_KEY"),
+        base_url="https://api.deepseek.com",
+        max_retries=0,
+    )
+
+
+_client = Lazy(_build_client)
+_async_client = Lazy(_build_async_client)
+
+
+def get_client():
+    """Get the shared DeepSeek client, building it on first use."""
+    return _client.get()
+
+
+def get_async_client():
+    """Get the shared async DeepSeek client, building it on first use."""
+    return _async_client.get()
+
+
+def _record_usage(model: str, response) -> None:
+    """Report the input tokens the call read from DeepSeek's context cache."""
+    usage = getattr(response, "usage", None)
+    cached = getattr(usage, "prompt_cache_hit_tokens", None)
+    if isinstance(cached, int):
+        record_cache_usage("deepseek", model, usage.prompt_tokens, cached)
 
-def prompt(text: str, model: str) -> str:
+
+def prompt(text: str, model: Union[str, ModelSpec]) -> str:
     """
     Send a prompt to DeepSeek and get a response.
     
     Args:
         text: The prompt text
-        model: The model name
+        model: The model name, or its parsed ModelSpec
         
     Returns:
         Response string from the model
     """
+    model = as_model_spec("deepseek", model).base_model
     try:
         logger.info(f"Sending prompt to DeepSeek model: {model}")
         
         # Create chat completion
-        response = client.chat.completions.create(
+        raw_response = get_client().chat.completions.with_raw_response.create(
             model=model,
             messages=[{"role": "user", "content": text}],
             stream=False,
+            **timeout_options(),
         )
+        observe_headers("deepseek", raw_response.headers)
+        response = raw_response.parse()
+        _record_usage(model, response)
         
         # Extract response content
         return response.choices[0].message.content
     except Exception as e:
         logger.error(f"Error sending prompt to DeepSeek: {e}")
-        raise ValueError(f"Failed to get response from DeepSeek: {str(e)}")
+        raise ValueError(f"Failed to get response from DeepSeek: {str(e)}") from e
+
+
+async def aprompt(text: str, model: Union[str, ModelSpec]) -> str:
+    """
+    Send a prompt to DeepSeek using the async client and get a response.
+    
+    Args:
+        text: The prompt text
+        model: The model name, or its parsed ModelSpec
+        
+    Returns:
+        Response string from the model
+    """
+    model = as_model_spec("deepseek", model).base_model
+    try:
+        logger.info(f"Sending async prompt to DeepSeek model: {model}")
+        
+        raw_response = await get_async_client().chat.completions.with_raw_response.create(
+            model=model,
+            messages=[{"role": "user", "content": text}],
+            stream=False,
+            **timeout_options(),
+        )
+        observe_headers("deepseek", raw_response.headers)
+        response = raw_response.parse()
+        _record_usage(model, response)
+        
+        return response.choices[0].message.content
+    except Exception as e:
+        logger.error(f"Error sending async prompt to DeepSeek: {e}")
+        raise ValueError(f"Failed to get response from DeepSeek: {str(e)}") from e
 
 
 def list_models() -> List[str]:
@@ -58,7 +132,7 @@ def list_models() -> List[str]:
     """
     try:
         logger.info("Listing DeepSeek models")
-        response = client.models.list()
+        response = get_client().models.list()
         
         # Extract model IDs
         models = [model.id for model in response.data]
@@ -74,4 +148,22 @@ def list_models() -> List[str]:
             "deepseek-reasoner",
             "deepseek-coder-v2",
             "deepseek-reasoner-lite"
-        ]
\ No newline at end of file
+        ]
+
+
+async def alist_models() -> List[str]:
+    """
+    List available DeepSeek models using the async client.
+
+    Opens the async client's pooled connection, which the server's prompt calls reuse.
+
+    Returns:
+        List of model names
+    """
+    try:
+        logger.info("Listing DeepSeek models (async)")
+        response = await get_async_client().models.list()
+        return [model.id for model in response.data]
+    except Exception as e:
+        logger.error(f"Error listing DeepSeek models: {e}")
+        raise ValueError(f"Failed to list DeepSeek models: {str(e)}") from e
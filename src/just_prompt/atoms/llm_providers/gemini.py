@@ -2,45 +2,76 @@
 Google Gemini provider implementation.
 """
 
+import asyncio
 import os
 import re
-from typing import List, Tuple
+from typing import Any, List, Optional, Tuple, Union
 import logging
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from ..shared.deadline import remaining_time, timeout_options
+from ..shared.lazy import Lazy
+from ..shared.data_types import ModelSpec
+from ..shared.utils import as_model_spec
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Try different import approaches for google.genai
-# Note: There are two different packages that provide Google Gemini functionality:
-# 1. google-genai: Using "from google import genai" approach (newer Client API)
-# 2. google-generativeai: Using "import google.generativeai as genai" approach (older API)
-# We support both to ensure compatibility in different environments
-try:
-    # First try the google-genai package approach with Client API
-    from google import genai
-    logger.info("Successfully imported from google import genai")
-    client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
-    USE_CLIENT_API = True
-except ImportError:
+
+def _load_genai() -> Tuple[Any, Optional[Any], bool]:
+    """
+    Import the installed Gemini package and build its client, on first use.
+
+    There are two different packages that provide Google Gemini functionality:
+    1. google-genai: Using "from google import genai" approach (newer Client API)
+    2. google-generativeai: Using "import google.generativeai as genai" approach (older API)
+    We support both to ensure compatibility in different environments.
+
+    Returns:
+        Tuple of (genai module, client or None, whether the Client API is used)
+    """
     try:
-        # Fallback to google.generativeai package
-        import google.generativeai as genai
-        logger.info("Successfully imported google.generativeai")
-        genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
-        USE_CLIENT_API = False
+        # First try the google-genai package approach with Client API
+        from google import genai
+        logger.info("Successfully imported from google import genai")
+        return genai, genai.Client(api_key=os.environ.get("GEMINI_API_KEY")), True
     except ImportError:
-        logger.error("Failed to import any Gemini module")
-        # If neither package is available, log a clear error message
-        raise ImportError("Failed to import Google Gemini APIs. Make sure either 'google-genai' or 'google-generativeai' package is installed.")
+        try:
+            # Fallback to google.generativeai package
+            import google.generativeai as genai
+            logger.info("Successfully imported google.generativeai")
+            genai.configure(api_key=os.environ.get("GEMINI_API_KEY"))
+            return genai, None, False
+        except ImportError:
+            logger.error("Failed to import any Gemini module")
+            # If neither package is available, log a clear error message
+            raise ImportError("Failed to import Google Gemini APIs. Make sure either 'google-genai' or 'google-generativeai' package is installed.")
+
+
+_genai = Lazy(_load_genai)
+
+
+def get_client():
+    """Get the shared Gemini client (None with the older google.generativeai API), building it on first use."""
+    return _genai.get()[1]
+
 
 # Models that support thinking_budget
 THINKING_ENABLED_MODELS = ["gemini-2.5-flash-preview-04-17"]
 
 
+def _http_options():
+    """
+    Build per-request HTTP options carrying the current call deadline.
+
+    Returns:
+        HttpOptions with a timeout (in milliseconds), or None without a deadline
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return None
+    genai = _genai.get()[0]
+    return genai.types.HttpOptions(timeout=max(1, int(remaining * 1000)))
+
+
 def parse_thinking_suffix(model: str) -> Tuple[str, int]:
     """
     Parse a model name to check for thinking token budget suffixes.
@@ -120,10 +151,11 @@ def prompt_with_thinking(text: str, model: str, thinking_budget: int) -> str:
     Returns:
         Response string from the model
     """
+    genai, client, use_client_api = _genai.get()
     try:
         logger.info(f"Sending prompt to Gemini model {model} with thinking budget {thinking_budget}")
         
-        if USE_CLIENT_API:
+        if use_client_api:
             # Using google-genai Client API
             response = client.models.generate_content(
                 model=model,
@@ -131,7 +163,8 @@ def prompt_with_thinking(text: str, model: str, thinking_budget: int) -> str:
                 config=genai.types.GenerateContentConfig(
                     thinking_config=genai.types.ThinkingConfig(
                         thinking_budget=thinking_budget
-                    )
+                    ),
+                    http_options=_http_options(),
                 )
             )
         else:
@@ -143,16 +176,17 @@ def prompt_with_thinking(text: str, model: str, thinking_budget: int) -> str:
                     # The old API may not support thinking_config directly
                     # This is a placeholder - actual implementation may vary
                     # depending on the API version
-                )
+                ),
+                request_options=timeout_options(),
             )
         
         return response.text
     except Exception as e:
         logger.error(f"Error sending prompt with thinking to Gemini: {e}")
-        raise ValueError(f"Failed to get response from Gemini with thinking: {str(e)}")
+        raise ValueError(f"Failed to get response from Gemini with thinking: {str(e)}") from e
 
 
-def prompt(text: str, model: str) -> str:
+def prompt(text: str, model: Union[str, ModelSpec]) -> str:
     """
     Send a prompt to Google Gemini and get a response.
     
@@ -160,37 +194,120 @@ def prompt(text: str, model: str) -> str:
     
     Args:
         text: The prompt text
-        model: The model name, optionally with thinking suffix
+        model: The model name, optionally with thinking suffix, or its parsed ModelSpec
         
     Returns:
         Response string from the model
     """
-    # Parse the model name to check for thinking suffixes
-    base_model, thinking_budget = parse_thinking_suffix(model)
+    # Model strings are parsed once, by the router or here
+    spec = as_model_spec("gemini", model)
+    base_model, thinking_budget = spec.base_model, spec.thinking_budget
     
     # If thinking budget is specified, use prompt_with_thinking
     if thinking_budget > 0:
         return prompt_with_thinking(text, base_model, thinking_budget)
     
     # Otherwise, use regular prompt
+    genai, client, use_client_api = _genai.get()
     try:
         logger.info(f"Sending prompt to Gemini model: {base_model}")
         
-        if USE_CLIENT_API:
+        if use_client_api:
             # Using google-genai Client API
             response = client.models.generate_content(
                 model=base_model,
-                contents=text
+                contents=text,
+                config=genai.types.GenerateContentConfig(http_options=_http_options()),
             )
         else:
             # Using google.generativeai API
             gemini_model = genai.GenerativeModel(model_name=base_model)
-            response = gemini_model.generate_content(text)
+            response = gemini_model.generate_content(text, request_options=timeout_options())
         
         return response.text
     except Exception as e:
         logger.error(f"Error sending prompt to Gemini: {e}")
-        raise ValueError(f"Failed to get response from Gemini: {str(e)}")
+        raise ValueError(f"Failed to get response from Gemini: {str(e)}") from e
+
+
+async def aprompt_with_thinking(text: str, model: str, thinking_budget: int) -> str:
+    """
+    Send a prompt to Google Gemini with thinking enabled using the async API.
+    
+    Args:
+        text: The prompt text
+        model: The base model name (without thinking suffix)
+        thinking_budget: The token budget for thinking
+        
+    Returns:
+        Response string from the model
+    """
+    genai, client, use_client_api = _genai.get()
+    try:
+        logger.info(f"Sending async prompt to Gemini model {model} with thinking budget {thinking_budget}")
+        
+        if use_client_api:
+            # Using google-genai aio Client API
+            response = await client.aio.models.generate_content(
+                model=model,
+                contents=text,
+                config=genai.types.GenerateContentConfig(
+                    thinking_config=genai.types.ThinkingConfig(
+                        thinking_budget=thinking_budget
+                    ),
+                    http_options=_http_options(),
+                )
+            )
+        else:
+            # Using google.generativeai API
+            gemini_model = genai.GenerativeModel(model_name=model)
+            response = await gemini_model.generate_content_async(text, request_options=timeout_options())
+        
+        return response.text
+    except Exception as e:
+        logger.error(f"Error sending async prompt with thinking to Gemini: {e}")
+        raise ValueError(f"Failed to get response from Gemini with thinking: {str(e)}") from e
+
+
+async def aprompt(text: str, model: Union[str, ModelSpec]) -> str:
+    """
+    Send a prompt to Google Gemini using the async API and get a response.
+    
+    Automatically handles thinking suffixes in the model name (e.g., gemini-2.5-flash-preview-04-17:4k)
+    
+    Args:
+        text: The prompt text
+        model: The model name, optionally with thinking suffix, or its parsed ModelSpec
+        
+    Returns:
+        Response string from the model
+    """
+    spec = as_model_spec("gemini", model)
+    base_model, thinking_budget = spec.base_model, spec.thinking_budget
+    
+    if thinking_budget > 0:
+        return await aprompt_with_thinking(text, base_model, thinking_budget)
+    
+    genai, client, use_client_api = _genai.get()
+    try:
+        logger.info(f"Sending async prompt to Gemini model: {base_model}")
+        
+        if use_client_api:
+            # Using google-genai aio Client API
+            response = await client.aio.models.generate_content(
+                model=base_model,
+                contents=text,
+                config=genai.types.GenerateContentConfig(http_options=_http_options()),
+            )
+        else:
+            # Using google.generativeai API
+            gemini_model = genai.GenerativeModel(model_name=base_model)
+            response = await gemini_model.generate_content_async(text, request_options=timeout_options())
+        
+        return response.text
+    except Exception as e:
+        logger.error(f"Error sending async prompt to Gemini: {e}")
+        raise ValueError(f"Failed to get response from Gemini: {str(e)}") from e
 
 
 def list_models() -> List[str]:
@@ -201,12 +318,13 @@ def list_models() -> List[str]:
         List of model names
     """
     try:
+        genai, client, use_client_api = _genai.get()
         logger.info("Listing Gemini models")
         
         # Get the list of models
         models = []
         
-        if USE_CLIENT_API:
+        if use_client_api:
             # Using google-genai Client API
             available_models = client.list_models()
             for m in available_models:
@@ -229,4 +347,28 @@ def list_models() -> List[str]:
         return [
             "gemini-2.5-flash-preview-04-17",
             "gemini-2.5-pro-preview-03-25"
-        ]
\ No newline at end of file
+        ]
+
+
+async def alist_models() -> List[str]:
+    """
+    List available Google Gemini models using the async client.
+
+    Opens the async client's pooled connection, which the server's prompt calls reuse.
+
+    Returns:
+        List of model names
+    """
+    genai, client, use_client_api = _genai.get()
+    if not use_client_api:
+        # google.generativeai has no async API
+        return await asyncio.to_thread(list_models)
+    try:
+        logger.info("Listing Gemini models (async)")
+        models = []
+        async for m in await client.aio.models.list():
+            models.append(m.name.replace("models/", ""))
+        return models
+    except Exception as e:
+        logger.error(f"Error listing Gemini models: {e}")
+        raise ValueError(f"Failed to list Gemini models: {str(e)}") from e
@@ -3,54 +3,112 @@ Groq provider implementation.
 """
 
 import os
-from typing import List
+from typing import List, Union
 import logging
-from groq import Groq
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from ..shared.rate_limiter import observe_headers
+from ..shared.deadline import timeout_options
+from ..shared.lazy import Lazy
+from ..shared.data_types import ModelSpec
+from ..shared.utils import as_model_spec
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize Groq client
-client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+
+# Groq clients are built, and the SDK imported, on first use
+# SDK retries are disabled; the router applies the shared retry policy
+def _build_client():
+    from groq import Groq
+    return Groq(api_key=os.environ.get("GROQ_API_KEY"), max_retries=0)
+
+
+def _build_async_client():
+    from groq import AsyncGroq
+    return AsyncGroq(api_key=os.environ.get("GROQ_API_KEY"), max_retries=0)
+
+
+_client = Lazy(_build_client)
+_async_client = Lazy(_build_async_client)
+
+
+def get_client():
+    """Get the shared Groq client, building it on first use."""
+    return _client.get()
+
+
+def get_async_client():
+    """Get the shared async Groq client, building it on first use."""
+    return _async_client.get()
+
+# Map model names that need conversion
+MODEL_MAPPING = {
+    "qwen-2.5-32b": "qwen-qwq-32b"
+}
 
 
-def prompt(text: str, model: str) -> str:
+def prompt(text: str, model: Union[str, ModelSpec]) -> str:
     """
     Send a prompt to Groq and get a response.
     
     Args:
         text: The prompt text
-        model: The model name
+        model: The model name, or its parsed ModelSpec
         
     Returns:
         Response string from the model
     """
+    model = as_model_spec("groq", model).base_model
     try:
         logger.info(f"Sending prompt to Groq model: {model}")
         
-        # Map model names that need conversion
-        model_mapping = {
-            "qwen-2.5-32b": "qwen-qwq-32b"
-        }
-        
         # Use mapped model if available
-        actual_model = model_mapping.get(model, model)
+        actual_model = MODEL_MAPPING.get(model, model)
         
         # Create chat completion
-        chat_completion = client.chat.completions.create(
+        raw_response = get_client().chat.completions.with_raw_response.create(
             messages=[{"role": "user", "content": text}],
             model=actual_model,
+            **timeout_options(),
         )
+        observe_headers("groq", raw_response.headers)
+        chat_completion = raw_response.parse()
         
         # Extract response content
         return chat_completion.choices[0].message.content
     except Exception as e:
         logger.error(f"Error sending prompt to Groq: {e}")
-        raise ValueError(f"Failed to get response from Groq: {str(e)}")
+        raise ValueError(f"Failed to get response from Groq: {str(e)}") from e
+
+
+async def aprompt(text: str, model: Union[str, ModelSpec]) -> str:
+    """
+    Send a prompt to Groq using the async client and get a response.
+    
+    Args:
+        text: The prompt text
+        model: The model name, or its parsed ModelSpec
+        
+    Returns:
+        Response string from the model
+    """
+    model = as_model_spec("groq", model).base_model
+    try:
+        logger.info(f"Sending async prompt to Groq model: {model}")
+        
+        actual_model = MODEL_MAPPING.get(model, model)
+        
+        raw_response = await get_async_client().chat.completions.with_raw_response.create(
+            messages=[{"role": "user", "content": text}],
+            model=actual_model,
+            **timeout_options(),
+        )
+        observe_headers("groq", raw_response.headers)
+        chat_completion = raw_response.parse()
+        
+        return chat_completion.choices[0].message.content
+    except Exception as e:
+        logger.error(f"Error sending async prompt to Groq: {e}")
+        raise ValueError(f"Failed to get response from Groq: {str(e)}") from e
 
 
 def list_models() -> List[str]:
@@ -62,7 +120,7 @@ def list_models() -> List[str]:
     """
     try:
         logger.info("Listing Groq models")
-        response = client.models.list()
+        response = get_client().models.list()
         
         # Extract model IDs
         models = [model.id for model in response.data]
@@ -79,4 +137,22 @@ def list_models() -> List[str]:
             "mixtral-8x7b-32768",
             "gemma-7b-it",
             "qwen-qwq-32b"
-        ]
\ No newline at end of file
+        ]
+
+
+async def alist_models() -> List[str]:
+    """
+    List available Groq models using the async client.
+
+    Opens the async client's pooled connection, which the server's prompt calls reuse.
+
+    Returns:
+        List of model names
+    """
+    try:
+        logger.info("Listing Groq models (async)")
+        response = await get_async_client().models.list()
+        return [model.id for model in response.data]
+    except Exception as e:
+        logger.error(f"Error listing Groq models: {e}")
+        raise ValueError(f"Failed to list Groq models: {str(e)}") from e
@@ -2,49 +2,123 @@
 Ollama provider implementation.
 """
 
+import asyncio
+import math
 import os
-from typing import List
+import threading
+from typing import Dict, List, Union
 import logging
-import ollama
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from ..shared.deadline import remaining_time
+from ..shared.lazy import Lazy
+from ..shared.data_types import ModelSpec
+from ..shared.utils import as_model_spec
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
-def prompt(text: str, model: str) -> str:
+# Ollama clients (which read OLLAMA_HOST) are built, and the package imported, on first use
+def _build_client(**options):
+    import ollama
+    return ollama.Client(**options)
+
+
+def _build_async_client():
+    import ollama
+    return ollama.AsyncClient()
+
+
+_client = Lazy(_build_client)
+_async_client = Lazy(_build_async_client)
+
+# ollama's chat() takes no per-request timeout, so calls inside a deadline use
+# clients built with one, shared per whole second of remaining time
+_deadline_clients: Dict[int, Lazy] = {}
+_deadline_clients_lock = threading.Lock()
+
+
+def get_client():
+    """Get the shared Ollama client, building it on first use."""
+    return _client.get()
+
+
+def get_async_client():
+    """Get the shared async Ollama client, building it on first use."""
+    return _async_client.get()
+
+
+def get_deadline_client(timeout: float):
+    """
+    Get a shared Ollama client whose timeout covers the time left before a deadline.
+
+    Args:
+        timeout: Seconds left, rounded up to a whole second
+
+    Returns:
+        ollama.Client configured with that timeout
+    """
+    seconds = max(1, math.ceil(timeout))
+    with _deadline_clients_lock:
+        client = _deadline_clients.get(seconds)
+        if client is None:
+            client = _deadline_clients[seconds] = Lazy(lambda: _build_client(timeout=seconds))
+    return client.get()
+
+
+def _messages(text: str) -> List[dict]:
+    return [{"role": "user", "content": text}]
+
+
+def prompt(text: str, model: Union[str, ModelSpec]) -> str:
     """
     Send a prompt to Ollama and get a response.
 
     Args:
         text: The prompt text
-        model: The model name
+        model: The model name, or its parsed ModelSpec
 
     Returns:
         Response string from the model
     """
+    model = as_model_spec("ollama", model).base_model
     try:
         logger.info(f"Sending prompt to Ollama model: {model}")
 
-        # Create chat completion
-        response = ollama.chat(
-            model=model,
-            messages=[
-                {
-                    "role": "user",
-                    "content": text,
-                },
-            ],
-        )
+        remaining = remaining_time()
+        client = get_client() if remaining is None else get_deadline_client(remaining)
+        response = client.chat(model=model, messages=_messages(text))
 
         # Extract response content
         return response.message.content
     except Exception as e:
         logger.error(f"Error sending prompt to Ollama: {e}")
-        raise ValueError(f"Failed to get response from Ollama: {str(e)}")
+        raise ValueError(f"Failed to get response from Ollama: {str(e)}") from e
+
+
+async def aprompt(text: str, model: Union[str, ModelSpec]) -> str:
+    """
+    Send a prompt to Ollama using the async client and get a response.
+
+    Args:
+        text: The prompt text
+        model: The model name, or its parsed ModelSpec
+
+    Returns:
+        Response string from the model
+    """
+    model = as_model_spec("ollama", model).base_model
+    try:
+        logger.info(f"Sending async prompt to Ollama model: {model}")
+
+        # Cancelling the request at the deadline closes its connection
+        chat = get_async_client().chat(model=model, messages=_messages(text))
+        remaining = remaining_time()
+        response = await (chat if remaining is None else asyncio.wait_for(chat, remaining))
+
+        return response.message.content
+    except Exception as e:
+        logger.error(f"Error sending async prompt to Ollama: {e}")
+        raise ValueError(f"Failed to get response from Ollama: {str(e)}") from e
 
 
 def list_models() -> List[str]:
@@ -55,9 +129,23 @@ def list_models() -> List[str]:
         List of model names
     """
     logger.info("Listing Ollama models")
-    response = ollama.list()
+    response = get_client().list()
 
     # Extract model names from the models attribute
     models = [model.model for model in response.models]
 
     return models
+
+
+async def alist_models() -> List[str]:
+    """
+    List available Ollama models using the async client.
+
+    Opens the async client's pooled connection, which the server's prompt calls reuse.
+
+    Returns:
+        List of model names
+    """
+    logger.info("Listing Ollama models (async)")
+    response = await get_async_client().list()
+    return [model.model for model in response.models]
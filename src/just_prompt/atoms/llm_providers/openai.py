@@ -3,25 +3,57 @@ OpenAI provider implementation.
 """
 
 import os
-from openai import OpenAI
-from typing import List
+from typing import List, Union
 import logging
-from dotenv import load_dotenv
-from ..shared.utils import parse_reasoning_effort
-
-# Load environment variables
-load_dotenv()
+from ..shared.utils import as_model_spec
+from ..shared.data_types import ModelSpec
+from ..shared.rate_limiter import observe_headers
+from ..shared.deadline import timeout_options
+from ..shared.prompt_cache import record_cache_usage
+from ..shared.lazy import Lazy
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+
+# OpenAI clients are built, and the SDK imported, on first use
+# SDK retries are disabled; the router applies the shared retry policy
+def _build_client():
+    from openai import OpenAI
+    return OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), max_retries=0)
+
+
+def _build_async_client():
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"), max_retries=0)
+
+
+_client = Lazy(_build_client)
+_async_client = Lazy(_build_async_client)
+
+
+def get_client():
+    """Get the shared OpenAI client, building it on first use."""
+    return _client.get()
+
+
+def get_async_client():
+    """Get the shared async OpenAI client, building it on first use."""
+    return _async_client.get()
 
 # Models that support reasoning effort
 REASONING_ENABLED_MODELS = ["o3-mini", "o4-mini", "o3"]
 
 
+def _record_usage(model: str, response) -> None:
+    """Report the input tokens the call read from OpenAI's automatic prompt cache."""
+    usage = getattr(response, "usage", None)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None)
+    if isinstance(cached, int):
+        record_cache_usage("openai", model, usage.prompt_tokens, cached)
+
+
 def prompt_with_reasoning(text: str, model: str, reasoning_effort: str) -> str:
     """
     Send a prompt to OpenAI with reasoning effort level and get a response.
@@ -36,19 +68,23 @@ def prompt_with_reasoning(text: str, model: str, reasoning_effort: str) -> str:
     """
     try:
         logger.info(f"Sending prompt to OpenAI model {model} with reasoning effort level {reasoning_effort}")
-        response = client.chat.completions.create(
+        raw_response = get_client().chat.completions.with_raw_response.create(
             model=model,
             reasoning_effort=reasoning_effort,
             messages=[{"role": "user", "content": text}],
+            **timeout_options(),
         )
+        observe_headers("openai", raw_response.headers)
+        response = raw_response.parse()
+        _record_usage(model, response)
 
         return response.choices[0].message.content
     except Exception as e:
         logger.error(f"Error sending prompt with reasoning to OpenAI: {e}")
-        raise ValueError(f"Failed to get response from OpenAI with reasoning: {str(e)}")
+        raise ValueError(f"Failed to get response from OpenAI with reasoning: {str(e)}") from e
 
 
-def prompt(text: str, model: str) -> str:
+def prompt(text: str, model: Union[str, ModelSpec]) -> str:
     """
     Send a prompt to OpenAI and get a response.
     
@@ -56,32 +92,101 @@ def prompt(text: str, model: str) -> str:
 
     Args:
         text: The prompt text
-        model: The model name, optionally with reasoning effort suffix
+        model: The model name, optionally with reasoning effort suffix, or its parsed ModelSpec
 
     Returns:
         Response string from the model
     """
-    # Parse the model name to check for reasoning effort suffixes
-    base_model, reasoning_effort = parse_reasoning_effort(model)
+    # Model strings are parsed once, by the router or here; the spec only carries
+    # a reasoning effort for models in REASONING_ENABLED_MODELS
+    spec = as_model_spec("openai", model)
+    base_model, reasoning_effort = spec.base_model, spec.reasoning_effort
     
-    # Check if model supports reasoning effort
-    if reasoning_effort and base_model in REASONING_ENABLED_MODELS:
+    if reasoning_effort:
         return prompt_with_reasoning(text, base_model, reasoning_effort)
-    elif reasoning_effort and base_model not in REASONING_ENABLED_MODELS:
-        logger.warning(f"Model {base_model} does not support reasoning effort, ignoring reasoning suffix")
     
     # Otherwise, use regular prompt
     try:
         logger.info(f"Sending prompt to OpenAI model: {base_model}")
-        response = client.chat.completions.create(
+        raw_response = get_client().chat.completions.with_raw_response.create(
             model=base_model,
             messages=[{"role": "user", "content": text}],
+            **timeout_options(),
         )
+        observe_headers("openai", raw_response.headers)
+        response = raw_response.parse()
+        _record_usage(base_model, response)
 
         return response.choices[0].message.content
     except Exception as e:
         logger.error(f"Error sending prompt to OpenAI: {e}")
-        raise ValueError(f"Failed to get response from OpenAI: {str(e)}")
+        raise ValueError(f"Failed to get response from OpenAI: {str(e)}") from e
+
+
+async def aprompt_with_reasoning(text: str, model: str, reasoning_effort: str) -> str:
+    """
+    Send a prompt to OpenAI with reasoning effort level using the async client.
+
+    Args:
+        text: The prompt text
+        model: The base model name (without reasoning effort suffix)
+        reasoning_effort: The reasoning effort level (low, medium, high)
+
+    Returns:
+        Response string from the model
+    """
+    try:
+        logger.info(f"Sending async prompt to OpenAI model {model} with reasoning effort level {reasoning_effort}")
+        raw_response = await get_async_client().chat.completions.with_raw_response.create(
+            model=model,
+            reasoning_effort=reasoning_effort,
+            messages=[{"role": "user", "content": text}],
+            **timeout_options(),
+        )
+        observe_headers("openai", raw_response.headers)
+        response = raw_response.parse()
+        _record_usage(model, response)
+
+        return response.choices[0].message.content
+    except Exception as e:
+        logger.error(f"Error sending async prompt with reasoning to OpenAI: {e}")
+        raise ValueError(f"Failed to get response from OpenAI with reasoning: {str(e)}") from e
+
+
+async def aprompt(text: str, model: Union[str, ModelSpec]) -> str:
+    """
+    Send a prompt to OpenAI using the async client and get a response.
+
+    Automatically handles reasoning effort suffixes in the model name (e.g., o3-mini:low)
+
+    Args:
+        text: The prompt text
+        model: The model name, optionally with reasoning effort suffix, or its parsed ModelSpec
+
+    Returns:
+        Response string from the model
+    """
+    spec = as_model_spec("openai", model)
+    base_model, reasoning_effort = spec.base_model, spec.reasoning_effort
+
+    if reasoning_effort:
+        return await aprompt_with_reasoning(text, base_model, reasoning_effort)
+
+    try:
+        logger.info(f"Sending async prompt to OpenAI model: {base_model}")
+        raw_response = await get_async_client().chat.completions.with_raw_response.create(
+            model=base_model,
+            messages=[{"role": "user", "content": text}],
+            **timeout_options(),
+        )
+        observe_headers("openai", raw_response.headers)
+        response = raw_response.parse()
+        _record_usage(base_model, response)
+
+        return response.choices[0].message.content
+    except Exception as e:
+        logger.error(f"Error sending async prompt to OpenAI: {e}")
+        raise ValueError(f"Failed to get response from OpenAI: {str(e)}") from e
 
 
 def list_models() -> List[str]:
@@ -93,7 +198,7 @@ def list_models() -> List[str]:
     """
     try:
         logger.info("Listing OpenAI models")
-        response = client.models.list()
+        response = get_client().models.list()
 
         # Return all models without filtering
         models = [model.id for model in response.data]
@@ -101,4 +206,22 @@ def list_models() -> List[str]:
         return models
     except Exception as e:
         logger.error(f"Error listing OpenAI models: {e}")
-        raise ValueError(f"Failed to list OpenAI models: {str(e)}")
+        raise ValueError(f"Failed to list OpenAI models: {str(e)}") from e
+
+
+async def alist_models() -> List[str]:
+    """
+    List available OpenAI models using the async client.
+
+    Opens the async client's pooled connection, which the server's prompt calls reuse.
+
+    Returns:
+        List of model names
+    """
+    try:
+        logger.info("Listing OpenAI models (async)")
+        response = await get_async_client().models.list()
+        return [model.id for model in response.data]
+    except Exception as e:
+        logger.error(f"Error listing OpenAI models: {e}")
+        raise ValueError(f"Failed to list OpenAI models: {str(e)}") from e
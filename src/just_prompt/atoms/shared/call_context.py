@@ -0,0 +1,71 @@
+"""
+Per tool-call context shared by every model call a tool makes.
+"""
+
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from .retry import RetryBudget
+
+_current_call_context: contextvars.ContextVar = contextvars.ContextVar(
+    "just_prompt_call_context", default=None
+)
+
+
+class CallContext:
+    """
+    State for one tool invocation.
+
+    The context is stored in a context variable, so it follows the call into
+    worker threads submitted with a copied context and into asyncio tasks.
+    """
+
+    def __init__(self, retry_budget: Optional[RetryBudget] = None, cache_mode: str = "use"):
+        self.retry_budget = retry_budget or RetryBudget()
+        self.cache_mode = cache_mode
+        # Model strings whose responses were served from the response cache
+        self.cache_hits: List[str] = []
+        # Near-duplicate cached responses offered alongside fresh ones
+        self.similar_matches: List[str] = []
+        # Input tokens read from provider-side prompt caches, one entry per model call
+        self.prompt_cache_reads: List[Dict[str, Any]] = []
+        # Event loop of the server handling the tool call; its model requests run there
+        self.event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def current_call_context() -> Optional[CallContext]:
+    """
+    Get the context of the tool call currently executing.
+
+    Returns:
+        The active CallContext, or None outside of a tool call
+    """
+    return _current_call_context.get()
+
+
+@contextmanager
+def call_context(context: Optional[CallContext] = None) -> Iterator[CallContext]:
+    """
+    Activate a tool-call context for the duration of a block.
+
+    If a context is already active and none is given, the active one is reused
+    so nested molecules (e.g. a CEO run calling prompt) share one context.
+
+    Args:
+        context: Context to activate; a new one is created if omitted
+
+    Yields:
+        The active CallContext
+    """
+    active = _current_call_context.get()
+    if context is None and active is not None:
+        yield active
+        return
+
+    context = context or CallContext()
+    token = _current_call_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_call_context.reset(token)
@@ -0,0 +1,172 @@
+"""
+Cancellation of a tool call, carried to every provider request made for it.
+"""
+
+import concurrent.futures
+import contextvars
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_cancellation: contextvars.ContextVar = contextvars.ContextVar(
+    "just_prompt_cancellation", default=None
+)
+
+
+class OperationCancelled(Exception):
+    """Raised inside a tool call after the client cancelled it."""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag for one tool call.
+
+    The event loop cancels the token when the MCP client cancels the request;
+    worker threads poll it, wait on it, or wait on its future alongside their
+    own futures.
+    """
+
+    def __init__(self):
+        self.reason: Optional[str] = None
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the tool call was cancelled."""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled by client") -> bool:
+        """
+        Cancel the tool call and run the registered callbacks.
+
+        Args:
+            reason: Why the call was cancelled
+
+        Returns:
+            True if this call cancelled the token, False if it already was
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        self.future.set_result(reason)
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"Cancellation callback failed: {e}")
+        return True
+
+    def child(self) -> "CancellationToken":
+        """
+        Create a token that is cancelled together with this one but can also be cancelled on its own.
+
+        Returns:
+            The child token
+        """
+        child = CancellationToken()
+        self.add_callback(lambda: child.cancel(self.reason))
+        return child
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Run a callback when the token is cancelled (immediately if it already is).
+
+        Args:
+            callback: Function taking no arguments
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        """Forget a callback that is no longer needed."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sleep until the token is cancelled or the timeout passes.
+
+        Returns:
+            True if the token was cancelled
+        """
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Raises:
+            OperationCancelled: If the token was cancelled
+        """
+        if self._event.is_set():
+            raise OperationCancelled(f"Tool call {self.reason}")
+
+
+@contextmanager
+def cancellation_scope(token: CancellationToken) -> Iterator[CancellationToken]:
+    """
+    Make a token the cancellation token of every call made inside the block.
+
+    Args:
+        token: The tool call's token
+
+    Yields:
+        The token
+    """
+    reset = _current_cancellation.set(token)
+    try:
+        yield token
+    finally:
+        _current_cancellation.reset(reset)
+
+
+def current_cancellation() -> Optional[CancellationToken]:
+    """
+    Get the cancellation token of the tool call currently executing.
+
+    Returns:
+        The token, or None outside of a cancellable tool call
+    """
+    return _current_cancellation.get()
+
+
+def check_cancelled() -> None:
+    """
+    Raise if the current tool call was cancelled.
+
+    Raises:
+        OperationCancelled: If the call was cancelled
+    """
+    token = _current_cancellation.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def sleep(seconds: float, fallback: Callable[[float], None]) -> None:
+    """
+    Sleep, waking early if the current tool call is cancelled.
+
+    Args:
+        seconds: How long to sleep
+        fallback: Sleep function used outside of a cancellable call
+
+    Raises:
+        OperationCancelled: If the call was cancelled while sleeping
+    """
+    token = _current_cancellation.get()
+    if token is None:
+        fallback(seconds)
+    elif token.wait(seconds):
+        token.raise_if_cancelled()
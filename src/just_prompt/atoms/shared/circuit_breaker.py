@@ -0,0 +1,200 @@
+"""
+Circuit breakers per provider and model, so a provider that is down fails fast.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Consecutive failures that open a breaker
+DEFAULT_FAILURE_THRESHOLD = 5
+
+# Seconds an open breaker waits before letting a probe request through
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# Failures that say something about the provider's health; client errors and
+# rate limits don't open the breaker
+HEALTH_FAILURE_KINDS = {"server_error", "overloaded", "timeout", "connection"}
+
+# Outcomes that say nothing about the provider at all
+NEUTRAL_KINDS = {"cancelled", "deadline_exceeded", "circuit_open"}
+
+
+class CircuitOpenError(ValueError):
+    """Raised instead of calling a provider whose breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker for one provider and model.
+
+    Closed: calls go through and consecutive failures are counted.
+    Open: calls fail immediately until the reset timeout has passed.
+    Half-open: a single probe call is let through; its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def raise_if_open(self, now: Optional[float] = None) -> None:
+        """
+        Fail fast while the breaker is open, without claiming the half-open probe.
+
+        Args:
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Raises:
+            CircuitOpenError: If the breaker is open and not yet due for a probe
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            retry_in = self.opened_at + self.reset_timeout - now
+            if self.state == OPEN and retry_in > 0:
+                raise CircuitOpenError(
+                    f"Circuit open for {self.name} after {self.consecutive_failures} consecutive failures, "
+                    f"next probe in {retry_in:.0f}s"
+                )
+
+    def before_call(self, now: Optional[float] = None) -> None:
+        """
+        Check whether a call may go out.
+
+        Args:
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with its probe already in flight
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN:
+                if self.opened_at + self.reset_timeout > now:
+                    raise CircuitOpenError(
+                        f"Circuit open for {self.name} after {self.consecutive_failures} consecutive failures, "
+                        f"next probe in {self.opened_at + self.reset_timeout - now:.0f}s"
+                    )
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"Circuit half-open for {self.name}, probing with one request")
+            if self._probe_in_flight:
+                raise CircuitOpenError(f"Circuit half-open for {self.name}, waiting for the probe request")
+            self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the breaker."""
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit closed for {self.name}, provider recovered")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, kind: str, now: Optional[float] = None) -> None:
+        """
+        Record a failed call.
+
+        Args:
+            kind: Error kind from the retry engine's classification
+            now: Current monotonic time (defaults to time.monotonic())
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if kind in NEUTRAL_KINDS:
+                self._probe_in_flight = False
+                return
+
+            if kind not in HEALTH_FAILURE_KINDS:
+                # The provider answered; a probe that got a client error still proves it is up
+                if self.state == HALF_OPEN:
+                    self.state = CLOSED
+                    self.consecutive_failures = 0
+                self._probe_in_flight = False
+                return
+
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(
+                        f"Circuit open for {self.name} after {self.consecutive_failures} consecutive failures "
+                        f"({kind}), failing fast for {self.reset_timeout:.0f}s"
+                    )
+                self.state = OPEN
+                self.opened_at = now
+                self._probe_in_flight = False
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Describe the breaker's current state.
+
+        Returns:
+            Dictionary with the state, consecutive failures and seconds until the next probe
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            retry_in = max(0.0, self.opened_at + self.reset_timeout - now) if self.state == OPEN else 0.0
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in_seconds": round(retry_in, 1),
+            }
+
+
+_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str, model: str) -> CircuitBreaker:
+    """
+    Get the breaker for a provider and model.
+
+    Args:
+        provider: Provider name (full name)
+        model: Model name
+
+    Returns:
+        The CircuitBreaker for the pair
+    """
+    key = (provider, model)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(key, CircuitBreaker(f"{provider}:{model}"))
+    return breaker
+
+
+def circuit_states(provider: str) -> List[Dict[str, Any]]:
+    """
+    Describe the breakers of every model of a provider that has been called.
+
+    Args:
+        provider: Provider name (full name)
+
+    Returns:
+        List of dictionaries with the model name and its breaker state
+    """
+    with _breakers_lock:
+        breakers = [(model, breaker) for (name, model), breaker in _breakers.items() if name == provider]
+    return [dict(model=model, **breaker.snapshot()) for model, breaker in sorted(breakers, key=lambda item: item[0])]
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all breaker state."""
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,161 @@
+"""
+Persistent memo of model name corrections, so a typo is corrected once per catalog version.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .model_catalog import on_catalog_refresh
+
+logger = logging.getLogger(__name__)
+
+# Environment variable pointing at the SQLite file holding the corrections
+CORRECTION_DB_ENV = "JUST_PROMPT_CORRECTION_DB"
+
+
+def default_correction_db_path() -> str:
+    """
+    Get the default location of the correction database.
+
+    Returns:
+        Path inside the user's cache directory
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "just-prompt", "corrections.sqlite3")
+
+
+class CorrectionMemo:
+    """
+    SQLite table of (provider, requested name, catalog version) -> corrected name.
+
+    Including the catalog version in the key means a correction is never reused
+    against a different model list; rows of older versions are deleted when the
+    catalog of their provider refreshes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not open correction database {path}, keeping corrections in memory: {e}")
+            self.path = ":memory:"
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS corrections (
+                    provider TEXT NOT NULL,
+                    requested TEXT NOT NULL,
+                    catalog_version TEXT NOT NULL,
+                    corrected TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (provider, requested, catalog_version)
+                )
+                """
+            )
+
+    def get(self, provider: str, requested: str, catalog_version: str) -> Optional[str]:
+        """
+        Look up a remembered correction.
+
+        Args:
+            provider: Provider name (full name)
+            requested: Model name as the user typed it
+            catalog_version: Version of the provider's current catalog
+
+        Returns:
+            The corrected model name, or None if this name wasn't corrected for this catalog
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT corrected FROM corrections WHERE provider = ? AND requested = ? AND catalog_version = ?",
+                (provider, requested, catalog_version),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, provider: str, requested: str, catalog_version: str, corrected: str) -> None:
+        """
+        Remember a correction.
+
+        Args:
+            provider: Provider name (full name)
+            requested: Model name as the user typed it
+            catalog_version: Version of the catalog the correction was made against
+            corrected: The corrected model name
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO corrections VALUES (?, ?, ?, ?, ?)",
+                (provider, requested, catalog_version, corrected, time.time()),
+            )
+
+    def invalidate(self, provider: str, keep_version: Optional[str] = None) -> int:
+        """
+        Forget the corrections of a provider.
+
+        Args:
+            provider: Provider name (full name)
+            keep_version: Catalog version whose corrections are kept, if any
+
+        Returns:
+            Number of corrections forgotten
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM corrections WHERE provider = ? AND catalog_version IS NOT ?",
+                (provider, keep_version),
+            )
+        if cursor.rowcount:
+            logger.info(f"Forgot {cursor.rowcount} model name correction(s) for {provider} after its catalog changed")
+        return cursor.rowcount
+
+
+_memo: Optional[CorrectionMemo] = None
+_memo_lock = threading.Lock()
+
+
+def _on_catalog_refresh(provider: str, version: str) -> None:
+    if _memo is not None:
+        _memo.invalidate(provider, keep_version=version)
+
+
+def get_correction_memo() -> CorrectionMemo:
+    """
+    Get the process-wide correction memo, opening it from the environment on first use.
+
+    Returns:
+        The shared CorrectionMemo
+    """
+    global _memo
+    if _memo is None:
+        with _memo_lock:
+            if _memo is None:
+                _memo = CorrectionMemo(os.environ.get(CORRECTION_DB_ENV) or default_correction_db_path())
+                on_catalog_refresh(_on_catalog_refresh)
+    return _memo
+
+
+def configure_correction_memo(path: str) -> CorrectionMemo:
+    """
+    Replace the process-wide correction memo.
+
+    Args:
+        path: SQLite file to store corrections in (":memory:" keeps them for this process only)
+
+    Returns:
+        The new CorrectionMemo
+    """
+    global _memo
+    with _memo_lock:
+        _memo = CorrectionMemo(path)
+        on_catalog_refresh(_on_catalog_refresh)
+    logger.info(f"Model name corrections stored in {_memo.path}")
+    return _memo
@@ -2,7 +2,9 @@
 Data types and models for just-prompt MCP server.
 """
 
+from dataclasses import dataclass
 from enum import Enum
+from typing import Dict, Optional
 
 
 class ModelProviders(Enum):
@@ -31,7 +33,37 @@ class ModelProviders(Enum):
         Returns:
             ModelProviders: The corresponding provider enum, or None if not found
         """
-        for provider in cls:
-            if provider.full_name == name or provider.short_name == name:
-                return provider
-        return None
\ No newline at end of file
+        return _PROVIDERS_BY_NAME.get(name)
+
+
+# Full and short provider names mapped to their enum member
+_PROVIDERS_BY_NAME: Dict[str, ModelProviders] = {
+    name: provider for provider in ModelProviders for name in (provider.full_name, provider.short_name)
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ModelSpec:
+    """
+    A parsed model string.
+    
+    Attributes:
+        provider: Full provider name
+        model: Model name as requested, including any suffix (e.g. "o3-mini:high")
+        base_model: Model name sent to the provider, without thinking or reasoning suffixes
+        thinking_budget: Thinking token budget (0 when thinking is off)
+        reasoning_effort: Reasoning effort level (None when not set)
+    """
+    provider: str
+    model: str
+    base_model: str
+    thinking_budget: int = 0
+    reasoning_effort: Optional[str] = None
+    
+    @property
+    def model_string(self) -> str:
+        """The model string in "provider:model" format."""
+        return f"{self.provider}:{self.model}"
+    
+    def __str__(self) -> str:
+        return self.model
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Per-call deadlines carried to every provider request made inside them.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    "just_prompt_deadline", default=None
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call's deadline has passed before a provider request could be sent."""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Bound every provider call made inside the block by a deadline.
+
+    A nested scope can only shorten the deadline of the enclosing one, so a
+    stage deadline never outlives the deadline of the tool call it belongs to.
+
+    Args:
+        seconds: Seconds from now, or None to keep the enclosing deadline
+
+    Yields:
+        The effective deadline as a time.monotonic() value, or None if unbounded
+    """
+    active = _current_deadline.get()
+    if seconds is None:
+        yield active
+        return
+
+    deadline = time.monotonic() + max(0.0, seconds)
+    if active is not None:
+        deadline = min(deadline, active)
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """
+    Get the deadline of the current call.
+
+    Returns:
+        Deadline as a time.monotonic() value, or None if unbounded
+    """
+    return _current_deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Get the time left before the current deadline.
+
+    Returns:
+        Seconds left (never negative), or None if unbounded
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def check_deadline() -> None:
+    """
+    Raise if the current deadline has already passed.
+
+    Raises:
+        DeadlineExceeded: If no time is left
+    """
+    if remaining_time() == 0.0:
+        raise DeadlineExceeded("Deadline exceeded before the request was sent")
+
+
+def timeout_options() -> Dict[str, Any]:
+    """
+    Build the per-request timeout keyword for SDK calls.
+
+    Returns:
+        {"timeout": seconds} inside a deadline, otherwise an empty dict so the
+        client's own default applies
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return {}
+    return {"timeout": remaining}
@@ -0,0 +1,228 @@
+"""
+Process-wide execution layer with per-provider bulkheads.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+import weakref
+from typing import Callable, Dict, Optional
+from .provider_registry import get_provider_registry
+
+logger = logging.getLogger(__name__)
+
+# Environment variable with per-provider limits, e.g. "ollama=1,openai=32"
+PROVIDER_CONCURRENCY_ENV = "JUST_PROMPT_PROVIDER_CONCURRENCY"
+
+# Default number of concurrent calls allowed per provider
+DEFAULT_PROVIDER_CONCURRENCY = {
+    "openai": 32,
+    "anthropic": 16,
+    "gemini": 16,
+    "groq": 16,
+    "deepseek": 16,
+    "ollama": 1,
+}
+
+# Limit for providers without an explicit entry
+FALLBACK_PROVIDER_CONCURRENCY = 8
+
+
+def parse_provider_concurrency(spec: Optional[str]) -> Dict[str, int]:
+    """
+    Parse a per-provider concurrency spec.
+
+    Args:
+        spec: Comma-separated "provider=limit" pairs; providers may use full or short names
+
+    Returns:
+        Dictionary mapping full provider names to limits
+    """
+    limits = {}
+    if not spec:
+        return limits
+
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+
+        name, sep, value = entry.partition("=")
+        provider = get_provider_registry().get(name.strip())
+        if not sep or provider is None:
+            raise ValueError(f"Invalid provider concurrency entry: '{entry}'. Expected format: 'provider=limit'")
+
+        try:
+            limit = int(value)
+        except ValueError:
+            raise ValueError(f"Invalid concurrency limit for {provider.full_name}: '{value}'")
+        if limit < 1:
+            raise ValueError(f"Concurrency limit for {provider.full_name} must be at least 1, got {limit}")
+
+        limits[provider.full_name] = limit
+
+    return limits
+
+
+class ExecutionLayer:
+    """
+    Long-lived worker pools, one bounded pool (bulkhead) per provider.
+
+    A burst against one slow provider only queues behind that provider's own
+    workers, so calls to other providers keep flowing.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = dict(DEFAULT_PROVIDER_CONCURRENCY)
+        self.limits.update(limits or {})
+        self._executors: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+        self._async_slots = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def limit_for(self, provider: str) -> int:
+        """
+        Get the concurrency limit for a provider.
+
+        Args:
+            provider: Provider name (full name)
+
+        Returns:
+            Maximum number of concurrent calls
+        """
+        return self.limits.get(provider, FALLBACK_PROVIDER_CONCURRENCY)
+
+    def executor_for(self, provider: str) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Get the worker pool for a provider, creating it on first use.
+
+        Args:
+            provider: Provider name (full name)
+
+        Returns:
+            The provider's thread pool
+        """
+        executor = self._executors.get(provider)
+        if executor is not None:
+            return executor
+
+        with self._lock:
+            executor = self._executors.get(provider)
+            if executor is None:
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.limit_for(provider),
+                    thread_name_prefix=f"just-prompt-{provider}",
+                )
+                self._executors[provider] = executor
+            return executor
+
+    def submit(self, provider: str, func: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Submit a call to a provider's bulkhead.
+
+        Context variables of the caller are carried over to the worker thread.
+
+        Args:
+            provider: Provider name (full name)
+            func: Function to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Future for the call
+        """
+        context = contextvars.copy_context()
+        return self.executor_for(provider).submit(context.run, func, *args, **kwargs)
+
+    def async_slot(self, provider: str) -> asyncio.Semaphore:
+        """
+        Get the asyncio bulkhead for a provider on the running event loop.
+
+        Args:
+            provider: Provider name (full name)
+
+        Returns:
+            Semaphore bounding concurrent async calls to the provider
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._async_slots.setdefault(loop, {})
+            if provider not in slots:
+                slots[provider] = asyncio.Semaphore(self.limit_for(provider))
+            return slots[provider]
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Shut down every provider pool.
+
+        Args:
+            wait: Whether to wait for running calls to finish
+        """
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_execution_layer: Optional[ExecutionLayer] = None
+_execution_layer_lock = threading.Lock()
+
+
+def get_execution_layer() -> ExecutionLayer:
+    """
+    Get the process-wide execution layer, creating it from the environment if needed.
+
+    Returns:
+        The shared ExecutionLayer
+    """
+    global _execution_layer
+
+    if _execution_layer is None:
+        with _execution_layer_lock:
+            if _execution_layer is None:
+                limits = parse_provider_concurrency(os.environ.get(PROVIDER_CONCURRENCY_ENV))
+                _execution_layer = ExecutionLayer(limits)
+
+    return _execution_layer
+
+
+def configure_execution_layer(limits: Optional[Dict[str, int]] = None) -> ExecutionLayer:
+    """
+    Replace the process-wide execution layer with one using the given limits.
+
+    Args:
+        limits: Per-provider concurrency limits (full provider names)
+
+    Returns:
+        The new ExecutionLayer
+    """
+    global _execution_layer
+
+    with _execution_layer_lock:
+        previous = _execution_layer
+        _execution_layer = ExecutionLayer(limits)
+
+    if previous is not None:
+        previous.shutdown()
+
+    logger.info(
+        "Provider concurrency limits: "
+        + ", ".join(f"{name}={limit}" for name, limit in sorted(_execution_layer.limits.items()))
+    )
+    return _execution_layer
+
+
+def shutdown_execution_layer() -> None:
+    """Shut down the process-wide execution layer, if one was created."""
+    global _execution_layer
+
+    with _execution_layer_lock:
+        layer = _execution_layer
+        _execution_layer = None
+
+    if layer is not None:
+        layer.shutdown()
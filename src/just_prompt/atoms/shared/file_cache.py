@@ -0,0 +1,102 @@
+"""
+Process-wide cache of prompt file contents, keyed on path, modification time and size.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+# Total bytes of file content kept in memory
+DEFAULT_FILE_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class FileCache:
+    """
+    LRU cache of text files.
+
+    An entry is keyed by the file's resolved path, st_mtime_ns and st_size, so
+    any change to the file makes the next read go to disk. Files larger than the
+    byte cap are read but not cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_FILE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._sizes: "OrderedDict[Tuple[str, int, int], int]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def read_text(self, path: str, encoding: str = "utf-8") -> str:
+        """
+        Read a text file, from memory if it hasn't changed since it was last read.
+
+        Args:
+            path: Path to the file
+            encoding: Text encoding of the file
+
+        Returns:
+            The file's content
+
+        Raises:
+            OSError: If the file can't be read
+        """
+        resolved = os.path.realpath(path)
+        stat = os.stat(resolved)
+        key = (resolved, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+                self._sizes.move_to_end(key)
+                return content
+
+        with open(resolved, "r", encoding=encoding) as f:
+            content = f.read()
+
+        if stat.st_size <= self.max_bytes:
+            with self._lock:
+                self._store(key, content, stat.st_size)
+        return content
+
+    def clear(self) -> None:
+        """Drop every cached file."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def _store(self, key: Tuple[str, int, int], content: str, size: int) -> None:
+        # Older versions of the same file can never be hit again
+        for stale in [k for k in self._entries if k[0] == key[0] and k != key]:
+            self._evict(stale)
+        if key not in self._entries:
+            self._bytes += size
+        self._entries[key] = content
+        self._sizes[key] = size
+        while self._bytes > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key: Tuple[str, int, int]) -> None:
+        del self._entries[key]
+        self._bytes -= self._sizes.pop(key)
+
+
+file_cache = FileCache()
+
+
+def read_prompt_file(path: str) -> str:
+    """
+    Read a prompt file through the process-wide file cache.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        The file's content
+    """
+    return file_cache.read_text(path)
@@ -0,0 +1,219 @@
+"""
+Hedged requests: fire a duplicate call when the first one runs past its usual latency.
+
+Only async calls are hedged, since the losing request must be cancelled; sync
+calls are timed so their latencies count towards the hedging thresholds.
+"""
+
+import asyncio
+import collections
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Environment variables controlling hedging
+HEDGING_ENV = "JUST_PROMPT_HEDGING"
+HEDGE_BUDGET_ENV = "JUST_PROMPT_HEDGE_BUDGET"
+
+# Fraction of a provider's requests that may be duplicated
+DEFAULT_HEDGE_BUDGET_RATIO = 0.1
+
+# Hedge credits a provider can bank while traffic is healthy
+MAX_HEDGE_CREDITS = 5.0
+
+# Latency percentile after which a hedge is fired
+HEDGE_PERCENTILE = 0.95
+
+# Samples needed before a model's latency percentile is trusted
+MIN_LATENCY_SAMPLES = 20
+
+# Number of recent latencies remembered per model
+LATENCY_WINDOW = 200
+
+
+class LatencyTracker:
+    """
+    Recent successful call latencies per (provider, model).
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, seconds: float) -> None:
+        """
+        Record the latency of a successful call.
+
+        Args:
+            provider: Provider name (full name)
+            model: Model name
+            seconds: Call duration
+        """
+        with self._lock:
+            samples = self._samples.setdefault((provider, model), collections.deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def percentile(self, provider: str, model: str, fraction: float = HEDGE_PERCENTILE) -> Optional[float]:
+        """
+        Get a latency percentile for a model.
+
+        Args:
+            provider: Provider name (full name)
+            model: Model name
+            fraction: Percentile as a fraction (0.95 for p95)
+
+        Returns:
+            Latency in seconds, or None until enough samples were recorded
+        """
+        with self._lock:
+            samples = self._samples.get((provider, model))
+            if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """
+    Per-provider allowance of duplicate requests.
+
+    Every primary request deposits budget_ratio credits and every hedge spends
+    one, so hedges stay a bounded fraction of traffic and can't double spend.
+    """
+
+    def __init__(self, budget_ratio: float = DEFAULT_HEDGE_BUDGET_RATIO, max_credits: float = MAX_HEDGE_CREDITS):
+        self.budget_ratio = budget_ratio
+        self.max_credits = max_credits
+        self._credits: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def deposit(self, provider: str) -> None:
+        """Credit the provider for one primary request."""
+        with self._lock:
+            self._credits[provider] = min(self.max_credits, self._credits.get(provider, 0.0) + self.budget_ratio)
+
+    def try_spend(self, provider: str) -> bool:
+        """
+        Spend one hedge credit if available.
+
+        Returns:
+            True if a hedge may be fired
+        """
+        with self._lock:
+            if self._credits.get(provider, 0.0) < 1.0:
+                return False
+            self._credits[provider] -= 1.0
+            return True
+
+
+def _env_enabled() -> bool:
+    return os.environ.get(HEDGING_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_budget_ratio() -> float:
+    try:
+        return float(os.environ.get(HEDGE_BUDGET_ENV, DEFAULT_HEDGE_BUDGET_RATIO))
+    except ValueError:
+        return DEFAULT_HEDGE_BUDGET_RATIO
+
+
+latency_tracker = LatencyTracker()
+hedge_budget = HedgeBudget(_env_budget_ratio())
+_hedging_enabled = _env_enabled()
+
+
+def configure_hedging(enabled: bool, budget_ratio: Optional[float] = None) -> None:
+    """
+    Turn request hedging on or off.
+
+    Args:
+        enabled: Whether slow calls may be hedged
+        budget_ratio: Fraction of each provider's requests that may be duplicated
+    """
+    global _hedging_enabled, hedge_budget
+    _hedging_enabled = enabled
+    if budget_ratio is not None:
+        hedge_budget = HedgeBudget(budget_ratio)
+    if enabled:
+        logger.info(f"Request hedging enabled (budget {hedge_budget.budget_ratio:.0%} of requests per provider)")
+
+
+def hedging_enabled() -> bool:
+    """Whether request hedging is enabled."""
+    return _hedging_enabled
+
+
+def timed_call(provider: str, model: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Call a provider without hedging, recording the latency of a successful call.
+
+    Hedging is async-only: a blocking call can't be abandoned when its duplicate
+    wins, so the sync path only feeds the latency percentiles the async hedges use.
+
+    Args:
+        provider: Provider name (full name)
+        model: Model name
+        func: The provider call
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Result of the call
+    """
+    start = time.monotonic()
+    result = func(*args, **kwargs)
+    latency_tracker.record(provider, model, time.monotonic() - start)
+    return result
+
+
+async def ahedged_call(provider: str, model: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """
+    Await a provider call, firing one duplicate if it outlives the model's p95 latency.
+
+    The losing call is cancelled, which closes its connection, and so is every
+    call still in flight when the caller is cancelled or its deadline passes.
+
+    Args:
+        provider: Provider name (full name)
+        model: Model name
+        func: The async provider call
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Result of whichever call finished first
+    """
+    threshold = latency_tracker.percentile(provider, model) if _hedging_enabled else None
+    start = time.monotonic()
+
+    if threshold is None:
+        result = await func(*args, **kwargs)
+        latency_tracker.record(provider, model, time.monotonic() - start)
+        return result
+
+    hedge_budget.deposit(provider)
+    pending = {asyncio.ensure_future(func(*args, **kwargs))}
+    error = None
+    try:
+        done, _ = await asyncio.wait(pending, timeout=threshold)
+        if not done and hedge_budget.try_spend(provider):
+            logger.info(f"Hedging {provider}:{model} after {threshold:.2f}s (p95)")
+            pending.add(asyncio.ensure_future(func(*args, **kwargs)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    latency_tracker.record(provider, model, time.monotonic() - start)
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # Cancelling the caller (or its deadline) aborts every request still in flight
+        for task in pending:
+            task.cancel()
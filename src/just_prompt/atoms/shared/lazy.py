@@ -0,0 +1,49 @@
+"""
+Values built on first use, such as SDK clients.
+"""
+
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """
+    A value built by a factory the first time it is needed.
+
+    The factory runs once even when several threads ask at the same time; the
+    factories of different values run independently. If it raises, nothing is
+    stored and the next call tries again.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._built = False
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """
+        Get the value, building it if this is the first use.
+
+        Returns:
+            The value
+        """
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self._value = self._factory()
+                    self._built = True
+        return self._value
+
+    @property
+    def built(self) -> bool:
+        """Whether the value has been built."""
+        return self._built
+
+    def reset(self) -> None:
+        """Forget the value, so the next use builds it again."""
+        with self._lock:
+            self._value = None
+            self._built = False
@@ -0,0 +1,282 @@
+"""
+Cached model catalogs per provider, refreshed in the background when stale.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from .provider_registry import get_provider_registry
+
+logger = logging.getLogger(__name__)
+
+# Environment variables configuring the catalog cache
+CATALOG_TTL_ENV = "JUST_PROMPT_CATALOG_TTL"
+CATALOG_SNAPSHOT_ENV = "JUST_PROMPT_CATALOG_SNAPSHOT"
+
+# Seconds a fetched catalog is served without revalidation
+DEFAULT_CATALOG_TTL_SECONDS = 600.0
+
+
+def catalog_version(models: List[str]) -> str:
+    """
+    Compute a version identifier for a model list.
+
+    Args:
+        models: Model names
+
+    Returns:
+        Short hash that changes whenever the set of models changes
+    """
+    digest = hashlib.sha256("\n".join(sorted(models)).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def _load_from_provider(provider: str) -> List[str]:
+    """Fetch a provider's model list from its API."""
+    return get_provider_registry().resolve(provider).module.list_models()
+
+
+# Callbacks run with (provider, version) whenever a provider's catalog changes
+_refresh_listeners: List[Callable[[str, str], None]] = []
+
+
+def on_catalog_refresh(listener: Callable[[str, str], None]) -> None:
+    """
+    Register a callback run whenever a provider's catalog is fetched with a new version.
+
+    Args:
+        listener: Function taking the provider name and the new catalog version
+    """
+    if listener not in _refresh_listeners:
+        _refresh_listeners.append(listener)
+
+
+def _notify_refresh(provider: str, version: str) -> None:
+    for listener in list(_refresh_listeners):
+        try:
+            listener(provider, version)
+        except Exception as e:
+            logger.warning(f"Model catalog refresh listener failed for {provider}: {e}")
+
+
+class CatalogEntry:
+    """
+    A provider's model list and when it was fetched.
+    """
+
+    def __init__(self, models: List[str], fetched_at: float):
+        self.models = models
+        self.fetched_at = fetched_at
+        self.version = catalog_version(models)
+
+
+class ModelCatalog:
+    """
+    TTL cache of provider model lists with stale-while-revalidate.
+
+    A fresh entry is served from memory. A stale entry is still served at once
+    while a background thread fetches a new list. Only a provider that was never
+    fetched makes the caller wait. Entries can be persisted to a JSON snapshot so
+    a restarted server starts warm.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_CATALOG_TTL_SECONDS,
+        snapshot_path: Optional[str] = None,
+        loader: Callable[[str], List[str]] = _load_from_provider,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.snapshot_path = snapshot_path
+        self._loader = loader
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._refreshing: Set[str] = set()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        if snapshot_path:
+            self._load_snapshot()
+
+    def get(self, provider: str) -> List[str]:
+        """
+        Get a provider's model list.
+
+        Args:
+            provider: Provider name (full name)
+
+        Returns:
+            List of model names
+        """
+        entry = self._entries.get(provider)
+        if entry is None:
+            return self.refresh(provider, only_if_missing=True)
+
+        if time.time() - entry.fetched_at > self.ttl_seconds:
+            self._refresh_in_background(provider)
+        return entry.models
+
+    def version(self, provider: str) -> Optional[str]:
+        """
+        Get the version of a provider's cached catalog.
+
+        Args:
+            provider: Provider name (full name)
+
+        Returns:
+            Version identifier, or None if the catalog was never fetched
+        """
+        entry = self._entries.get(provider)
+        return entry.version if entry else None
+
+    def refresh(self, provider: str, only_if_missing: bool = False) -> List[str]:
+        """
+        Fetch a provider's model list now and cache it.
+
+        Concurrent refreshes of the same provider share one fetch.
+
+        Args:
+            provider: Provider name (full name)
+            only_if_missing: Return the cached list if another caller fetched it meanwhile
+
+        Returns:
+            List of model names
+        """
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(provider, threading.Lock())
+
+        with fetch_lock:
+            entry = self._entries.get(provider)
+            if only_if_missing and entry is not None:
+                return entry.models
+
+            models = list(self._loader(provider))
+            if not models:
+                # An empty catalog is almost certainly a failed lookup; don't pin it
+                logger.warning(f"Model catalog for {provider} came back empty, not caching it")
+                return models
+
+            new_entry = CatalogEntry(models, time.time())
+            self._entries[provider] = new_entry
+            changed = entry is None or entry.version != new_entry.version
+            if changed:
+                logger.info(f"Model catalog for {provider} updated ({len(models)} models, version {new_entry.version})")
+
+        if changed:
+            _notify_refresh(provider, new_entry.version)
+        if self.snapshot_path:
+            self._save_snapshot()
+        return models
+
+    def invalidate(self, provider: Optional[str] = None) -> None:
+        """
+        Drop cached catalogs.
+
+        Args:
+            provider: Provider to drop, or None to drop all
+        """
+        with self._lock:
+            if provider is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(provider, None)
+
+    def _refresh_in_background(self, provider: str) -> None:
+        with self._lock:
+            if provider in self._refreshing:
+                return
+            self._refreshing.add(provider)
+
+        def run() -> None:
+            try:
+                self.refresh(provider)
+            except Exception as e:
+                # Keep serving the stale catalog until a refresh succeeds
+                logger.warning(f"Background refresh of the {provider} model catalog failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(provider)
+
+        threading.Thread(target=run, name=f"just-prompt-catalog-{provider}", daemon=True).start()
+
+    def _load_snapshot(self) -> None:
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Could not read model catalog snapshot {self.snapshot_path}: {e}")
+            return
+
+        for provider, data in snapshot.items():
+            try:
+                self._entries[provider] = CatalogEntry(list(data["models"]), float(data["fetched_at"]))
+            except (KeyError, TypeError, ValueError):
+                logger.warning(f"Ignoring malformed snapshot entry for {provider}")
+        logger.info(f"Loaded model catalogs for {len(self._entries)} provider(s) from {self.snapshot_path}")
+
+    def _save_snapshot(self) -> None:
+        with self._lock:
+            snapshot = {
+                provider: {"models": entry.models, "fetched_at": entry.fetched_at}
+                for provider, entry in self._entries.items()
+            }
+        temp_path = f"{self.snapshot_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            # Atomic replace so a crash never leaves a half-written snapshot
+            os.replace(temp_path, self.snapshot_path)
+        except Exception as e:
+            logger.warning(f"Could not write model catalog snapshot {self.snapshot_path}: {e}")
+
+
+def _env_ttl() -> float:
+    try:
+        return float(os.environ.get(CATALOG_TTL_ENV, DEFAULT_CATALOG_TTL_SECONDS))
+    except ValueError:
+        return DEFAULT_CATALOG_TTL_SECONDS
+
+
+_catalog: Optional[ModelCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_model_catalog() -> ModelCatalog:
+    """
+    Get the process-wide model catalog, creating it from the environment on first use.
+
+    Returns:
+        The shared ModelCatalog
+    """
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ModelCatalog(_env_ttl(), os.environ.get(CATALOG_SNAPSHOT_ENV) or None)
+    return _catalog
+
+
+def configure_model_catalog(ttl_seconds: Optional[float] = None, snapshot_path: Optional[str] = None) -> ModelCatalog:
+    """
+    Replace the process-wide model catalog.
+
+    Args:
+        ttl_seconds: Seconds a fetched catalog is served without revalidation
+        snapshot_path: JSON file to persist catalogs to, or None to keep them in memory only
+
+    Returns:
+        The new ModelCatalog
+    """
+    global _catalog
+    with _catalog_lock:
+        _catalog = ModelCatalog(_env_ttl() if ttl_seconds is None else ttl_seconds, snapshot_path)
+    logger.info(
+        f"Model catalog cache: TTL {_catalog.ttl_seconds:.0f}s"
+        + (f", snapshot {snapshot_path}" if snapshot_path else "")
+    )
+    return _catalog
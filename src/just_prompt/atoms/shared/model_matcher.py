@@ -0,0 +1,231 @@
+"""
+Local fuzzy matching of model names against a provider's catalog.
+"""
+
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Confidence at or above which a local match is used without asking the correction model
+DEFAULT_MATCH_CONFIDENCE = 0.8
+
+# Two candidates scoring within this margin are considered ambiguous
+AMBIGUITY_MARGIN = 0.05
+
+_SEPARATORS = re.compile(r"[\s_./:]+")
+_DASHES = re.compile(r"-+")
+_DATE_SUFFIX = re.compile(r"-(\d{8}|\d{4}-\d{2}-\d{2})$")
+_TOKENS = re.compile(r"[a-z]+|\d+")
+
+
+def normalize_model_name(name: str) -> str:
+    """
+    Normalize a model name for comparison.
+
+    Lowercases, drops a "models/" prefix and turns dots, underscores, slashes
+    and spaces into dashes, so "Claude_3.5 Sonnet" becomes "claude-3-5-sonnet".
+
+    Args:
+        name: Model name
+
+    Returns:
+        Normalized name
+    """
+    name = name.strip().lower()
+    if name.startswith("models/"):
+        name = name[len("models/"):]
+    name = _SEPARATORS.sub("-", name)
+    return _DASHES.sub("-", name).strip("-")
+
+
+def alias_key(name: str) -> str:
+    """
+    Reduce a model name to the key shared by all of its aliases.
+
+    Applies normalization, then strips "-latest" and date suffixes
+    ("-20250219", "-2024-08-06"), so every snapshot of a model shares a key.
+
+    Args:
+        name: Model name
+
+    Returns:
+        Alias key
+    """
+    key = normalize_model_name(name)
+    if key.endswith("-latest"):
+        key = key[: -len("-latest")]
+    return _DATE_SUFFIX.sub("", key)
+
+
+def _compact(key: str) -> str:
+    return key.replace("-", "")
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Compute the Levenshtein distance between two strings.
+
+    Args:
+        a: First string
+        b: Second string
+
+    Returns:
+        Number of single-character insertions, deletions and substitutions
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def _contains_run(sequence: List[str], run: List[str]) -> bool:
+    """Whether run appears in sequence in order, with nothing in between."""
+    return any(sequence[i:i + len(run)] == run for i in range(len(sequence) - len(run) + 1))
+
+
+def _preferred(models: List[str], key: str) -> str:
+    """Pick the model a bare alias refers to: the undated name, then -latest, then the newest snapshot."""
+    for model in models:
+        if normalize_model_name(model) == key:
+            return model
+    for model in models:
+        if normalize_model_name(model).endswith("-latest"):
+            return model
+    return max(models, key=normalize_model_name)
+
+
+class MatchResult:
+    """
+    Outcome of a local match.
+    """
+
+    def __init__(self, model: Optional[str], confidence: float, reason: str):
+        self.model = model
+        self.confidence = confidence
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"MatchResult(model={self.model!r}, confidence={self.confidence:.2f}, reason={self.reason!r})"
+
+
+class ModelMatcher:
+    """
+    Similarity index over one version of a provider's catalog.
+
+    Models are grouped by alias key; each group is indexed by its character
+    trigrams and tokens. A lookup scores only the groups sharing a trigram with
+    the query, combining trigram overlap, token containment and edit distance.
+    """
+
+    def __init__(self, models: List[str]):
+        self.models = list(models)
+        groups: Dict[str, List[str]] = {}
+        for model in self.models:
+            groups.setdefault(alias_key(model), []).append(model)
+
+        self._keys: List[str] = list(groups)
+        self._targets: List[str] = [_preferred(groups[key], key) for key in self._keys]
+        self._compacts: List[str] = [_compact(key) for key in self._keys]
+        self._token_lists: List[List[str]] = [_TOKENS.findall(key) for key in self._keys]
+        self._tokens: List[Set[str]] = [set(sequence) for sequence in self._token_lists]
+        self._grams: List[Set[str]] = [_trigrams(compact) for compact in self._compacts]
+        self._by_compact: Dict[str, int] = {compact: i for i, compact in enumerate(self._compacts)}
+        self._by_normalized: Dict[str, str] = {normalize_model_name(model): model for model in self.models}
+        self._index: Dict[str, List[int]] = {}
+        for i, grams in enumerate(self._grams):
+            for gram in grams:
+                self._index.setdefault(gram, []).append(i)
+
+    def match(self, name: str) -> MatchResult:
+        """
+        Find the catalog model closest to a name.
+
+        Args:
+            name: Model name as the user typed it
+
+        Returns:
+            MatchResult with the model (None if nothing is similar) and a confidence between 0 and 1
+        """
+        normalized = normalize_model_name(name)
+        if normalized in self._by_normalized:
+            return MatchResult(self._by_normalized[normalized], 1.0, "normalized")
+
+        key = alias_key(name)
+        compact = _compact(key)
+        if compact in self._by_compact:
+            return MatchResult(self._targets[self._by_compact[compact]], 0.95, "alias")
+
+        token_list = _TOKENS.findall(key)
+        tokens = set(token_list)
+        if tokens and any(token.isalpha() for token in tokens):
+            # The tokens must appear in order and side by side in exactly one model, and end
+            # its name: "haiku" is "claude-3-5-haiku", but "o4-mini" isn't "gpt-4o-mini"
+            # and "o3" isn't "o3-mini"
+            containing = [i for i, sequence in enumerate(self._token_lists) if _contains_run(sequence, token_list)]
+            if len(containing) == 1 and self._token_lists[containing[0]][-len(token_list):] == token_list:
+                return MatchResult(self._targets[containing[0]], 0.9, "tokens")
+
+        scores = sorted(
+            ((self._score(compact, tokens, i), i) for i in self._candidates(compact)),
+            reverse=True,
+        )
+        if not scores:
+            return MatchResult(None, 0.0, "no candidates")
+
+        best, best_index = scores[0]
+        confidence = best
+        if len(scores) > 1 and best - scores[1][0] < AMBIGUITY_MARGIN:
+            confidence *= 0.8
+        return MatchResult(self._targets[best_index], round(confidence, 3), "similarity")
+
+    def _candidates(self, compact: str) -> Set[int]:
+        candidates: Set[int] = set()
+        for gram in _trigrams(compact):
+            candidates.update(self._index.get(gram, ()))
+        return candidates
+
+    def _score(self, compact: str, tokens: Set[str], i: int) -> float:
+        grams = _trigrams(compact)
+        gram_overlap = len(grams & self._grams[i]) / len(grams | self._grams[i])
+        token_containment = len(tokens & self._tokens[i]) / len(tokens) if tokens else 0.0
+        longest = max(len(compact), len(self._compacts[i])) or 1
+        edit_similarity = 1.0 - edit_distance(compact, self._compacts[i]) / longest
+        return 0.4 * gram_overlap + 0.3 * token_containment + 0.3 * edit_similarity
+
+
+_matchers: Dict[str, Tuple[str, ModelMatcher]] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_model_matcher(provider: str, version: str, models: List[str]) -> ModelMatcher:
+    """
+    Get the matcher for a version of a provider's catalog, building it on first use.
+
+    Args:
+        provider: Provider name (full name)
+        version: Catalog version
+        models: The catalog's model names
+
+    Returns:
+        ModelMatcher for the catalog
+    """
+    cached = _matchers.get(provider)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    matcher = ModelMatcher(models)
+    with _matchers_lock:
+        _matchers[provider] = (version, matcher)
+    return matcher
@@ -2,14 +2,60 @@
 Model router for dispatching requests to the appropriate provider.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-import importlib
-from .utils import split_provider_and_model
-from .data_types import ModelProviders
+from typing import List, Dict, Any, Optional, Tuple
+from .utils import parse_model_spec, split_provider_and_model
+from .data_types import ModelSpec
+from .provider_registry import get_provider_registry
+from . import rate_limiter
+from .retry import call_with_retry, acall_with_retry, classify_error, ErrorClassification, RetryBudget
+from .call_context import current_call_context
+from .hedging import timed_call, ahedged_call
+from .deadline import check_deadline
+from .cancellation import check_cancelled
+from .circuit_breaker import get_circuit_breaker
+from .model_catalog import get_model_catalog
+from .correction_memo import get_correction_memo
+from .response_cache import cached_response, response_cache_key, store_response
+from .single_flight import requests_are_independent, single_flight
+from .model_matcher import DEFAULT_MATCH_CONFIDENCE, ModelMatcher, get_model_matcher
+from .negative_cache import AUTH_FAILED, NOT_FOUND, PERMISSION_DENIED, negative_cache
+from .validator import raise_if_known_failure
 
 logger = logging.getLogger(__name__)
 
+# Hold-back applied after a 429 that came without a Retry-After hint
+DEFAULT_RATE_LIMIT_PENALTY_SECONDS = 1.0
+
+
+def _retry_budget() -> Optional[RetryBudget]:
+    """Get the retry budget of the tool call currently executing, if any."""
+    context = current_call_context()
+    return context.retry_budget if context else None
+
+
+def _error_observer(provider_name: str, models: Tuple[str, ...] = ()):
+    """Build a callback that feeds the errors of every attempt back into shared state."""
+    def observe(classification: ErrorClassification) -> None:
+        # Remember permanent failures, under the requested as well as the corrected model name
+        if classification.kind in (AUTH_FAILED, PERMISSION_DENIED, NOT_FOUND):
+            message = f"{classification.kind.replace('_', ' ')} (HTTP {classification.status_code}), not retrying for now"
+            for model in models:
+                negative_cache.record(provider_name, model, classification.kind, f"{provider_name}:{model} {message}")
+        if classification.kind == "rate_limited":
+            rate_limiter.penalize(
+                provider_name, classification.retry_after or DEFAULT_RATE_LIMIT_PENALTY_SECONDS
+            )
+    return observe
+
+
+def _corrected_spec(spec: ModelSpec, validated_model: str) -> ModelSpec:
+    """Get the spec of the model actually called, re-parsing only when validation corrected it."""
+    if validated_model == spec.model:
+        return spec
+    return parse_model_spec(f"{spec.provider}:{validated_model}")
+
 
 class ModelRouter:
     """
@@ -28,22 +74,19 @@ class ModelRouter:
         Returns:
             Validated and potentially corrected model name
         """
-        # Early return for our thinking token model to bypass validation
-        if "claude-3-7-sonnet-20250219" in model_name:
-            return model_name
-
         try:
-            # Import the provider module
-            provider_module_name = f"just_prompt.atoms.llm_providers.{provider_name}"
-            provider_module = importlib.import_module(provider_module_name)
-
-            # Get available models
-            available_models = provider_module.list_models()
+            # Get available models from the cached catalog
+            available_models = get_model_catalog().get(provider_name)
 
             # Check if model is in available models
             if model_name in available_models:
                 return model_name
 
+            # Thinking and reasoning effort suffixes aren't part of catalog names
+            spec = parse_model_spec(f"{provider_name}:{model_name}")
+            if spec.base_model != model_name and spec.base_model in available_models:
+                return model_name
+
             # Model needs correction - use the default correction model
             import os
 
@@ -81,24 +124,67 @@ class ModelRouter:
         Returns:
             Response from the model
         """
-        provider_prefix, model = split_provider_and_model(model_string)
-        provider = ModelProviders.from_name(provider_prefix)
+        # Parsed once per distinct model string; raises ValueError for an unknown prefix
+        spec = parse_model_spec(model_string)
+        provider = get_provider_registry().resolve(spec.provider)
+        model = spec.model
 
-        if not provider:
-            raise ValueError(f"Unknown provider prefix: {provider_prefix}")
+        # Fail fast before validation, which calls the provider too; the breaker is
+        # keyed on the requested name so corrected models fail fast as well
+        breaker = get_circuit_breaker(provider.full_name, model)
+        breaker.raise_if_open()
+        raise_if_known_failure(provider.full_name, model)
 
         # Validate and potentially correct the model name
         validated_model = ModelRouter.validate_and_correct_model(
             provider.full_name, model
         )
+        validated_spec = _corrected_spec(spec, validated_model)
 
-        # Import the appropriate provider module
-        try:
-            module_name = f"just_prompt.atoms.llm_providers.{provider.full_name}"
-            provider_module = importlib.import_module(module_name)
+        # Serve a repeated prompt from the response cache when it is enabled
+        cached, cache_key = cached_response(provider.full_name, validated_model, text, model_string)
+        if cached is not None:
+            return cached
 
-            # Call the prompt function
-            return provider_module.prompt(text, validated_model)
+        try:
+            # Imported on the provider's first request, then reused
+            provider_module = provider.module
+
+            def attempt() -> str:
+                # Pace every attempt to stay under the provider's learned rate limits
+                rate_limiter.acquire(provider.full_name, text)
+                check_deadline()
+                check_cancelled()
+                return provider_module.prompt(text, validated_spec)
+
+            def call() -> str:
+                # Fail fast while the provider is known to be down
+                breaker.before_call()
+                try:
+                    # Call the prompt function, timing attempts and retrying transient failures
+                    response = call_with_retry(
+                        timed_call,
+                        provider.full_name,
+                        validated_model,
+                        attempt,
+                        budget=_retry_budget(),
+                        description=f"{provider.full_name}:{validated_model}",
+                        on_error=_error_observer(provider.full_name, (model, validated_model)),
+                    )
+                except Exception as e:
+                    # One failure per call, however many attempts it made
+                    breaker.record_failure(classify_error(e).kind)
+                    raise
+                breaker.record_success()
+                return response
+
+            # Identical requests already in flight share one upstream call
+            if requests_are_independent():
+                response = call()
+            else:
+                response = single_flight.do(response_cache_key(provider.full_name, validated_model, text), call)
+            store_response(cache_key, provider.full_name, validated_model, text, response)
+            return response
         except ImportError as e:
             logger.error(f"Failed to import provider module: {e}")
             raise ValueError(f"Provider not available: {provider.full_name}")
@@ -106,6 +192,81 @@ class ModelRouter:
             logger.error(f"Error routing prompt to {provider.full_name}: {e}")
             raise
 
+    @staticmethod
+    async def aroute_prompt(model_string: str, text: str) -> str:
+        """
+        Route a prompt to the appropriate provider's async adapter.
+
+        Model validation still relies on the blocking list_models calls, so it
+        runs in a worker thread; the prompt itself is awaited on the event loop.
+
+        Args:
+            model_string: String in format "provider:model"
+            text: The prompt text
+
+        Returns:
+            Response from the model
+        """
+        # Parsed once per distinct model string; raises ValueError for an unknown prefix
+        spec = parse_model_spec(model_string)
+        provider = get_provider_registry().resolve(spec.provider)
+        model = spec.model
+
+        breaker = get_circuit_breaker(provider.full_name, model)
+        breaker.raise_if_open()
+        raise_if_known_failure(provider.full_name, model)
+
+        validated_model = await asyncio.to_thread(
+            ModelRouter.validate_and_correct_model, provider.full_name, model
+        )
+        validated_spec = _corrected_spec(spec, validated_model)
+
+        cached, cache_key = cached_response(provider.full_name, validated_model, text, model_string)
+        if cached is not None:
+            return cached
+
+        try:
+            provider_module = provider.module
+
+            async def attempt() -> str:
+                await rate_limiter.aacquire(provider.full_name, text)
+                check_deadline()
+                return await provider_module.aprompt(text, validated_spec)
+
+            async def call() -> str:
+                breaker.before_call()
+                try:
+                    response = await acall_with_retry(
+                        ahedged_call,
+                        provider.full_name,
+                        validated_model,
+                        attempt,
+                        budget=_retry_budget(),
+                        description=f"{provider.full_name}:{validated_model}",
+                        on_error=_error_observer(provider.full_name, (model, validated_model)),
+                    )
+                except asyncio.CancelledError:
+                    breaker.record_failure("cancelled")
+                    raise
+                except Exception as e:
+                    breaker.record_failure(classify_error(e).kind)
+                    raise
+                breaker.record_success()
+                return response
+
+            if requests_are_independent():
+                response = await call()
+            else:
+                response = await single_flight.ado(response_cache_key(provider.full_name, validated_model, text), call)
+            store_response(cache_key, provider.full_name, validated_model, text, response)
+            return response
+        except ImportError as e:
+            logger.error(f"Failed to import provider module: {e}")
+            raise ValueError(f"Provider not available: {provider.full_name}")
+        except Exception as e:
+            logger.error(f"Error routing async prompt to {provider.full_name}: {e}")
+            raise
+
     @staticmethod
     def route_list_models(provider_name: str) -> List[str]:
         """
@@ -117,18 +278,11 @@ class ModelRouter:
         Returns:
             List of model names
         """
-        provider = ModelProviders.from_name(provider_name)
-
-        if not provider:
-            raise ValueError(f"Unknown provider: {provider_name}")
+        provider = get_provider_registry().resolve(provider_name)
 
-        # Import the appropriate provider module
         try:
-            module_name = f"just_prompt.atoms.llm_providers.{provider.full_name}"
-            provider_module = importlib.import_module(module_name)
-
             # Call the list_models function
-            return provider_module.list_models()
+            return provider.module.list_models()
         except ImportError as e:
             logger.error(f"Failed to import provider module: {e}")
             raise ValueError(f"Provider not available: {provider.full_name}")
@@ -136,6 +290,23 @@ class ModelRouter:
             logger.error(f"Error listing models for {provider.full_name}: {e}")
             raise
 
+    @staticmethod
+    def _in_catalog(provider: str, model: str, available_models: List[str]) -> bool:
+        """
+        Check whether a model name, ignoring any thinking or reasoning suffix, is in a catalog.
+
+        Args:
+            provider: Full provider name
+            model: Model name, optionally with a suffix
+            available_models: The provider's catalog
+
+        Returns:
+            True if the model or its base name is available
+        """
+        if model in available_models:
+            return True
+        return parse_model_spec(f"{provider}:{model}").base_model in available_models
+
     @staticmethod
     def magic_model_correction(provider: str, model: str, correction_model: str) -> str:
         """
@@ -149,33 +320,71 @@ class ModelRouter:
         Returns:
             Corrected model name
         """
-        provider_module_name = f"just_prompt.atoms.llm_providers.{provider}"
-
         try:
-            provider_module = importlib.import_module(provider_module_name)
-            available_models = provider_module.list_models()
+            # Accept short provider names as well
+            provider_handle = get_provider_registry().get(provider)
+            if provider_handle:
+                provider = provider_handle.full_name
+            # Don't spend a catalog fetch or a correction on a request that is going to fail anyway
+            if negative_cache.lookup(provider, model) is not None:
+                logger.info(f"Skipping correction of {provider}:{model}, known to fail")
+                return model
+            catalog = get_model_catalog()
+            available_models = catalog.get(provider)
 
             # If model is already in available models, no correction needed
             if model in available_models:
                 logger.info(f"Using {provider} and {model}")
                 return model
 
+            # Reuse a correction already made against this version of the catalog
+            catalog_version = catalog.version(provider)
+            if catalog_version:
+                remembered = get_correction_memo().get(provider, model, catalog_version)
+                if remembered in available_models:
+                    logger.info(f"Using remembered correction {provider}:{model} -> {remembered}")
+                    return remembered
+
+            # Try the local matcher first; only ask the correction model when it isn't sure
+            matcher = (
+                get_model_matcher(provider, catalog_version, available_models)
+                if catalog_version
+                else ModelMatcher(available_models)
+            )
+            # Match the base name only, keeping reasoning/thinking suffixes such as ":high" or ":4k";
+            # other colons are part of the name (e.g. ollama's "llama3:8b")
+            base_model = parse_model_spec(f"{provider}:{model}").base_model
+            suffix = model[len(base_model):] if base_model != model else ""
+            match = matcher.match(base_model)
+            matched_model = f"{match.model}{suffix}" if match.model else None
+            if (
+                matched_model
+                and match.confidence >= DEFAULT_MATCH_CONFIDENCE
+                and ModelRouter._in_catalog(provider, matched_model, available_models)
+            ):
+                logger.info(
+                    f"Matched {provider}:{model} -> {matched_model} locally "
+                    f"(confidence {match.confidence:.2f}, {match.reason})"
+                )
+                return matched_model
+            logger.info(
+                f"Local match for {provider}:{model} not confident enough "
+                f"({match.model}, {match.confidence:.2f}), asking the correction model"
+            )
+
             # Model needs correction - use correction model to correct it
-            correction_provider, correction_model_name = split_provider_and_model(
+            correction_provider, _ = split_provider_and_model(
                 correction_model
             )
-            correction_provider_enum = ModelProviders.from_name(correction_provider)
+            correction_provider_handle = get_provider_registry().get(correction_provider)
 
-            if not correction_provider_enum:
+            if not correction_provider_handle:
                 logger.warning(
                     f"Invalid correction model provider: {correction_provider}, skipping correction"
                 )
                 return model
 
-            correction_module_name = (
-                f"just_prompt.atoms.llm_providers.{correction_provider_enum.full_name}"
-            )
-            correction_module = importlib.import_module(correction_module_name)
+            correction_module = correction_provider_handle.module
 
             # Build prompt for the correction model
             prompt = f"""
@@ -186,8 +395,9 @@ Only return the exact model name, nothing else.
 Available models: {', '.join(available_models)}
 """
             # Get correction from correction model
+            rate_limiter.acquire(correction_provider_handle.full_name, prompt)
             corrected_model = correction_module.prompt(
-                prompt, correction_model_name
+                prompt, parse_model_spec(correction_model)
             ).strip()
 
             # Verify the corrected model exists in the available models
@@ -195,6 +405,8 @@ Available models: {', '.join(available_models)}
                 logger.info(f"correction_model: {correction_model}")
                 logger.info(f"models_prefixed_by_provider: {provider}:{model}")
                 logger.info(f"corrected_model: {corrected_model}")
+                if catalog_version:
+                    get_correction_memo().put(provider, model, catalog_version, corrected_model)
                 return corrected_model
             else:
                 logger.warning(
@@ -0,0 +1,217 @@
+"""
+Short-lived cache of permanent failures: unknown models, rejected keys and unconfigured providers.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .model_catalog import on_catalog_refresh
+
+logger = logging.getLogger(__name__)
+
+# Failure kinds, named like the retry engine's error classifications
+NOT_FOUND = "not_found"
+AUTH_FAILED = "auth_failed"
+PERMISSION_DENIED = "permission_denied"
+UNCONFIGURED = "unconfigured"
+
+# Seconds each kind of failure is remembered
+DEFAULT_NEGATIVE_TTLS = {
+    NOT_FOUND: 300.0,
+    AUTH_FAILED: 60.0,
+    PERMISSION_DENIED: 60.0,
+    UNCONFIGURED: 30.0,
+}
+
+# Kinds that hold for every model of the provider (a rejected or missing key);
+# the others, including permission errors, are remembered per model
+PROVIDER_WIDE_KINDS = {AUTH_FAILED, UNCONFIGURED}
+
+
+class KnownFailureError(ValueError):
+    """Raised instead of calling a provider for a request that is known to fail."""
+
+
+class NegativeEntry:
+    """
+    A remembered failure.
+    """
+
+    def __init__(self, kind: str, message: str, expires_at: float):
+        self.kind = kind
+        self.message = message
+        self.expires_at = expires_at
+
+
+class NegativeCache:
+    """
+    Remembers failures that won't go away by retrying, so repeats fail without
+    validation, model correction or a network call.
+
+    Authentication failures and missing configuration are recorded for the whole
+    provider; unknown models and permission errors for the provider and model.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None):
+        self.ttls = dict(DEFAULT_NEGATIVE_TTLS, **(ttls or {}))
+        self.availability_checked_at: Optional[float] = None
+        self._entries: Dict[Tuple[str, Optional[str]], NegativeEntry] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: Optional[str], kind: str, message: str, now: Optional[float] = None) -> None:
+        """
+        Remember a failure.
+
+        Args:
+            provider: Provider name (full name)
+            model: Model name; ignored for provider-wide kinds
+            kind: One of NOT_FOUND, AUTH_FAILED, PERMISSION_DENIED or UNCONFIGURED
+            message: Error message repeated to later callers
+            now: Current monotonic time (defaults to time.monotonic())
+        """
+        now = time.monotonic() if now is None else now
+        key = (provider, None if kind in PROVIDER_WIDE_KINDS else model)
+        with self._lock:
+            if key not in self._entries:
+                logger.info(
+                    f"Remembering {kind} for {provider}{':' + key[1] if key[1] else ''} "
+                    f"for {self.ttls[kind]:.0f}s"
+                )
+            self._entries[key] = NegativeEntry(kind, message, now + self.ttls[kind])
+
+    def forget(self, provider: str, model: Optional[str] = None, kind: Optional[str] = None) -> None:
+        """
+        Drop remembered failures.
+
+        Args:
+            provider: Provider name (full name)
+            model: Only drop the entry of this model; None drops the provider-wide entry
+            kind: Only drop entries of this kind
+        """
+        with self._lock:
+            entry = self._entries.get((provider, model))
+            if entry is not None and (kind is None or entry.kind == kind):
+                del self._entries[(provider, model)]
+
+    def forget_kind(self, provider: str, kind: str) -> None:
+        """
+        Drop every remembered failure of one kind for a provider.
+
+        Args:
+            provider: Provider name (full name)
+            kind: Failure kind to drop
+        """
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if key[0] == provider and entry.kind == kind]:
+                del self._entries[key]
+
+    def lookup(self, provider: str, model: Optional[str] = None, now: Optional[float] = None) -> Optional[NegativeEntry]:
+        """
+        Find a live failure for a provider and model.
+
+        Args:
+            provider: Provider name (full name)
+            model: Model name
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            The remembered failure, or None
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for key in ((provider, None), (provider, model)):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry.expires_at <= now:
+                    del self._entries[key]
+                    continue
+                return entry
+        return None
+
+    def raise_if_known(self, provider: str, model: str, now: Optional[float] = None) -> None:
+        """
+        Fail fast for a request that is known to fail.
+
+        Args:
+            provider: Provider name (full name)
+            model: Model name
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Raises:
+            KnownFailureError: If a live failure is remembered for the provider or model
+        """
+        entry = self.lookup(provider, model, now)
+        if entry is not None:
+            raise KnownFailureError(entry.message)
+
+    def availability_expired(self, now: Optional[float] = None) -> bool:
+        """
+        Whether the provider configuration should be checked again.
+
+        Args:
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            True if the configuration was never checked or the check is older than the UNCONFIGURED TTL
+        """
+        now = time.monotonic() if now is None else now
+        return self.availability_checked_at is None or now - self.availability_checked_at >= self.ttls[UNCONFIGURED]
+
+    def record_availability(self, availability: Dict[str, bool], messages: Dict[str, str], now: Optional[float] = None) -> None:
+        """
+        Record which providers are configured.
+
+        Args:
+            availability: Provider names mapped to whether they are configured
+            messages: Error messages for the unconfigured providers
+            now: Current monotonic time (defaults to time.monotonic())
+        """
+        now = time.monotonic() if now is None else now
+        for provider, available in availability.items():
+            if available:
+                self.forget(provider, kind=UNCONFIGURED)
+            else:
+                self.record(provider, None, UNCONFIGURED, messages.get(provider, f"Provider not configured: {provider}"), now)
+        self.availability_checked_at = now
+
+    def snapshot(self, provider: str, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Describe the live failures of a provider.
+
+        Args:
+            provider: Provider name (full name)
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            List of dictionaries with the model (None for provider-wide), kind and seconds left
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entries = [
+                (model, entry) for (name, model), entry in self._entries.items()
+                if name == provider and entry.expires_at > now
+            ]
+        return [
+            {"model": model, "kind": entry.kind, "expires_in_seconds": round(entry.expires_at - now, 1)}
+            for model, entry in sorted(entries, key=lambda item: item[0] or "")
+        ]
+
+    def clear(self) -> None:
+        """Forget every remembered failure."""
+        with self._lock:
+            self._entries.clear()
+        self.availability_checked_at = None
+
+
+negative_cache = NegativeCache()
+
+
+def _on_catalog_refresh(provider: str, version: str) -> None:
+    # A changed catalog may list models that were unknown before
+    negative_cache.forget_kind(provider, NOT_FOUND)
+
+
+on_catalog_refresh(_on_catalog_refresh)
@@ -0,0 +1,81 @@
+"""
+Stable-prefix prompts for provider-side prompt caching, and reporting of cached input tokens.
+"""
+
+import logging
+from string import Formatter
+from typing import Any, Optional
+
+from .call_context import current_call_context
+
+logger = logging.getLogger(__name__)
+
+
+class CacheablePrompt(str):
+    """
+    Prompt text whose first prefix_length characters are the same on every run.
+
+    It behaves as the plain prompt string everywhere; providers that support
+    explicit cache breakpoints (Anthropic) mark the end of the prefix, and
+    providers with automatic prefix caching (OpenAI, DeepSeek) benefit from the
+    prefix being byte-identical across runs.
+    """
+
+    prefix_length: int
+
+    def __new__(cls, text: str, prefix_length: int = 0):
+        instance = super().__new__(cls, text)
+        instance.prefix_length = max(0, min(prefix_length, len(text)))
+        return instance
+
+    @property
+    def prefix(self) -> str:
+        """The stable part of the prompt."""
+        return str(self[: self.prefix_length])
+
+    @property
+    def suffix(self) -> str:
+        """The part of the prompt that changes between runs."""
+        return str(self[self.prefix_length:])
+
+
+def format_cacheable(template: str, **values: Any) -> CacheablePrompt:
+    """
+    Fill a prompt template, keeping everything before its first placeholder as the stable prefix.
+
+    Args:
+        template: str.format template; static instructions should come before the first placeholder
+        **values: Values for the template's placeholders
+
+    Returns:
+        The filled prompt, as a CacheablePrompt
+    """
+    prefix_length = 0
+    for literal_text, field_name, _, _ in Formatter().parse(template):
+        prefix_length += len(literal_text)
+        if field_name is not None:
+            break
+    return CacheablePrompt(template.format(**values), prefix_length)
+
+
+def record_cache_usage(provider: str, model: str, input_tokens: Optional[int], cached_tokens: Optional[int]) -> None:
+    """
+    Report how many input tokens of a call were read from the provider's prompt cache.
+
+    The numbers are logged and, inside a tool call, added to the call context
+    so the tool output can show them.
+
+    Args:
+        provider: Provider name (full name)
+        model: Model name
+        input_tokens: Input tokens of the call, if reported
+        cached_tokens: Input tokens read from the provider's cache, if reported
+    """
+    if not cached_tokens:
+        return
+    logger.info(f"{provider}:{model} read {cached_tokens} of {input_tokens or '?'} input tokens from the prompt cache")
+    context = current_call_context()
+    if context is not None:
+        context.prompt_cache_reads.append(
+            dict(model=f"{provider}:{model}", cached_tokens=cached_tokens, input_tokens=input_tokens)
+        )
@@ -0,0 +1,225 @@
+"""
+Registry of providers: the built-in ones and those installed by other packages.
+
+Third-party packages add a provider through an entry point in the
+"just_prompt.providers" group, named after the provider and pointing at a module
+with the same functions as the built-in provider modules (prompt, aprompt,
+list_models, and optionally alist_models). The model reaches prompt and aprompt as a ModelSpec, whose str()
+is the model name:
+
+    [project.entry-points."just_prompt.providers"]
+    myprovider = "my_package.just_prompt_provider"
+"""
+
+import importlib
+import logging
+import threading
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, List, Optional
+
+from .data_types import ModelProviders
+from .lazy import Lazy
+
+logger = logging.getLogger(__name__)
+
+# Entry point group third-party providers register under
+ENTRY_POINT_GROUP = "just_prompt.providers"
+
+# Package holding the built-in provider modules
+BUILTIN_PROVIDER_PACKAGE = "just_prompt.atoms.llm_providers"
+
+# Source of the providers shipped with just-prompt
+BUILTIN_SOURCE = "builtin"
+
+
+class ProviderHandle:
+    """
+    A registered provider and its module, imported once on first use.
+    """
+
+    def __init__(
+        self,
+        full_name: str,
+        module_path: str,
+        short_name: Optional[str] = None,
+        source: str = BUILTIN_SOURCE,
+        loader: Optional[Callable[[], Any]] = None,
+    ):
+        self.full_name = full_name
+        self.short_name = short_name
+        self.module_path = module_path
+        self.source = source
+        self._module = Lazy(loader or (lambda: importlib.import_module(module_path)))
+
+    @property
+    def name(self) -> str:
+        """Provider name in the style of the ModelProviders members (e.g. "OPENAI")."""
+        return self.full_name.upper()
+
+    @property
+    def names(self) -> List[str]:
+        """The full name and, if there is one, the short name."""
+        return [self.full_name] + ([self.short_name] if self.short_name else [])
+
+    @property
+    def module(self) -> Any:
+        """The provider module, imported if this is the first use."""
+        return self._module.get()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the provider module has been imported."""
+        return self._module.built
+
+    def reset(self) -> None:
+        """Forget the imported module, so the next use imports it again."""
+        self._module.reset()
+
+
+class ProviderRegistry:
+    """
+    Providers looked up by full or short name.
+    """
+
+    def __init__(self):
+        self._by_name: Dict[str, ProviderHandle] = {}
+        self._handles: List[ProviderHandle] = []
+        self._lock = threading.Lock()
+
+    def register(self, handle: ProviderHandle) -> ProviderHandle:
+        """
+        Add a provider.
+
+        Args:
+            handle: The provider to add
+
+        Returns:
+            The handle
+
+        Raises:
+            ValueError: If one of its names is already taken by another provider
+        """
+        with self._lock:
+            for name in handle.names:
+                existing = self._by_name.get(name)
+                if existing is not None:
+                    raise ValueError(
+                        f"Provider name '{name}' of {handle.full_name} ({handle.source}) "
+                        f"is already used by {existing.full_name} ({existing.source})"
+                    )
+            for name in handle.names:
+                self._by_name[name] = handle
+            self._handles.append(handle)
+        return handle
+
+    def get(self, name: str) -> Optional[ProviderHandle]:
+        """
+        Find a provider by full or short name.
+
+        Args:
+            name: Provider name (full or short)
+
+        Returns:
+            The provider's handle, or None if no provider has that name
+        """
+        return self._by_name.get(name)
+
+    def resolve(self, name: str) -> ProviderHandle:
+        """
+        Find a provider by full or short name.
+
+        Args:
+            name: Provider name (full or short)
+
+        Returns:
+            The provider's handle
+
+        Raises:
+            ValueError: If no provider has that name
+        """
+        handle = self._by_name.get(name)
+        if handle is None:
+            raise ValueError(f"Unknown provider: {name}")
+        return handle
+
+    def providers(self) -> List[ProviderHandle]:
+        """
+        List the registered providers, built-in ones first.
+
+        Returns:
+            The provider handles in registration order
+        """
+        with self._lock:
+            return list(self._handles)
+
+    def reset_modules(self) -> None:
+        """Forget every imported provider module, so each is imported again on next use."""
+        for handle in self.providers():
+            handle.reset()
+
+
+def _register_builtin_providers(registry: ProviderRegistry) -> None:
+    for provider in ModelProviders:
+        registry.register(ProviderHandle(
+            provider.full_name,
+            f"{BUILTIN_PROVIDER_PACKAGE}.{provider.full_name}",
+            short_name=provider.short_name,
+        ))
+
+
+def _register_entry_point_providers(registry: ProviderRegistry) -> None:
+    # Reading the entry points doesn't import the plugins; each loads on first use
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        source = entry_point.dist.name if entry_point.dist else entry_point.value
+        try:
+            registry.register(ProviderHandle(
+                entry_point.name,
+                entry_point.value,
+                source=source,
+                loader=entry_point.load,
+            ))
+            logger.info(f"Registered provider {entry_point.name} from {source}")
+        except ValueError as e:
+            logger.warning(f"Skipping provider plugin {entry_point.name}: {e}")
+
+
+_registry: Optional[ProviderRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """
+    Get the process-wide provider registry, populating it on first use.
+
+    Returns:
+        The shared ProviderRegistry
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                registry = ProviderRegistry()
+                _register_builtin_providers(registry)
+                _register_entry_point_providers(registry)
+                _registry = registry
+    return _registry
+
+
+def register_provider(full_name: str, module_path: str, short_name: Optional[str] = None) -> ProviderHandle:
+    """
+    Register a provider from code rather than through an entry point.
+
+    Args:
+        full_name: Provider name used as the model string prefix
+        module_path: Import path of the provider module
+        short_name: Optional short prefix
+
+    Returns:
+        The new provider's handle
+
+    Raises:
+        ValueError: If one of the names is already taken
+    """
+    return get_provider_registry().register(
+        ProviderHandle(full_name, module_path, short_name=short_name, source=module_path)
+    )
@@ -0,0 +1,329 @@
+"""
+Adaptive per-provider rate limiting driven by rate-limit response headers.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional, Tuple
+from .utils import get_api_key
+from . import cancellation
+from .deadline import remaining_time
+
+logger = logging.getLogger(__name__)
+
+# Window that provider limits are expressed in (requests / tokens per minute)
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+
+# Rough characters-per-token ratio used to estimate prompt size before sending
+CHARS_PER_TOKEN = 4
+
+# Header names per dimension: (limit, remaining, reset)
+OPENAI_STYLE_HEADERS = {
+    "requests": ("x-ratelimit-limit-requests", "x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+    "tokens": ("x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),
+}
+ANTHROPIC_HEADERS = {
+    "requests": ("anthropic-ratelimit-requests-limit", "anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+    "tokens": ("anthropic-ratelimit-tokens-limit", "anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-tokens-reset"),
+}
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset header into seconds from now.
+
+    OpenAI-style providers send durations like "1s", "6m0s" or "20ms";
+    Anthropic sends an RFC 3339 timestamp.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds until the limit resets, or None if the value can't be parsed
+    """
+    if not value:
+        return None
+    value = value.strip()
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+        return sum(float(number) * scale[unit] for number, unit in parts)
+
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+    except ValueError:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a prompt.
+
+    Args:
+        text: The prompt text
+
+    Returns:
+        Estimated token count (at least 1)
+    """
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class TokenBucket:
+    """
+    A continuously refilling token bucket.
+
+    Reservations may overdraw the bucket; the caller then waits until the
+    deficit has refilled, which paces requests instead of bursting into a 429.
+    A bucket without a known capacity never makes callers wait.
+    """
+
+    def __init__(self, capacity: Optional[float] = None, window_seconds: float = RATE_LIMIT_WINDOW_SECONDS):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.tokens = capacity if capacity is not None else 0.0
+        self.blocked_until = 0.0
+        self._updated_at = time.monotonic()
+
+    @property
+    def refill_per_second(self) -> float:
+        """Tokens added back per second."""
+        return self.capacity / self.window_seconds
+
+    def _refill(self, now: float) -> None:
+        if self.capacity is not None:
+            elapsed = max(0.0, now - self._updated_at)
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self._updated_at = now
+
+    def reserve(self, amount: float, now: Optional[float] = None) -> float:
+        """
+        Take tokens from the bucket.
+
+        Args:
+            amount: Number of tokens to take
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        now = time.monotonic() if now is None else now
+        wait = max(0.0, self.blocked_until - now)
+
+        if self.capacity is None:
+            return wait
+
+        self._refill(now)
+        # A single request larger than the bucket is capped so it can still go out
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens < 0:
+            wait = max(wait, -self.tokens / self.refill_per_second)
+        return wait
+
+    def observe(self, limit: Optional[float], remaining: Optional[float], reset_seconds: Optional[float], now: Optional[float] = None) -> None:
+        """
+        Update the bucket from a provider's rate-limit headers.
+
+        Args:
+            limit: Limit for the window
+            remaining: Units left in the current window
+            reset_seconds: Seconds until the window resets
+            now: Current monotonic time (defaults to time.monotonic())
+        """
+        now = time.monotonic() if now is None else now
+        if limit is not None and limit > 0:
+            if self.capacity is None:
+                self.tokens = limit
+            self.capacity = limit
+        self._refill(now)
+
+        if remaining is not None:
+            # The server's count already includes other clients sharing this key
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and reset_seconds:
+                self.blocked_until = max(self.blocked_until, now + reset_seconds)
+
+
+class RateLimiter:
+    """
+    Request and token buckets for one provider and API key.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = TokenBucket()
+        self.tokens = TokenBucket()
+        self._lock = threading.Lock()
+
+    def reserve(self, estimated_tokens: int) -> float:
+        """
+        Reserve capacity for one request.
+
+        Args:
+            estimated_tokens: Estimated tokens the request will consume
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            return max(self.requests.reserve(1, now), self.tokens.reserve(estimated_tokens, now))
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Learn limits from rate-limit response headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+        """
+        header_sets = ANTHROPIC_HEADERS if _get(headers, ANTHROPIC_HEADERS["requests"][0]) is not None \
+            or _get(headers, ANTHROPIC_HEADERS["tokens"][0]) is not None else OPENAI_STYLE_HEADERS
+
+        with self._lock:
+            now = time.monotonic()
+            for dimension, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+                limit_name, remaining_name, reset_name = header_sets[dimension]
+                limit = _to_float(_get(headers, limit_name))
+                remaining = _to_float(_get(headers, remaining_name))
+                if limit is None and remaining is None:
+                    continue
+                bucket.observe(limit, remaining, parse_reset(_get(headers, reset_name)), now)
+
+
+def _get(headers: Mapping[str, str], name: str) -> Optional[str]:
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.title())
+    return value
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _api_key_id(provider: str) -> str:
+    """Stable, non-reversible identifier for the provider's configured API key."""
+    api_key = get_api_key(provider) or ""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Get the rate limiter for a provider and its configured API key.
+
+    Args:
+        provider: Provider name (full name)
+
+    Returns:
+        The RateLimiter for the provider/key pair
+    """
+    key = (provider, _api_key_id(provider))
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.setdefault(key, RateLimiter(provider))
+    return limiter
+
+
+def _capped_at_deadline(wait: float) -> float:
+    """Shorten a pacing wait to the time left before the current deadline, if any."""
+    remaining = remaining_time()
+    return wait if remaining is None else min(wait, remaining)
+
+
+def acquire(provider: str, text: str) -> float:
+    """
+    Block until a request to the provider fits within its learned limits.
+
+    Never waits past the current deadline; the caller's deadline check then fails the request.
+
+    Args:
+        provider: Provider name (full name)
+        text: The prompt text, used to estimate token usage
+
+    Returns:
+        Seconds spent waiting
+    """
+    wait = _capped_at_deadline(get_rate_limiter(provider).reserve(estimate_tokens(text)))
+    if wait > 0:
+        logger.info(f"Pacing {provider} request for {wait:.2f}s to stay under its rate limit")
+        cancellation.sleep(wait, time.sleep)
+    return wait
+
+
+async def aacquire(provider: str, text: str) -> float:
+    """
+    Wait on the event loop until a request fits within the provider's learned limits.
+
+    Never waits past the current deadline; the caller's deadline check then fails the request.
+
+    Args:
+        provider: Provider name (full name)
+        text: The prompt text, used to estimate token usage
+
+    Returns:
+        Seconds spent waiting
+    """
+    wait = _capped_at_deadline(get_rate_limiter(provider).reserve(estimate_tokens(text)))
+    if wait > 0:
+        logger.info(f"Pacing {provider} request for {wait:.2f}s to stay under its rate limit")
+        await asyncio.sleep(wait)
+    return wait
+
+
+def observe_headers(provider: str, headers: Mapping[str, str]) -> None:
+    """
+    Feed rate-limit response headers back into the provider's limiter.
+
+    Args:
+        provider: Provider name (full name)
+        headers: Response headers
+    """
+    try:
+        get_rate_limiter(provider).observe_headers(headers)
+    except Exception as e:
+        logger.warning(f"Could not read rate-limit headers from {provider}: {e}")
+
+
+def penalize(provider: str, seconds: float) -> None:
+    """
+    Hold back new requests to a provider after it answered with a rate-limit error.
+
+    Args:
+        provider: Provider name (full name)
+        seconds: How long to hold requests back
+    """
+    limiter = get_rate_limiter(provider)
+    with limiter._lock:
+        until = time.monotonic() + seconds
+        limiter.requests.blocked_until = max(limiter.requests.blocked_until, until)
+
+
+def reset_rate_limiters() -> None:
+    """Forget all learned limits."""
+    with _limiters_lock:
+        _limiters.clear()
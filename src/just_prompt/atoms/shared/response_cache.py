@@ -0,0 +1,316 @@
+"""
+Content-addressed cache of model responses, in memory and optionally on disk.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .call_context import current_call_context
+from .similarity_cache import SIMILAR_SERVE, get_similarity_index
+from .single_flight import requests_are_independent
+
+logger = logging.getLogger(__name__)
+
+# Environment variables configuring the response cache
+RESPONSE_CACHE_ENV = "JUST_PROMPT_RESPONSE_CACHE"
+RESPONSE_CACHE_TTL_ENV = "JUST_PROMPT_RESPONSE_CACHE_TTL"
+
+# Per-call cache modes
+CACHE_USE = "use"
+CACHE_REFRESH = "refresh"
+CACHE_BYPASS = "bypass"
+CACHE_MODES = (CACHE_USE, CACHE_REFRESH, CACHE_BYPASS)
+
+# Value of RESPONSE_CACHE_ENV / --response-cache that keeps the cache in memory only
+MEMORY_ONLY = ":memory:"
+
+DEFAULT_CACHE_TTL_SECONDS = 24 * 3600.0
+DEFAULT_MEMORY_ENTRIES = 512
+DEFAULT_DISK_ENTRIES = 10000
+
+
+def validate_cache_mode(mode: Optional[str]) -> str:
+    """
+    Validate a per-call cache mode.
+
+    Args:
+        mode: "use", "refresh" or "bypass" (None means "use")
+
+    Returns:
+        The cache mode
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode is None:
+        return CACHE_USE
+    if mode not in CACHE_MODES:
+        raise ValueError(f"cache must be one of {', '.join(CACHE_MODES)}, got {mode!r}")
+    return mode
+
+
+def current_cache_mode() -> str:
+    """
+    Get the cache mode of the tool call currently executing.
+
+    Returns:
+        The call's cache mode, or "use" outside of a tool call
+    """
+    context = current_call_context()
+    return context.cache_mode if context is not None else CACHE_USE
+
+
+def response_cache_key(provider: str, model: str, text: str) -> str:
+    """
+    Compute the cache key of a prompt.
+
+    Args:
+        provider: Provider name (full name)
+        model: Resolved model name, including any reasoning/thinking suffix
+        text: The prompt text
+
+    Returns:
+        Hex digest identifying the request
+    """
+    base_model, _, suffix = model.partition(":")
+    payload = json.dumps([provider, base_model, suffix, text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier LRU cache of model responses.
+
+    The memory tier holds the most recently used entries; the optional SQLite
+    tier keeps responses across restarts. Both tiers expire entries after the
+    TTL and evict the least recently used entries beyond their size cap.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_entries: int = DEFAULT_DISK_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path and path != MEMORY_ONLY:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        provider TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        response TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                    """
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not open response cache {path}, caching in memory only: {e}")
+            self._conn = None
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response.
+
+        Args:
+            key: Key from response_cache_key
+
+        Returns:
+            The cached response, or None on a miss or if it expired
+        """
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                response, created_at = cached
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    return response
+                del self._memory[key]
+
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            with self._conn:
+                if now - created_at > self.ttl_seconds:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._remember(key, response, created_at)
+            return response
+
+    def put(self, key: str, provider: str, model: str, response: str) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Key from response_cache_key
+            provider: Provider name, kept for inspection of the disk tier
+            model: Model name, kept for inspection of the disk tier
+            response: The model's response
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            if self._conn is None:
+                return
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, response, now, now),
+                )
+                self._conn.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_disk_entries,),
+                )
+
+    def clear(self) -> None:
+        """Drop every cached response from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses")
+
+    def _remember(self, key: str, response: str, created_at: float) -> None:
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache.
+
+    Returns:
+        The ResponseCache, or None if response caching is not enabled
+    """
+    return _cache
+
+
+def configure_response_cache(path: Optional[str], ttl_seconds: Optional[float] = None) -> Optional[ResponseCache]:
+    """
+    Enable or disable the process-wide response cache.
+
+    Args:
+        path: SQLite file for the disk tier, ":memory:" for a memory-only cache, or None to disable caching
+        ttl_seconds: Seconds a response stays valid (default 24 hours)
+
+    Returns:
+        The new ResponseCache, or None if caching was disabled
+    """
+    global _cache
+    if not path:
+        _cache = None
+        logger.info("Response cache disabled")
+        return None
+    _cache = ResponseCache(path, DEFAULT_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds)
+    logger.info(f"Response cache enabled: {path}, TTL {_cache.ttl_seconds:.0f}s")
+    return _cache
+
+
+def cached_response(provider: str, model: str, text: str, model_string: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Look up a prompt in the response cache according to the current call's cache mode.
+
+    On an exact miss, a near-duplicate prompt sent to the same model is looked
+    up when near-duplicate lookup is enabled; depending on its action the
+    matched response is served, or only reported alongside a fresh call.
+
+    Args:
+        provider: Provider name (full name)
+        model: Resolved model name
+        text: The prompt text
+        model_string: Model string reported to the caller on a hit
+
+    Returns:
+        Tuple of (cached response or None, key to store the fresh response under or None)
+    """
+    cache = _cache
+    mode = current_cache_mode()
+    if cache is None or mode == CACHE_BYPASS or requests_are_independent():
+        return None, None
+
+    key = response_cache_key(provider, model, text)
+    if mode != CACHE_USE:
+        return None, key
+
+    context = current_call_context()
+    response = cache.get(key)
+    if response is not None:
+        logger.info(f"Response cache hit for {provider}:{model}")
+        if context is not None:
+            context.cache_hits.append(model_string)
+        return response, None
+
+    index = get_similarity_index()
+    match = index.lookup(f"{provider}:{model}", key, text) if index is not None else None
+    if match is not None:
+        match_key, similarity = match
+        response = cache.get(match_key)
+        if response is not None:
+            logger.info(f"Near-duplicate prompt for {provider}:{model} (similarity {similarity:.2f}), {index.action}")
+            if index.action == SIMILAR_SERVE:
+                if context is not None:
+                    context.cache_hits.append(f"{model_string} (similar prompt, {similarity:.2f})")
+                return response, None
+            if context is not None:
+                context.similar_matches.append(f"{model_string} ({similarity:.2f}): {response}")
+    return None, key
+
+
+def store_response(key: Optional[str], provider: str, model: str, text: str, response: str) -> None:
+    """
+    Store a fresh response under the key returned by cached_response.
+
+    Args:
+        key: Key from cached_response (None skips caching)
+        provider: Provider name (full name)
+        model: Resolved model name
+        text: The prompt text, indexed for near-duplicate lookup
+        response: The model's response
+    """
+    cache = _cache
+    if cache is None or key is None:
+        return
+    cache.put(key, provider, model, response)
+    index = get_similarity_index()
+    if index is not None:
+        index.add(f"{provider}:{model}", key, text)
@@ -0,0 +1,315 @@
+"""
+Retry policy for provider calls: error classification, backoff with jitter and Retry-After.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional
+from .deadline import DeadlineExceeded, remaining_time
+from . import cancellation
+from .cancellation import OperationCancelled
+from .circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits, server errors and overload
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Default number of retries a single tool call may spend across all its model calls
+DEFAULT_RETRY_BUDGET = 10
+
+
+class ErrorClassification:
+    """
+    What a provider error means for the caller.
+    """
+
+    def __init__(self, kind: str, retryable: bool, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        self.kind = kind
+        self.retryable = retryable
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    def __repr__(self) -> str:
+        return (
+            f"ErrorClassification(kind={self.kind!r}, retryable={self.retryable}, "
+            f"status_code={self.status_code}, retry_after={self.retry_after})"
+        )
+
+
+def _error_chain(error: BaseException):
+    """Yield an exception and the exceptions it was raised from."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for attribute in ("status_code", "code", "status"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    return None
+
+
+def _parse_retry_after(error: BaseException) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: BaseException) -> ErrorClassification:
+    """
+    Classify a provider error, looking through the chain of wrapped exceptions.
+
+    Args:
+        error: The exception raised by a provider call
+
+    Returns:
+        ErrorClassification describing the error
+    """
+    for cause in _error_chain(error):
+        if isinstance(cause, DeadlineExceeded):
+            return ErrorClassification("deadline_exceeded", False)
+        if isinstance(cause, OperationCancelled):
+            return ErrorClassification("cancelled", False)
+        if isinstance(cause, CircuitOpenError):
+            return ErrorClassification("circuit_open", False)
+
+        status_code = _status_code(cause)
+        if status_code is not None:
+            retry_after = _parse_retry_after(cause)
+            if status_code == 429:
+                return ErrorClassification("rate_limited", True, status_code, retry_after)
+            if status_code == 529 or status_code == 503:
+                return ErrorClassification("overloaded", True, status_code, retry_after)
+            if status_code in RETRYABLE_STATUS_CODES:
+                return ErrorClassification("server_error", True, status_code, retry_after)
+            if status_code == 401:
+                return ErrorClassification("auth_failed", False, status_code)
+            if status_code == 403:
+                # Often scoped to one model (e.g. a model the key isn't allowed to use)
+                return ErrorClassification("permission_denied", False, status_code)
+            if status_code == 404:
+                return ErrorClassification("not_found", False, status_code)
+            return ErrorClassification("bad_request", False, status_code)
+
+        # Match SDK connection/timeout errors by name to avoid importing every SDK
+        name = type(cause).__name__
+        if isinstance(cause, TimeoutError) or "Timeout" in name:
+            return ErrorClassification("timeout", True)
+        if isinstance(cause, ConnectionError) or "Connection" in name or "RemoteProtocol" in name:
+            return ErrorClassification("connection", True)
+
+    return ErrorClassification("unknown", False)
+
+
+class RetryBudget:
+    """
+    Caps the total number of retries one tool call may spend.
+
+    Shared by every model call made for the tool, so a failing provider can't
+    multiply a board run's cost by the number of members.
+    """
+
+    def __init__(self, max_retries: int = DEFAULT_RETRY_BUDGET):
+        self.max_retries = max_retries
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        """
+        Spend one retry if any are left.
+
+        Returns:
+            True if the retry may proceed
+        """
+        with self._lock:
+            if self.spent >= self.max_retries:
+                return False
+            self.spent += 1
+            return True
+
+    @property
+    def remaining(self) -> int:
+        """Retries left in the budget."""
+        return max(0, self.max_retries - self.spent)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, honouring the server's Retry-After hint.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 20.0, max_retry_after: float = 60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    def delay_for(self, attempt: int, classification: ErrorClassification) -> float:
+        """
+        Compute how long to wait before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far (1 after the first failure)
+            classification: Classification of the last error
+
+        Returns:
+            Delay in seconds
+        """
+        if classification.retry_after is not None:
+            return min(classification.retry_after, self.max_retry_after)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def should_retry(self, attempt: int, classification: ErrorClassification, budget: Optional[RetryBudget]) -> bool:
+        """
+        Decide whether another attempt is allowed.
+
+        Args:
+            attempt: Number of attempts made so far
+            classification: Classification of the last error
+            budget: Retry budget of the current tool call, if any
+
+        Returns:
+            True if the call should be retried
+        """
+        if not classification.retryable or attempt >= self.max_attempts:
+            return False
+        if budget is not None and not budget.try_spend():
+            logger.warning("Retry budget exhausted for this tool call, not retrying")
+            return False
+        return True
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def _fits_deadline(delay: float) -> bool:
+    """Whether a retry after the given delay would still start before the current deadline."""
+    remaining = remaining_time()
+    return remaining is None or delay < remaining
+
+
+def call_with_retry(
+    func: Callable[..., Any],
+    *args,
+    policy: Optional[RetryPolicy] = None,
+    budget: Optional[RetryBudget] = None,
+    description: str = "provider call",
+    on_error: Optional[Callable[[ErrorClassification], None]] = None,
+    **kwargs,
+) -> Any:
+    """
+    Call a function, retrying transient failures.
+
+    Args:
+        func: The function to call
+        *args: Positional arguments for func
+        policy: Retry policy (defaults to DEFAULT_RETRY_POLICY)
+        budget: Retry budget of the current tool call
+        description: Label used in log messages
+        on_error: Called with the classification of every failed attempt
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The function's return value
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            classification = classify_error(e)
+            if on_error is not None:
+                on_error(classification)
+            if not policy.should_retry(attempt, classification, budget):
+                raise
+            delay = policy.delay_for(attempt, classification)
+            if not _fits_deadline(delay):
+                logger.warning(f"{description} failed ({classification.kind}), no time left before the deadline to retry")
+                raise
+            logger.warning(
+                f"{description} failed ({classification.kind}, attempt {attempt}/{policy.max_attempts}), "
+                f"retrying in {delay:.2f}s: {e}"
+            )
+            # Wakes early if the tool call is cancelled
+            cancellation.sleep(delay, time.sleep)
+
+
+async def acall_with_retry(
+    func: Callable[..., Awaitable[Any]],
+    *args,
+    policy: Optional[RetryPolicy] = None,
+    budget: Optional[RetryBudget] = None,
+    description: str = "provider call",
+    on_error: Optional[Callable[[ErrorClassification], None]] = None,
+    **kwargs,
+) -> Any:
+    """
+    Await a coroutine function, retrying transient failures.
+
+    Args:
+        func: The coroutine function to call
+        *args: Positional arguments for func
+        policy: Retry policy (defaults to DEFAULT_RETRY_POLICY)
+        budget: Retry budget of the current tool call
+        description: Label used in log messages
+        on_error: Called with the classification of every failed attempt
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The coroutine's result
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            classification = classify_error(e)
+            if on_error is not None:
+                on_error(classification)
+            if not policy.should_retry(attempt, classification, budget):
+                raise
+            delay = policy.delay_for(attempt, classification)
+            if not _fits_deadline(delay):
+                logger.warning(f"{description} failed ({classification.kind}), no time left before the deadline to retry")
+                raise
+            logger.warning(
+                f"{description} failed ({classification.kind}, attempt {attempt}/{policy.max_attempts}), "
+                f"retrying in {delay:.2f}s: {e}"
+            )
+            await asyncio.sleep(delay)
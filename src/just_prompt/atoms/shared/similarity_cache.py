@@ -0,0 +1,289 @@
+"""
+Near-duplicate prompt lookup for the response cache, using MinHash and LSH.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# What to do with a near-duplicate: answer from the cache, or call the model and mention the match
+SIMILAR_SERVE = "serve"
+SIMILAR_OFFER = "offer"
+SIMILAR_ACTIONS = (SIMILAR_SERVE, SIMILAR_OFFER)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.9
+DEFAULT_INDEX_ENTRIES = 5000
+
+# 64 hash functions in 16 bands of 4 rows: a pair at similarity 0.9 shares a band with
+# probability ~1.0, a pair at 0.5 with ~0.64, and unrelated prompts rarely do
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+SHINGLE_WORDS = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORDS = re.compile(r"\S+")
+
+
+def _permutations(count: int) -> List[Tuple[int, int]]:
+    """Deterministic (a, b) coefficients of the universal hash functions."""
+    coefficients = []
+    for i in range(count):
+        digest = hashlib.blake2b(f"just-prompt-minhash-{i}".encode("utf-8"), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big") % _MERSENNE_PRIME or 1
+        b = int.from_bytes(digest[8:], "big") % _MERSENNE_PRIME
+        coefficients.append((a, b))
+    return coefficients
+
+
+_PERMUTATIONS = _permutations(NUM_PERMUTATIONS)
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> Set[str]:
+    """
+    Split a prompt into overlapping word shingles.
+
+    Case and whitespace are normalized first, so prompts that differ only in
+    formatting have the same shingles.
+
+    Args:
+        text: The prompt text
+        size: Words per shingle
+
+    Returns:
+        Set of shingles
+    """
+    words = _WORDS.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> Tuple[int, ...]:
+    """
+    Compute the MinHash signature of a prompt's shingles.
+
+    Args:
+        text: The prompt text
+
+    Returns:
+        Tuple of NUM_PERMUTATIONS minimum hash values
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for shingle in shingles(text)
+    ]
+    return tuple(
+        min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimated_similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """
+    Estimate the Jaccard similarity of two prompts from their signatures.
+
+    Args:
+        first: MinHash signature
+        second: MinHash signature
+
+    Returns:
+        Fraction of matching signature positions
+    """
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+def _bands(signature: Tuple[int, ...]) -> List[int]:
+    rows = len(signature) // LSH_BANDS
+    return [hash(signature[i * rows:(i + 1) * rows]) for i in range(LSH_BANDS)]
+
+
+class SimilarityIndex:
+    """
+    Bounded LSH index of the prompts in the response cache.
+
+    Each entry maps a prompt's MinHash signature to its exact-cache key and is
+    scoped to a provider and model, so a near-duplicate is only matched against
+    prompts sent to the same model. The least recently used entries are evicted
+    beyond max_entries. With a path, signatures are stored in the response
+    cache's SQLite file.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        action: str = SIMILAR_SERVE,
+        max_entries: int = DEFAULT_INDEX_ENTRIES,
+        path: Optional[str] = None,
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"similarity threshold must be between 0 and 1, got {threshold}")
+        if action not in SIMILAR_ACTIONS:
+            raise ValueError(f"similar prompt action must be one of {', '.join(SIMILAR_ACTIONS)}, got {action!r}")
+        self.threshold = threshold
+        self.action = action
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Tuple[int, ...]]]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, int], Set[str]] = {}
+        self._pending: "OrderedDict[str, Tuple[int, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            self._open(path)
+
+    def lookup(self, scope: str, key: str, text: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed prompt of the same scope.
+
+        Args:
+            scope: Provider and model the prompt is sent to
+            key: Exact-cache key of the prompt
+            text: The prompt text
+
+        Returns:
+            Tuple of (exact-cache key of the match, estimated similarity), or None below the threshold
+        """
+        signature = minhash_signature(text)
+        with self._lock:
+            # Keep the signature for the add() that follows a miss
+            self._pending[key] = signature
+            while len(self._pending) > 64:
+                self._pending.popitem(last=False)
+
+            candidates: Set[str] = set()
+            for band, band_hash in enumerate(_bands(signature)):
+                candidates.update(self._buckets.get((scope, band, band_hash), ()))
+            candidates.discard(key)
+
+            best: Optional[Tuple[str, float]] = None
+            for candidate in candidates:
+                similarity = estimated_similarity(signature, self._entries[candidate][1])
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (candidate, similarity)
+            if best is not None:
+                self._entries.move_to_end(best[0])
+        return best
+
+    def add(self, scope: str, key: str, text: str) -> None:
+        """
+        Index a prompt whose response was stored in the exact cache.
+
+        Args:
+            scope: Provider and model the prompt was sent to
+            key: Exact-cache key of the prompt
+            text: The prompt text
+        """
+        with self._lock:
+            signature = self._pending.pop(key, None)
+        if signature is None:
+            signature = minhash_signature(text)
+        with self._lock:
+            self._insert(key, scope, signature)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO prompt_signatures VALUES (?, ?, ?, ?)",
+                        (key, scope, json.dumps(signature), time.time()),
+                    )
+                    self._conn.execute(
+                        """
+                        DELETE FROM prompt_signatures WHERE key IN (
+                            SELECT key FROM prompt_signatures ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                        )
+                        """,
+                        (self.max_entries,),
+                    )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, key: str, scope: str, signature: Tuple[int, ...]) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (scope, signature)
+        for band, band_hash in enumerate(_bands(signature)):
+            self._buckets.setdefault((scope, band, band_hash), set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        scope, signature = self._entries.pop(key)
+        for band, band_hash in enumerate(_bands(signature)):
+            bucket = self._buckets.get((scope, band, band_hash))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[(scope, band, band_hash)]
+
+    def _open(self, path: str) -> None:
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS prompt_signatures (
+                        key TEXT PRIMARY KEY,
+                        scope TEXT NOT NULL,
+                        signature TEXT NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                    """
+                )
+            rows = self._conn.execute(
+                "SELECT key, scope, signature FROM prompt_signatures ORDER BY last_used DESC LIMIT ?",
+                (self.max_entries,),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not open prompt signature index in {path}, indexing in memory only: {e}")
+            self._conn = None
+            return
+
+        for key, scope, signature in reversed(rows):
+            self._insert(key, scope, tuple(json.loads(signature)))
+        logger.info(f"Loaded {len(rows)} prompt signature(s) from {path}")
+
+
+_index: Optional[SimilarityIndex] = None
+
+
+def get_similarity_index() -> Optional[SimilarityIndex]:
+    """
+    Get the process-wide near-duplicate index.
+
+    Returns:
+        The SimilarityIndex, or None if near-duplicate lookup is disabled
+    """
+    return _index
+
+
+def configure_similarity_cache(
+    threshold: Optional[float],
+    action: str = SIMILAR_SERVE,
+    path: Optional[str] = None,
+) -> Optional[SimilarityIndex]:
+    """
+    Enable or disable near-duplicate lookup in the response cache.
+
+    Args:
+        threshold: Minimum estimated Jaccard similarity of a match, or None to disable
+        action: "serve" answers from the matched response, "offer" calls the model and reports the match
+        path: SQLite file of the response cache to persist signatures in, or None to keep them in memory
+
+    Returns:
+        The new SimilarityIndex, or None if disabled
+    """
+    global _index
+    if threshold is None:
+        _index = None
+        return None
+    _index = SimilarityIndex(threshold, action, path=path)
+    logger.info(f"Near-duplicate prompt lookup enabled: threshold {threshold}, action {action}")
+    return _index
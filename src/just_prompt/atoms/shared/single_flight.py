@@ -0,0 +1,144 @@
+"""
+Coalescing of identical provider requests that are in flight at the same time.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, Tuple, Type
+
+from .cancellation import OperationCancelled, current_cancellation
+from .deadline import DeadlineExceeded, remaining_time
+
+logger = logging.getLogger(__name__)
+
+_independent_requests: contextvars.ContextVar = contextvars.ContextVar(
+    "just_prompt_independent_requests", default=False
+)
+
+# Failures that belong to the leader's own call rather than to the request;
+# a follower that sees one of them makes the request itself
+LEADER_ONLY_ERRORS: Tuple[Type[BaseException], ...] = (OperationCancelled, DeadlineExceeded)
+
+
+@contextmanager
+def independent_requests() -> Iterator[None]:
+    """
+    Send every request made inside the block on its own, e.g. to sample a model several times.
+
+    Requests made inside the block are neither coalesced with identical
+    in-flight requests nor answered from the response cache.
+    """
+    token = _independent_requests.set(True)
+    try:
+        yield
+    finally:
+        _independent_requests.reset(token)
+
+
+def requests_are_independent() -> bool:
+    """
+    Check whether the current call asked for independent requests.
+
+    Returns:
+        True inside an independent_requests() block
+    """
+    return _independent_requests.get()
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time; concurrent callers with the same key share its result.
+
+    The first caller (the leader) makes the call. Callers arriving while it is in
+    flight (followers) wait for the leader's result within their own deadline and
+    cancellation, and receive its response or its error, except for errors that
+    only concern the leader's call, after which they make the call themselves.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, concurrent.futures.Future] = {}
+        self._async_calls: Dict[Tuple[int, str], "asyncio.Task"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Run func, or join the identical call already in flight.
+
+        Args:
+            key: Identity of the request
+            func: Function making the request
+
+        Returns:
+            The result of the shared call
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._calls[key] = future
+
+        if leader:
+            try:
+                result = func()
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+
+        logger.info(f"Joining identical in-flight request {key[:12]}")
+        token = current_cancellation()
+        waits = {future} if token is None else {future, token.future}
+        concurrent.futures.wait(waits, timeout=remaining_time(), return_when=concurrent.futures.FIRST_COMPLETED)
+        if token is not None:
+            token.raise_if_cancelled()
+        if not future.done():
+            raise DeadlineExceeded("Deadline exceeded while waiting for an identical in-flight request")
+        try:
+            return future.result()
+        except LEADER_ONLY_ERRORS:
+            return func()
+
+    async def ado(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await func, or join the identical call already in flight on this event loop.
+
+        Args:
+            key: Identity of the request
+            func: Coroutine function making the request
+
+        Returns:
+            The result of the shared call
+        """
+        loop_key = (id(asyncio.get_running_loop()), key)
+        task = self._async_calls.get(loop_key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._async_calls[loop_key] = task
+            task.add_done_callback(lambda _: self._async_calls.pop(loop_key, None))
+            # The leader still cancels its own request when its caller is cancelled
+            return await task
+
+        logger.info(f"Joining identical in-flight request {key[:12]}")
+        try:
+            # Shield the shared request so a follower giving up doesn't cancel it
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                # The leader was cancelled; this follower still wants the response
+                return await func()
+            raise
+        except LEADER_ONLY_ERRORS:
+            return await func()
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,146 @@
+"""
+Startup profiler: the import and initialization cost of the server and of each provider.
+
+Every provider is measured in a fresh interpreter that first imports the server,
+so each row shows what that provider adds on top of it, whatever the order.
+"""
+
+import importlib
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .provider_registry import get_provider_registry
+
+logger = logging.getLogger(__name__)
+
+# Module measured before any provider
+SERVER_MODULE = "just_prompt.server"
+
+
+def _rss_mib() -> Optional[float]:
+    """Resident set size of this process in MiB, where the platform reports it."""
+    try:
+        # Current RSS on Linux; the peak from getrusage may be inherited from the parent process
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, other platforms kilobytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(step: str, func: Callable[[], Any]) -> Dict[str, Any]:
+    """Run one startup step, recording its wall time, RSS growth and newly imported modules."""
+    modules_before = len(sys.modules)
+    rss_before = _rss_mib()
+    started = time.perf_counter()
+    error = None
+    try:
+        func()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - started
+    rss_after = _rss_mib()
+    return {
+        "step": step,
+        "seconds": round(seconds, 4),
+        "rss_mib": None if rss_before is None else round(rss_after - rss_before, 1),
+        "modules": len(sys.modules) - modules_before,
+        "error": error,
+    }
+
+
+def _build_clients(module: Any) -> None:
+    for accessor in ("get_client", "get_async_client"):
+        if hasattr(module, accessor):
+            getattr(module, accessor)()
+
+
+def profile_in_process(provider: str) -> List[Dict[str, Any]]:
+    """
+    Measure the server import, then the import and client construction of one provider.
+
+    Meant to run in a fresh interpreter; modules imported earlier are not measured again.
+
+    Args:
+        provider: Provider name (full name), built-in or plugin
+
+    Returns:
+        One dictionary per step with the seconds, RSS growth in MiB, modules imported and error, if any
+    """
+    module_name = get_provider_registry().resolve(provider).module_path
+    steps = [_measure(SERVER_MODULE, lambda: importlib.import_module(SERVER_MODULE))]
+    steps.append(_measure(module_name, lambda: importlib.import_module(module_name)))
+    if steps[-1]["error"] is None:
+        steps.append(_measure(f"{provider} clients", lambda: _build_clients(sys.modules[module_name])))
+    return steps
+
+
+def profile_startup(providers: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Profile the startup cost of the server and the given providers.
+
+    Args:
+        providers: Full provider names to profile (defaults to every registered provider)
+
+    Returns:
+        The server step followed by the provider steps, as returned by profile_in_process
+    """
+    providers = providers or [provider.full_name for provider in get_provider_registry().providers()]
+    server_row = None
+    rows = []
+    for provider in providers:
+        result = subprocess.run(
+            [sys.executable, "-m", __name__, provider], capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            rows.append({"step": provider, "seconds": None, "rss_mib": None, "modules": None,
+                         "error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "profiler failed"})
+            continue
+        steps = json.loads(result.stdout.strip().splitlines()[-1])
+        # The server import is the same in every interpreter; report it once
+        server_row = server_row or steps[0]
+        rows.extend(steps[1:])
+    return ([server_row] if server_row else []) + rows
+
+
+def format_startup_profile(rows: List[Dict[str, Any]]) -> str:
+    """
+    Format profiled startup steps as a table.
+
+    Args:
+        rows: Steps returned by profile_startup
+
+    Returns:
+        The table as text
+    """
+    def cell(value: Any, suffix: str = "") -> str:
+        return "-" if value is None else f"{value}{suffix}"
+
+    width = max([len(row["step"]) for row in rows] + [len("step")])
+    lines = [f"{'step':<{width}}  {'seconds':>8}  {'rss':>9}  {'modules':>7}"]
+    for row in rows:
+        line = (
+            f"{row['step']:<{width}}  {cell(row['seconds']):>8}  "
+            f"{cell(row['rss_mib'], ' MiB'):>9}  {cell(row['modules']):>7}"
+        )
+        if row["error"]:
+            line += f"  {row['error']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # Child process of profile_startup: keep stdout for the JSON result
+    logging.disable(logging.CRITICAL)
+    print(json.dumps(profile_in_process(sys.argv[1])))
@@ -2,7 +2,8 @@
 Utility functions for just-prompt.
 """
 
-from typing import Tuple, List
+from typing import Optional, Tuple, List, Union
+import functools
 import os
 import re
 from dotenv import load_dotenv
@@ -15,6 +16,8 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
@@ -79,6 +82,83 @@ def parse_reasoning_effort(model: str) -> Tuple[str, str]:
     return base_model, None
 
 
+def _parse_model_suffixes(provider: str, model: str) -> Tuple[str, int, Optional[str]]:
+    """
+    Apply a provider's suffix rules to a model name.
+    
+    Args:
+        provider: Full provider name
+        model: Model name, optionally with a thinking or reasoning effort suffix
+        
+    Returns:
+        Tuple of (base_model_name, thinking_budget, reasoning_effort)
+    """
+    # The rules live with the providers; their modules are cheap to import (SDKs load on first use)
+    if provider == "anthropic":
+        from ..llm_providers.anthropic import parse_thinking_suffix
+        base_model, thinking_budget = parse_thinking_suffix(model)
+        return base_model, thinking_budget, None
+    if provider == "gemini":
+        from ..llm_providers.gemini import parse_thinking_suffix
+        base_model, thinking_budget = parse_thinking_suffix(model)
+        return base_model, thinking_budget, None
+    if provider == "openai":
+        from ..llm_providers.openai import REASONING_ENABLED_MODELS
+        base_model, reasoning_effort = parse_reasoning_effort(model)
+        if reasoning_effort and base_model not in REASONING_ENABLED_MODELS:
+            logger.warning(f"Model {base_model} does not support reasoning effort, ignoring reasoning suffix")
+            reasoning_effort = None
+        return base_model, 0, reasoning_effort
+    # Other providers use colons in plain model names (e.g. ollama's "llama3:8b")
+    return model, 0, None
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_model_spec(model_string: str) -> "ModelSpec":
+    """
+    Parse a model string into a ModelSpec.
+    
+    Results are memoized, so each distinct model string is parsed once.
+    
+    Args:
+        model_string: String in format "provider:model", with a short or full provider name
+        
+    Returns:
+        The parsed ModelSpec
+        
+    Raises:
+        ValueError: If the string is malformed or names an unknown provider
+    """
+    from .data_types import ModelSpec
+    from .provider_registry import get_provider_registry
+    
+    prefix, model = split_provider_and_model(model_string)
+    provider = get_provider_registry().get(prefix)
+    if provider is None:
+        raise ValueError(f"Unknown provider prefix: {prefix}")
+    
+    base_model, thinking_budget, reasoning_effort = _parse_model_suffixes(provider.full_name, model)
+    return ModelSpec(provider.full_name, model, base_model, thinking_budget, reasoning_effort)
+
+
+def as_model_spec(provider: str, model: Union[str, "ModelSpec"]) -> "ModelSpec":
+    """
+    Get the ModelSpec for a model handed to a provider, parsing it if it is a plain name.
+    
+    Args:
+        provider: Full provider name
+        model: ModelSpec, or model name without the provider prefix
+        
+    Returns:
+        The ModelSpec
+    """
+    from .data_types import ModelSpec
+    
+    if isinstance(model, ModelSpec):
+        return model
+    return parse_model_spec(f"{provider}:{model}")
+
+
 def get_provider_from_prefix(prefix: str) -> str:
     """
     Get the full provider name from a prefix.
@@ -89,9 +169,9 @@ def get_provider_from_prefix(prefix: str) -> str:
     Returns:
         Full provider name
     """
-    from .data_types import ModelProviders
+    from .provider_registry import get_provider_registry
     
-    provider = ModelProviders.from_name(prefix)
+    provider = get_provider_registry().get(prefix)
     if provider is None:
         raise ValueError(f"Unknown provider prefix: {prefix}")
     
@@ -6,10 +6,25 @@ from typing import List, Dict, Optional, Tuple
 import logging
 import os
 from .data_types import ModelProviders
+from .provider_registry import get_provider_registry
 from .utils import split_provider_and_model, get_api_key
+from .negative_cache import negative_cache
 
 logger = logging.getLogger(__name__)
 
+# Environment variable that configures each provider
+PROVIDER_ENV_VARS = {
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "gemini": "GEMINI_API_KEY",
+    "groq": "GROQ_API_KEY",
+    "deepseek": "DEEPSEEK_API_KEY",
+    "ollama": "OLLAMA_HOST"
+}
+
+# Providers that still work unconfigured (Ollama falls back to a local host)
+OPTIONAL_CONFIGURATION_PROVIDERS = {"ollama"}
+
 
 def validate_models_prefixed_by_provider(models_prefixed_by_provider: List[str]) -> bool:
     """
@@ -27,7 +42,7 @@ def validate_models_prefixed_by_provider(models_prefixed_by_provider: List[str])
     for model_string in models_prefixed_by_provider:
         try:
             provider_prefix, model_name = split_provider_and_model(model_string)
-            provider = ModelProviders.from_name(provider_prefix)
+            provider = get_provider_registry().get(provider_prefix)
             if provider is None:
                 raise ValueError(f"Unknown provider prefix: {provider_prefix}")
         except Exception as e:
@@ -47,8 +62,7 @@ def validate_provider(provider: str) -> bool:
     Returns:
         True if valid, raises ValueError otherwise
     """
-    provider_enum = ModelProviders.from_name(provider)
-    if provider_enum is None:
+    if get_provider_registry().get(provider) is None:
         raise ValueError(f"Unknown provider: {provider}")
     
     return True
@@ -58,6 +72,9 @@ def validate_provider_api_keys() -> Dict[str, bool]:
     """
     Validate that API keys are available for each provider.
     
+    Unconfigured providers are recorded in the negative cache, so requests to
+    them fail without calling the provider.
+    
     Returns:
         Dictionary mapping provider names to availability status (True if available, False otherwise)
     """
@@ -78,9 +95,41 @@ def validate_provider_api_keys() -> Dict[str, bool]:
             is_available = api_key is not None and api_key.strip() != ""
             available_providers[provider_name] = is_available
     
+    negative_cache.record_availability(
+        {
+            provider: available
+            for provider, available in available_providers.items()
+            if provider not in OPTIONAL_CONFIGURATION_PROVIDERS
+        },
+        {
+            provider: f"Provider not configured: {provider} (missing environment variable {PROVIDER_ENV_VARS.get(provider)})"
+            for provider, available in available_providers.items()
+            if not available
+        }
+    )
     return available_providers
 
 
+def raise_if_known_failure(provider: str, model: str) -> None:
+    """
+    Fail fast for a provider that isn't configured, or a model that is known to fail.
+    
+    Once the provider configuration has been checked (the server does so at
+    start-up), it is checked again whenever the negative cache's UNCONFIGURED
+    TTL has passed, so keys set later are picked up.
+    
+    Args:
+        provider: Provider name (full name)
+        model: Model name
+        
+    Raises:
+        KnownFailureError: If the request is known to fail
+    """
+    if negative_cache.availability_checked_at is not None and negative_cache.availability_expired():
+        validate_provider_api_keys()
+    negative_cache.raise_if_known(provider, model)
+
+
 def print_provider_availability(detailed: bool = True) -> None:
     """
     Print information about which providers are available based on API keys.
@@ -97,18 +146,9 @@ def print_provider_availability(detailed: bool = True) -> None:
     logger.info(f"Available LLM providers: {', '.join(available)}")
     
     if detailed and unavailable:
-        env_vars = {
-            "openai": "OPENAI_API_KEY",
-            "anthropic": "ANTHROPIC_API_KEY",
-            "gemini": "GEMINI_API_KEY", 
-            "groq": "GROQ_API_KEY",
-            "deepseek": "DEEPSEEK_API_KEY",
-            "ollama": "OLLAMA_HOST"
-        }
-        
         logger.warning(f"The following providers are unavailable due to missing API keys:")
         for provider in unavailable:
-            env_var = env_vars.get(provider)
+            env_var = PROVIDER_ENV_VARS.get(provider)
             if env_var:
                 logger.warning(f"  - {provider}: Missing environment variable {env_var}")
             else:
@@ -0,0 +1,234 @@
+"""
+Background warm-up of provider modules, connections and model catalogs.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .provider_registry import get_provider_registry
+from .model_catalog import get_model_catalog
+from .utils import split_provider_and_model
+from .validator import OPTIONAL_CONFIGURATION_PROVIDERS
+
+logger = logging.getLogger(__name__)
+
+# Seconds the async connections of one provider may take to open
+ASYNC_WARMUP_TIMEOUT = 30.0
+
+# Warm-up states of a provider
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+class ProviderWarmup:
+    """
+    Warm-up progress of one provider.
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.state = PENDING
+        self.import_seconds = 0.0
+        self.seconds = 0.0
+        self.models = 0
+        self.error: Optional[str] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe the provider's warm-up.
+
+        Returns:
+            Dictionary with the state, seconds spent, catalog size and error, if any
+        """
+        return {
+            "state": self.state,
+            "seconds": round(self.seconds, 2),
+            "import_seconds": round(self.import_seconds, 2),
+            "models": self.models,
+            "error": self.error,
+        }
+
+
+class Warmup:
+    """
+    Warms up providers concurrently in daemon threads.
+
+    Building a provider's SDK clients imports the SDK; prefetching its model
+    catalog through the shared catalog cache makes the first round trip, which
+    opens the sync client's pooled TLS connection. The server's prompts go
+    through the async clients, so given the server's event loop the catalog is
+    also listed on the async client there (the provider's alist_models), opening
+    the connections those calls reuse.
+    """
+
+    def __init__(self, providers: List[str], loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.providers = {provider: ProviderWarmup(provider) for provider in providers}
+        self.loop = loop
+        self.started_at: Optional[float] = None
+        self._done = threading.Event()
+        self._remaining = len(providers)
+        self._lock = threading.Lock()
+        if not providers:
+            self._done.set()
+
+    def start(self) -> "Warmup":
+        """
+        Start warming every provider in the background.
+
+        Returns:
+            This Warmup
+        """
+        self.started_at = time.monotonic()
+        for provider in self.providers:
+            threading.Thread(
+                target=self._warm, args=(provider,), name=f"just-prompt-warmup-{provider}", daemon=True
+            ).start()
+        return self
+
+    @property
+    def ready(self) -> bool:
+        """Whether every provider finished warming up (successfully or not)."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the warm-up to finish.
+
+        Args:
+            timeout: Seconds to wait at most, or None to wait indefinitely
+
+        Returns:
+            True if the warm-up finished
+        """
+        return self._done.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Describe the warm-up.
+
+        Returns:
+            Dictionary with overall readiness and the state of each provider
+        """
+        return {
+            "ready": self.ready,
+            "providers": {provider: warmup.snapshot() for provider, warmup in self.providers.items()},
+        }
+
+    def _warm(self, provider: str) -> None:
+        warmup = self.providers[provider]
+        warmup.state = WARMING
+        started = time.monotonic()
+        try:
+            module = get_provider_registry().resolve(provider).module
+            # Clients are built lazily; build them now rather than on the first request
+            for accessor in ("get_client", "get_async_client"):
+                if hasattr(module, accessor):
+                    getattr(module, accessor)()
+            warmup.import_seconds = time.monotonic() - started
+            warmup.models = len(get_model_catalog().refresh(provider, only_if_missing=True))
+            self._warm_async_connections(provider, module)
+            warmup.state = READY
+            warmup.seconds = time.monotonic() - started
+            logger.info(
+                f"Warmed up {provider} in {warmup.seconds:.2f}s "
+                f"(import {warmup.import_seconds:.2f}s, {warmup.models} models)"
+            )
+        except Exception as e:
+            warmup.state = FAILED
+            warmup.error = str(e)
+            warmup.seconds = time.monotonic() - started
+            logger.warning(f"Warm-up of {provider} failed after {warmup.seconds:.2f}s: {e}")
+        finally:
+            with self._lock:
+                self._remaining -= 1
+                finished = self._remaining == 0
+            if finished:
+                self._done.set()
+                logger.info(f"Warm-up finished in {time.monotonic() - self.started_at:.2f}s")
+
+
+    def _warm_async_connections(self, provider: str, module: Any) -> None:
+        if self.loop is None or not hasattr(module, "alist_models"):
+            return
+        # Async clients' connection pools belong to the loop they are used on
+        future = asyncio.run_coroutine_threadsafe(module.alist_models(), self.loop)
+        try:
+            future.result(ASYNC_WARMUP_TIMEOUT)
+        except Exception as e:
+            future.cancel()
+            logger.warning(f"Could not open async connections for {provider}: {e}")
+
+
+_warmup: Optional[Warmup] = None
+
+
+def providers_to_warm(default_models: List[str], availability: Dict[str, bool]) -> List[str]:
+    """
+    Work out which providers to warm up: the configured ones, default models' providers first.
+    
+    A provider without configuration is only included when a default model names it
+    and it works unconfigured (Ollama falls back to a local host); others would fail
+    on first use anyway and are never imported.
+    
+    Args:
+        default_models: Default model strings in format "provider:model"
+        availability: Provider names mapped to whether they are configured, from validate_provider_api_keys
+        
+    Returns:
+        Full provider names in warm-up order
+    """
+    providers: List[str] = []
+    for model_string in default_models:
+        try:
+            prefix, _ = split_provider_and_model(model_string)
+        except ValueError:
+            continue
+        provider = get_provider_registry().get(prefix)
+        if provider is None or provider.full_name in providers:
+            continue
+        # Plugin providers have no known configuration to check
+        configured = availability.get(provider.full_name, provider.full_name not in availability)
+        if configured or provider.full_name in OPTIONAL_CONFIGURATION_PROVIDERS:
+            providers.append(provider.full_name)
+    providers.extend(provider for provider, available in availability.items() if available and provider not in providers)
+    return providers
+
+
+def start_warmup(providers: List[str], loop: Optional[asyncio.AbstractEventLoop] = None) -> Warmup:
+    """
+    Start the process-wide warm-up of the given providers.
+
+    Args:
+        providers: Full names of the providers to warm up
+        loop: The server's event loop, to open the async clients' connections on
+
+    Returns:
+        The running Warmup
+    """
+    global _warmup
+    _warmup = Warmup(providers, loop).start()
+    logger.info(f"Warming up {len(providers)} provider(s) in the background: {', '.join(providers) or 'none'}")
+    return _warmup
+
+
+def warmup_status(provider: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Get the warm-up status.
+
+    Args:
+        provider: Provider to describe, or None for the whole warm-up
+
+    Returns:
+        Status dictionary, or None if no warm-up ran (or it didn't include the provider)
+    """
+    if _warmup is None:
+        return None
+    if provider is None:
+        return _warmup.status()
+    warmup = _warmup.providers.get(provider)
+    return warmup.snapshot() if warmup is not None else None
@@ -2,19 +2,26 @@
 Business Analyst prompt functionality for just-prompt.
 """
 
-from typing import List
+from typing import List, Optional
 import logging
 import os
+import time
 from pathlib import Path
 
-from .prompt import prompt
+from .prompt import prompt, is_error_response
 from ..atoms.shared.utils import DEFAULT_MODEL
+from ..atoms.shared.deadline import deadline_scope
+from ..atoms.shared.prompt_cache import format_cacheable
+from ..atoms.shared.file_cache import read_prompt_file
 
 logger = logging.getLogger(__name__)
 
 # Default Business Analyst model
 DEFAULT_ANALYST_MODEL = "anthropic:claude-3-7-sonnet-20250219"
 
+# Share of a deadline given to the individual briefs; the consolidation gets the rest
+BRIEFS_DEADLINE_SHARE = 0.6
+
 # Default Business Analyst prompt template
 DEFAULT_ANALYST_PROMPT = """
 <purpose>
@@ -149,7 +156,8 @@ def business_analyst_prompt(
     output_dir: str = ".", 
     models_prefixed_by_provider: List[str] = None,
     analyst_model: str = DEFAULT_ANALYST_MODEL,
-    business_analyst_prompt: str = DEFAULT_ANALYST_PROMPT
+    business_analyst_prompt: str = DEFAULT_ANALYST_PROMPT,
+    deadline_seconds: Optional[float] = None
 ) -> str:
     """
     Process a prompt file with each specified model to create individual briefs.
@@ -162,6 +170,8 @@ def business_analyst_prompt(
                              If None, uses the DEFAULT_MODEL environment variable
         analyst_model: Model string for the consolidation (if multiple models used)
         business_analyst_prompt: Template for the business analyst prompt
+        deadline_seconds: Time limit for the whole run. The briefs get BRIEFS_DEADLINE_SHARE
+                          of it and the consolidation uses the briefs finished in time
         
     Returns:
         Path to the final business analyst brief file
@@ -182,14 +192,15 @@ def business_analyst_prompt(
     
     # Get the original prompt from the file
     try:
-        with open(from_file, 'r', encoding='utf-8') as f:
-            original_prompt = f.read()
+        original_prompt = read_prompt_file(from_file)
     except Exception as e:
         logger.error(f"Error reading original prompt file: {e}")
         raise ValueError(f"Could not read prompt file: {from_file}")
     
-    # Format business analyst prompt with the original prompt
-    formatted_prompt = business_analyst_prompt.format(
+    # Format business analyst prompt with the original prompt, keeping the
+    # static instructions as a cacheable prefix
+    formatted_prompt = format_cacheable(
+        business_analyst_prompt,
         analyst_request=original_prompt
     )
     
@@ -200,14 +211,18 @@ def business_analyst_prompt(
     # Get name of file without extension for naming output files
     from_file_name = Path(from_file).stem
     
+    started = time.monotonic()
+    briefs_deadline = None if deadline_seconds is None else deadline_seconds * BRIEFS_DEADLINE_SHARE
+    
     # Generate a brief from each model
     for model in models_used:
         model_display_name = model.replace(":", "_").replace("/", "_")
         brief_filename = f"{from_file_name}_{model_display_name}_brief.md"
         brief_file_path = output_path / brief_filename
         
-        # Get response from this model
-        model_response = prompt(formatted_prompt, [model])[0]
+        # Get response from this model; models left once the deadline passes are marked as timed out
+        with deadline_scope(None if briefs_deadline is None else briefs_deadline - (time.monotonic() - started)):
+            model_response = prompt(formatted_prompt, [model])[0]
         
         # Save this model's brief
         try:
@@ -215,7 +230,7 @@ def business_analyst_prompt(
                 f.write(model_response)
             logger.info(f"Brief from {model} written to {brief_file_path}")
             brief_files.append(brief_file_path)
-            briefs_content.append(f"--- Brief from {model} ---\n\n{model_response}\n\n")
+            briefs_content.append((f"--- Brief from {model} ---\n\n{model_response}\n\n", not is_error_response(model_response)))
         except Exception as e:
             logger.error(f"Error writing brief from {model} to {brief_file_path}: {e}")
             raise ValueError(f"Could not write brief file: {brief_file_path}")
@@ -224,14 +239,24 @@ def business_analyst_prompt(
     final_brief_file = output_path / "business_analyst_brief.md"
     
     if len(models_used) > 1:
+        # Consolidate the quorum of briefs that were produced, if any were
+        quorum = [brief for brief, answered in briefs_content if answered]
+        if quorum and len(quorum) < len(briefs_content):
+            logger.warning(f"Consolidating a quorum of {len(quorum)} of {len(briefs_content)} briefs")
+        else:
+            quorum = [brief for brief, _ in briefs_content]
+        
         # Format consolidation prompt
-        consolidation_prompt = CONSOLIDATION_PROMPT.format(
+        consolidation_prompt = format_cacheable(
+            CONSOLIDATION_PROMPT,
             original_prompt=original_prompt,
-            individual_briefs="\n\n".join(briefs_content)
+            individual_briefs="\n\n".join(quorum)
         )
         
-        # Get consolidated response
-        consolidated_response = prompt(consolidation_prompt, [analyst_model])[0]
+        # Get consolidated response, within what is left of the deadline
+        consolidation_deadline = None if deadline_seconds is None else deadline_seconds - (time.monotonic() - started)
+        with deadline_scope(consolidation_deadline):
+            consolidated_response = prompt(consolidation_prompt, [analyst_model])[0]
         
         # Save consolidated brief
         try:
@@ -2,21 +2,28 @@
 CEO and board prompt functionality for just-prompt.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
 import os
+import time
 from pathlib import Path
 import json
 
 from .prompt_from_file_to_file import prompt_from_file_to_file
-from .prompt import prompt
+from .prompt import prompt, is_error_response
 from ..atoms.shared.utils import DEFAULT_MODEL
+from ..atoms.shared.deadline import deadline_scope
+from ..atoms.shared.prompt_cache import format_cacheable
+from ..atoms.shared.file_cache import read_prompt_file
 
 logger = logging.getLogger(__name__)
 
 # Default CEO model
 DEFAULT_CEO_MODEL = "openai:o3"
 
+# Share of a deadline given to the board; the CEO gets the rest
+BOARD_DEADLINE_SHARE = 0.6
+
 # Default CEO decision prompt template
 DEFAULT_CEO_DECISION_PROMPT = """
 <purpose>
@@ -44,7 +51,8 @@ def ceo_and_board_prompt(
     output_dir: str = ".", 
     models_prefixed_by_provider: List[str] = None,
     ceo_model: str = DEFAULT_CEO_MODEL,
-    ceo_decision_prompt: str = DEFAULT_CEO_DECISION_PROMPT
+    ceo_decision_prompt: str = DEFAULT_CEO_DECISION_PROMPT,
+    deadline_seconds: Optional[float] = None
 ) -> str:
     """
     Process a prompt file with multiple models as a "board of directors",
@@ -57,6 +65,8 @@ def ceo_and_board_prompt(
                                    If None, uses the DEFAULT_MODELS environment variable
         ceo_model: Model string for the CEO decision-maker
         ceo_decision_prompt: Template for the CEO decision prompt
+        deadline_seconds: Time limit for the whole run. The board gets BOARD_DEADLINE_SHARE
+                          of it and the CEO decides with the members that answered in time
         
     Returns:
         Path to the CEO decision file
@@ -69,17 +79,21 @@ def ceo_and_board_prompt(
     if not output_path.is_dir():
         raise ValueError(f"Not a directory: {output_dir}")
     
+    started = time.monotonic()
+    
     # Step 1: Get board member responses
-    board_response_files = prompt_from_file_to_file(
-        from_file, 
-        models_prefixed_by_provider, 
-        output_dir
-    )
+    board_deadline = None if deadline_seconds is None else deadline_seconds * BOARD_DEADLINE_SHARE
+    with deadline_scope(board_deadline):
+        board_response_files = prompt_from_file_to_file(
+            from_file, 
+            models_prefixed_by_provider, 
+            output_dir
+        )
     
     # Get the original prompt from the file
     try:
-        with open(from_file, 'r', encoding='utf-8') as f:
-            original_prompt = f.read()
+        # Already read by the board step, so this is served from the file cache
+        original_prompt = read_prompt_file(from_file)
     except Exception as e:
         logger.error(f"Error reading original prompt file: {e}")
         raise ValueError(f"Could not read prompt file: {from_file}")
@@ -91,38 +105,45 @@ def ceo_and_board_prompt(
         models_used = [model.strip() for model in default_models.split(",")]
     
     # Step 2: Read in board member responses
-    board_responses_xml = ""
+    board_responses = []
     
     for i, response_file in enumerate(board_response_files):
         try:
             with open(response_file, 'r', encoding='utf-8') as f:
                 response_content = f.read()
-                
-            # Format as XML for the CEO prompt
-            model_name = models_used[i]
-            board_responses_xml += f"""
-    <board-response>
-        <model-name>{model_name}</model-name>
-        <response>{response_content}</response>
-    </board-response>
-"""
+            board_responses.append((models_used[i], response_content, not is_error_response(response_content)))
         except Exception as e:
             logger.error(f"Error reading response file {response_file}: {e}")
-            board_responses_xml += f"""
+            board_responses.append((models_used[i], "ERROR: Could not read response file.", False))
+    
+    # Decide with the quorum of members that answered, if any did
+    quorum = [board_response for board_response in board_responses if board_response[2]]
+    if quorum and len(quorum) < len(board_responses):
+        logger.warning(f"Continuing with a quorum of {len(quorum)} of {len(board_responses)} board members")
+        board_responses = quorum
+    
+    # Format as XML for the CEO prompt
+    board_responses_xml = ""
+    for model_name, response_content, _ in board_responses:
+        board_responses_xml += f"""
     <board-response>
-        <model-name>{models_used[i]}</model-name>
-        <response>ERROR: Could not read response file.</response>
+        <model-name>{model_name}</model-name>
+        <response>{response_content}</response>
     </board-response>
 """
     
-    # Step 3: Format CEO prompt with the original prompt and board responses
-    ceo_prompt = ceo_decision_prompt.format(
+    # Step 3: Format CEO prompt with the original prompt and board responses,
+    # keeping the static instructions as a cacheable prefix
+    ceo_prompt = format_cacheable(
+        ceo_decision_prompt,
         original_prompt=original_prompt,
         board_responses=board_responses_xml
     )
     
-    # Step 4: Send to CEO model for decision
-    ceo_response = prompt(ceo_prompt, [ceo_model])[0]
+    # Step 4: Send to CEO model for decision, within what is left of the deadline
+    ceo_deadline = None if deadline_seconds is None else deadline_seconds - (time.monotonic() - started)
+    with deadline_scope(ceo_deadline):
+        ceo_response = prompt(ceo_prompt, [ceo_model])[0]
     
     # Step 5: Write CEO decision to file
     ceo_decision_file = output_path / "ceo_decision.md"
@@ -2,26 +2,37 @@
 List providers functionality for just-prompt.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Any
 import logging
-from ..atoms.shared.data_types import ModelProviders
+from ..atoms.shared.provider_registry import get_provider_registry
+from ..atoms.shared.circuit_breaker import circuit_states
+from ..atoms.shared.warmup import warmup_status
+from ..atoms.shared.negative_cache import negative_cache
 
 logger = logging.getLogger(__name__)
 
 
-def list_providers() -> List[Dict[str, str]]:
+def list_providers() -> List[Dict[str, Any]]:
     """
-    List all available providers with their full and short names.
+    List all registered providers, built-in and plugin, with their full and short names.
+    
+    Each provider also reports the circuit breaker state of the models called so far,
+    the failures it is currently known for and, when the server warmed it up, its
+    warm-up status.
     
     Returns:
         List of dictionaries with provider information
     """
     providers = []
-    for provider in ModelProviders:
+    for provider in get_provider_registry().providers():
         providers.append({
             "name": provider.name,
             "full_name": provider.full_name,
-            "short_name": provider.short_name
+            "short_name": provider.short_name,
+            "source": provider.source,
+            "circuits": circuit_states(provider.full_name),
+            "known_failures": negative_cache.snapshot(provider.full_name),
+            "warmup": warmup_status(provider.full_name)
         })
     
     return providers
\ No newline at end of file
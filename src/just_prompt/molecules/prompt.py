@@ -2,16 +2,168 @@
 Prompt functionality for just-prompt.
 """
 
-from typing import List
-import logging
+from typing import List, Optional
+import asyncio
 import concurrent.futures
+import logging
 import os
+import time
+from contextlib import nullcontext
 from ..atoms.shared.validator import validate_models_prefixed_by_provider
-from ..atoms.shared.utils import split_provider_and_model, DEFAULT_MODEL
+from ..atoms.shared.utils import split_provider_and_model, parse_model_spec, DEFAULT_MODEL
 from ..atoms.shared.model_router import ModelRouter
+from ..atoms.shared.execution import get_execution_layer
+from ..atoms.shared.call_context import call_context, current_call_context
+from ..atoms.shared.deadline import deadline_scope
+from ..atoms.shared.cancellation import CancellationToken, cancellation_scope, current_cancellation
+from ..atoms.shared.single_flight import independent_requests
 
 logger = logging.getLogger(__name__)
 
+# Response recorded for a model that had not answered when the deadline expired
+TIMED_OUT_MESSAGE = "Timed out: no response before the deadline"
+
+# Response recorded for a model abandoned because enough other models answered first
+SKIPPED_MESSAGE = "Skipped: enough responses arrived first"
+
+
+def is_error_response(response: str) -> bool:
+    """
+    Check whether a response is an error or timeout marker rather than model output.
+    
+    Args:
+        response: A response returned by prompt
+        
+    Returns:
+        True if the model did not produce an answer
+    """
+    return response.startswith("Error (")
+
+
+def _timed_out_response(model_string: str) -> str:
+    """Build the response recorded for a model that missed the deadline."""
+    return f"Error ({model_string}): {TIMED_OUT_MESSAGE}"
+
+
+def _skipped_response(model_string: str) -> str:
+    """Build the response recorded for a model that was no longer needed."""
+    return f"Error ({model_string}): {SKIPPED_MESSAGE}"
+
+
+def _time_left(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left before a monotonic deadline, or None if unbounded."""
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+
+def _required_responses(min_responses: Optional[int], return_first: bool, model_count: int) -> Optional[int]:
+    """
+    Resolve the first-k options into the number of successful responses to wait for.
+    
+    Args:
+        min_responses: Number of successful responses after which to return
+        return_first: Return after the first successful response
+        model_count: Number of models prompted
+        
+    Returns:
+        Number of successful responses to wait for, or None to wait for every model
+    """
+    if return_first and min_responses is None:
+        min_responses = 1
+    if min_responses is None:
+        return None
+    if min_responses < 1 or min_responses > model_count:
+        raise ValueError(f"min_responses must be between 1 and {model_count}, got {min_responses}")
+    return min_responses
+
+
+def _unique_calls(models: List[str], sample: bool) -> List[str]:
+    """
+    Decide which model calls to make for a list of models.
+    
+    Args:
+        models: Corrected model strings, possibly with duplicates
+        sample: Make one independent call per entry, even for duplicates
+        
+    Returns:
+        Model strings to call, one per request
+    """
+    if sample:
+        return list(models)
+    calls = list(dict.fromkeys(models))
+    if len(calls) < len(models):
+        logger.info(f"Collapsed {len(models) - len(calls)} duplicate model(s) into shared requests")
+    return calls
+
+
+def _slots_per_call(models: List[str], calls: List[str], sample: bool) -> List[int]:
+    """
+    Count the model slots each call answers, for the min_responses quorum.
+    
+    Args:
+        models: Corrected model strings, possibly with duplicates
+        calls: Model strings called, as returned by _unique_calls
+        sample: Whether each entry got its own call
+        
+    Returns:
+        Number of slots per call, in call order
+    """
+    if sample:
+        return [1] * len(calls)
+    return [models.count(model_string) for model_string in calls]
+
+
+def _fan_out_token() -> CancellationToken:
+    """Token for one fan-out: cancelled with the tool call, or on its own once the calls aren't needed."""
+    parent = current_cancellation()
+    return parent.child() if parent is not None else CancellationToken()
+
+
+def _wait_for_models(
+    futures,
+    deadline: Optional[float],
+    token: CancellationToken,
+    min_responses: Optional[int] = None,
+    slots: Optional[List[int]] = None,
+):
+    """
+    Wait for model calls until enough finish, the deadline passes or the tool call is cancelled.
+    
+    Args:
+        futures: Futures of the model calls
+        deadline: Monotonic deadline, or None if unbounded
+        token: Cancellation token of the fan-out
+        min_responses: Successful responses after which to stop waiting (None waits for all)
+        slots: Model slots each future answers, in future order (one each if None)
+        
+    Returns:
+        Set of finished futures
+        
+    Raises:
+        OperationCancelled: If the tool call was cancelled; calls that hadn't started are dropped
+    """
+    slots_of = dict(zip(futures, slots or [1] * len(futures)))
+    pending = set(futures)
+    succeeded = 0
+    while pending:
+        finished, _ = concurrent.futures.wait(
+            pending | {token.future}, timeout=_time_left(deadline), return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        if token.cancelled:
+            dropped = sum(1 for future in pending if future.cancel())
+            logger.warning(
+                f"Tool call cancelled: dropped {dropped} queued model call(s), "
+                f"abandoned {len(pending) - dropped} in flight, kept {len(futures) - len(pending)} finished"
+            )
+            token.raise_if_cancelled()
+        if not finished:
+            break
+        pending -= finished
+        if min_responses is not None:
+            succeeded += sum(slots_of[future] for future in finished if not is_error_response(future.result()))
+            if succeeded >= min_responses:
+                break
+    return set(futures) - pending
+
 
 def _process_model_prompt(model_string: str, text: str) -> str:
     """
@@ -31,6 +183,38 @@ def _process_model_prompt(model_string: str, text: str) -> str:
         return f"Error ({model_string}): {str(e)}"
 
 
+async def _aprocess_model_prompt(model_string: str, text: str) -> str:
+    """
+    Process a single model prompt on the event loop.
+    
+    Args:
+        model_string: String in format "provider:model"
+        text: The prompt text
+        
+    Returns:
+        Response from the model
+    """
+    try:
+        async with get_execution_layer().async_slot(_provider_of(model_string)):
+            return await ModelRouter.aroute_prompt(model_string, text)
+    except Exception as e:
+        logger.error(f"Error processing async prompt for {model_string}: {e}")
+        return f"Error ({model_string}): {str(e)}"
+
+
+def _provider_of(model_string: str) -> str:
+    """
+    Get the full provider name of a validated model string.
+    
+    Args:
+        model_string: String in format "provider:model"
+        
+    Returns:
+        Full provider name
+    """
+    return parse_model_spec(model_string).provider
+
+
 def _correct_model_name(provider: str, model: str, correction_model: str) -> str:
     """
     Correct a model name using the correction model.
@@ -50,17 +234,16 @@ def _correct_model_name(provider: str, model: str, correction_model: str) -> str
         return model
 
 
-def prompt(text: str, models_prefixed_by_provider: List[str] = None) -> List[str]:
+def _prepare_models(models_prefixed_by_provider: List[str] = None) -> List[str]:
     """
-    Send a prompt to multiple models using parallel processing.
+    Resolve default models, validate them and apply model name correction.
     
     Args:
-        text: The prompt text
         models_prefixed_by_provider: List of model strings in format "provider:model"
                                     If None, uses the DEFAULT_MODELS environment variable
         
     Returns:
-        List of responses from the models
+        List of corrected model strings
     """
     # Use default models if no models provided
     if not models_prefixed_by_provider:
@@ -86,20 +269,227 @@ def prompt(text: str, models_prefixed_by_provider: List[str] = None) -> List[str
         
         corrected_models.append(model_string)
     
-    # Process each model in parallel using ThreadPoolExecutor
-    responses = []
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        # Submit all tasks
-        future_to_model = {
-            executor.submit(_process_model_prompt, model_string, text): model_string
-            for model_string in corrected_models
-        }
-        
-        # Collect results in order
-        for model_string in corrected_models:
-            for future, future_model in future_to_model.items():
-                if future_model == model_string:
-                    responses.append(future.result())
-                    break
-    
-    return responses
\ No newline at end of file
+    return corrected_models
+
+
+def _tool_call_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Event loop of the server tool call running in this worker thread, if any."""
+    context = current_call_context()
+    loop = context.event_loop if context is not None else None
+    if loop is None or loop.is_closed():
+        return None
+    try:
+        # Blocking on the loop from its own thread would deadlock
+        if asyncio.get_running_loop() is loop:
+            return None
+    except RuntimeError:
+        pass
+    return loop
+
+
+def _prompt_on_loop(loop: asyncio.AbstractEventLoop, *args, **kwargs) -> List[str]:
+    """
+    Run async_prompt on a tool call's event loop and wait for its responses.
+    
+    Cancelling the tool call cancels the model tasks, which aborts their HTTP
+    requests rather than leaving them running in bulkhead threads.
+    
+    Args:
+        loop: The tool call's event loop
+        *args: Positional arguments for async_prompt
+        **kwargs: Keyword arguments for async_prompt
+        
+    Returns:
+        List of responses from the models
+    
+    Raises:
+        OperationCancelled: If the tool call was cancelled
+    """
+    # The task is created with a copy of this thread's context (call context, deadline, cancellation)
+    future = asyncio.run_coroutine_threadsafe(async_prompt(*args, **kwargs), loop)
+    token = current_cancellation()
+    if token is None:
+        return future.result()
+    
+    token.add_callback(future.cancel)
+    try:
+        return future.result()
+    except concurrent.futures.CancelledError:
+        token.raise_if_cancelled()
+        raise
+    finally:
+        token.remove_callback(future.cancel)
+
+
+def prompt(
+    text: str,
+    models_prefixed_by_provider: List[str] = None,
+    deadline_seconds: Optional[float] = None,
+    min_responses: Optional[int] = None,
+    return_first: bool = False,
+    sample: bool = False,
+) -> List[str]:
+    """
+    Send a prompt to multiple models using parallel processing.
+    
+    Args:
+        text: The prompt text
+        models_prefixed_by_provider: List of model strings in format "provider:model"
+                                    If None, uses the DEFAULT_MODELS environment variable
+        deadline_seconds: Time limit for the whole call; models that haven't answered
+                         by then are reported as timed out (None keeps any enclosing deadline)
+        min_responses: Return as soon as this many models answered successfully;
+                      the slower models are abandoned and reported as skipped
+        return_first: Shorthand for min_responses=1
+        sample: Send each listed model its own request, even duplicates, bypassing
+               the response cache (to sample several answers from one model)
+        
+    Returns:
+        List of responses from the models
+    """
+    # Inside a server tool call the requests run on the server's event loop,
+    # where cancelling the tool call aborts them
+    loop = _tool_call_loop()
+    if loop is not None:
+        return _prompt_on_loop(
+            loop,
+            text,
+            models_prefixed_by_provider,
+            deadline_seconds=deadline_seconds,
+            min_responses=min_responses,
+            return_first=return_first,
+            sample=sample,
+        )
+    
+    with deadline_scope(deadline_seconds) as deadline:
+        corrected_models = _prepare_models(models_prefixed_by_provider)
+        calls = _unique_calls(corrected_models, sample)
+        required = _required_responses(min_responses, return_first, len(corrected_models))
+        # A collapsed call answers every slot of its model
+        slots = _slots_per_call(corrected_models, calls, sample)
+        
+        # Share one retry budget across the fan-out (reuses the tool call's context if active)
+        with call_context():
+            # Process each model in parallel on its provider's long-lived bulkhead
+            execution_layer = get_execution_layer()
+            fan_out = _fan_out_token()
+            with cancellation_scope(fan_out), (independent_requests() if sample else nullcontext()):
+                futures = [
+                    execution_layer.submit(_provider_of(model_string), _process_model_prompt, model_string, text)
+                    for model_string in calls
+                ]
+            
+            # Wait for enough models, or until the deadline passes or the client cancels
+            done = _wait_for_models(futures, deadline, fan_out, required, slots)
+            if len(done) < len(futures):
+                # Stop the retries and pacing of calls whose answers are no longer needed
+                fan_out.cancel("no longer needed")
+                succeeded = sum(
+                    count for f, count in zip(futures, slots) if f in done and not is_error_response(f.result())
+                )
+                if required is not None and succeeded >= required:
+                    logger.info(f"Got {required} response(s), abandoning {len(futures) - len(done)} slower model(s)")
+                    late_response = _skipped_response
+                else:
+                    logger.warning(f"Deadline reached with {len(futures) - len(done)} of {len(futures)} model(s) still pending")
+                    late_response = _timed_out_response
+            
+            # Collect results in model order, marking the models that weren't waited for
+            if not sample:
+                futures = [futures[calls.index(model_string)] for model_string in corrected_models]
+            results = []
+            for model_string, future in zip(corrected_models, futures):
+                if future in done:
+                    results.append(future.result())
+                else:
+                    # Queued calls are dropped; running ones are abandoned
+                    future.cancel()
+                    results.append(late_response(model_string))
+            return results
+
+
+async def async_prompt(
+    text: str,
+    models_prefixed_by_provider: List[str] = None,
+    deadline_seconds: Optional[float] = None,
+    min_responses: Optional[int] = None,
+    return_first: bool = False,
+    sample: bool = False,
+) -> List[str]:
+    """
+    Send a prompt to multiple models concurrently using asyncio tasks.
+    
+    Each model call is awaited on the provider's async client, so no OS thread
+    is held per in-flight request.
+    
+    Args:
+        text: The prompt text
+        models_prefixed_by_provider: List of model strings in format "provider:model"
+                                    If None, uses the DEFAULT_MODELS environment variable
+        deadline_seconds: Time limit for the whole call; models that haven't answered
+                         by then are cancelled and reported as timed out
+        min_responses: Return as soon as this many models answered successfully;
+                      the slower models are cancelled and reported as skipped
+        return_first: Shorthand for min_responses=1
+        sample: Send each listed model its own request, even duplicates, bypassing
+               the response cache
+        
+    Returns:
+        List of responses from the models, in the order the models were given
+    """
+    with deadline_scope(deadline_seconds) as deadline:
+        # Correction may call list_models and a correction LLM, which are blocking
+        corrected_models = await asyncio.to_thread(_prepare_models, models_prefixed_by_provider)
+        calls = _unique_calls(corrected_models, sample)
+        required = _required_responses(min_responses, return_first, len(corrected_models))
+        # A collapsed call answers every slot of its model
+        slots = _slots_per_call(corrected_models, calls, sample)
+        
+        with call_context(), (independent_requests() if sample else nullcontext()):
+            tasks = [
+                asyncio.create_task(_aprocess_model_prompt(model_string, text))
+                for model_string in calls
+            ]
+            
+            slots_of = dict(zip(tasks, slots))
+            done = set()
+            pending = set(tasks)
+            succeeded = 0
+            try:
+                while pending:
+                    finished, pending = await asyncio.wait(
+                        pending, timeout=_time_left(deadline), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not finished:
+                        break
+                    done |= finished
+                    if required is not None:
+                        succeeded += sum(
+                            slots_of[task] for task in finished if not is_error_response(task.result())
+                        )
+                        if succeeded >= required:
+                            break
+            except asyncio.CancelledError:
+                # Cancelling the tasks aborts their HTTP requests and closes the connections
+                pending = [task for task in tasks if not task.done()]
+                for task in pending:
+                    task.cancel()
+                logger.warning(f"Prompt cancelled: aborted {len(pending)} of {len(tasks)} in-flight model call(s)")
+                raise
+            
+            for task in pending:
+                task.cancel()
+            late_response = _timed_out_response
+            if pending:
+                if required is not None and succeeded >= required:
+                    logger.info(f"Got {required} response(s), cancelled {len(pending)} slower model(s)")
+                    late_response = _skipped_response
+                else:
+                    logger.warning(f"Deadline reached, cancelled {len(pending)} of {len(tasks)} model call(s)")
+            
+            if not sample:
+                tasks = [tasks[calls.index(model_string)] for model_string in corrected_models]
+            return [
+                task.result() if task in done else late_response(model_string)
+                for model_string, task in zip(corrected_models, tasks)
+            ]
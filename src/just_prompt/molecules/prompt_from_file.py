@@ -2,16 +2,24 @@
 Prompt from file functionality for just-prompt.
 """
 
-from typing import List
+from typing import List, Optional
 import logging
 import os
 from pathlib import Path
 from .prompt import prompt
+from ..atoms.shared.file_cache import read_prompt_file
 
 logger = logging.getLogger(__name__)
 
 
-def prompt_from_file(file: str, models_prefixed_by_provider: List[str] = None) -> List[str]:
+def prompt_from_file(
+    file: str,
+    models_prefixed_by_provider: List[str] = None,
+    deadline_seconds: Optional[float] = None,
+    min_responses: Optional[int] = None,
+    return_first: bool = False,
+    sample: bool = False,
+) -> List[str]:
     """
     Read text from a file and send it as a prompt to multiple models.
     
@@ -19,6 +27,10 @@ def prompt_from_file(file: str, models_prefixed_by_provider: List[str] = None) -
         file: Path to the text file
         models_prefixed_by_provider: List of model strings in format "provider:model"
                                     If None, uses the DEFAULT_MODELS environment variable
+        deadline_seconds: Time limit for the model calls; late models are reported as timed out
+        min_responses: Return as soon as this many models answered successfully
+        return_first: Shorthand for min_responses=1
+        sample: Send each listed model its own request, even duplicates
         
     Returns:
         List of responses from the models
@@ -34,11 +46,17 @@ def prompt_from_file(file: str, models_prefixed_by_provider: List[str] = None) -
     
     # Read file content
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
+        text = read_prompt_file(file)
     except Exception as e:
         logger.error(f"Error reading file {file}: {e}")
         raise ValueError(f"Error reading file: {str(e)}")
     
     # Send prompt with file content
-    return prompt(text, models_prefixed_by_provider)
\ No newline at end of file
+    return prompt(
+        text,
+        models_prefixed_by_provider,
+        deadline_seconds=deadline_seconds,
+        min_responses=min_responses,
+        return_first=return_first,
+        sample=sample,
+    )
\ No newline at end of file
@@ -2,7 +2,7 @@
 Prompt from file to file functionality for just-prompt.
 """
 
-from typing import List
+from typing import List, Optional
 import logging
 import os
 from pathlib import Path
@@ -12,7 +12,12 @@ from ..atoms.shared.utils import DEFAULT_MODEL
 logger = logging.getLogger(__name__)
 
 
-def prompt_from_file_to_file(file: str, models_prefixed_by_provider: List[str] = None, output_dir: str = ".") -> List[str]:
+def prompt_from_file_to_file(
+    file: str,
+    models_prefixed_by_provider: List[str] = None,
+    output_dir: str = ".",
+    deadline_seconds: Optional[float] = None,
+) -> List[str]:
     """
     Read text from a file, send it as prompt to multiple models, and save responses to files.
     
@@ -21,6 +26,7 @@ def prompt_from_file_to_file(file: str, models_prefixed_by_provider: List[str] =
         models_prefixed_by_provider: List of model strings in format "provider:model"
                                     If None, uses the DEFAULT_MODELS environment variable
         output_dir: Directory to save response files
+        deadline_seconds: Time limit for the model calls; late models are saved as timed out
         
     Returns:
         List of paths to the output files
@@ -37,7 +43,7 @@ def prompt_from_file_to_file(file: str, models_prefixed_by_provider: List[str] =
     input_file_name = Path(file).stem
     
     # Get responses
-    responses = prompt_from_file(file, models_prefixed_by_provider)
+    responses = prompt_from_file(file, models_prefixed_by_provider, deadline_seconds=deadline_seconds)
     
     # Save responses to files
     output_files = []
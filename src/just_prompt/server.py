@@ -3,15 +3,29 @@ MCP server for just-prompt.
 """
 
 import asyncio
+import concurrent.futures
+import contextvars
+import functools
 import logging
 import os
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Literal, Optional, Callable, Type
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 from pydantic import BaseModel, Field
 from .atoms.shared.utils import DEFAULT_MODEL
-from .atoms.shared.validator import print_provider_availability
+from .atoms.shared.validator import print_provider_availability, validate_provider_api_keys
+from .atoms.shared.warmup import providers_to_warm, start_warmup, warmup_status
+from .atoms.shared.execution import configure_execution_layer, shutdown_execution_layer
+from .atoms.shared.hedging import configure_hedging
+from .atoms.shared.model_catalog import configure_model_catalog
+from .atoms.shared.provider_registry import BUILTIN_SOURCE
+from .atoms.shared.correction_memo import configure_correction_memo
+from .atoms.shared.response_cache import MEMORY_ONLY, configure_response_cache, validate_cache_mode
+from .atoms.shared.similarity_cache import configure_similarity_cache
+from .atoms.shared.call_context import call_context, CallContext
+from .atoms.shared.cancellation import CancellationToken, cancellation_scope
 from .molecules.prompt import prompt
 from .molecules.prompt_from_file import prompt_from_file
 from .molecules.prompt_from_file_to_file import prompt_from_file_to_file
@@ -32,6 +46,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Default limits for concurrent tool execution
+DEFAULT_MAX_CONCURRENT_TOOLS = 8
+DEFAULT_MAX_QUEUED_TOOLS = 32
+
 # Tool names enum
 class JustPromptTools:
     PROMPT = "prompt"
@@ -49,6 +67,26 @@ class PromptSchema(BaseModel):
         None, 
         description="List of models with provider prefixes (e.g., 'openai:gpt-4o' or 'o:gpt-4o'). If not provided, uses default models."
     )
+    deadline_seconds: Optional[float] = Field(
+        None,
+        description="Time limit in seconds for the model calls. Models that haven't answered by then are reported as timed out."
+    )
+    cache: Literal["use", "refresh", "bypass"] = Field(
+        default="use",
+        description="Response cache mode when the server runs with a response cache: 'use' serves identical earlier prompts from the cache, 'refresh' calls the models and overwrites the cache, 'bypass' ignores it."
+    )
+    min_responses: Optional[int] = Field(
+        None,
+        description="Return as soon as this many models have answered successfully; slower models are skipped."
+    )
+    return_first: bool = Field(
+        default=False,
+        description="Return as soon as the first model answers successfully (same as min_responses=1)."
+    )
+    sample: bool = Field(
+        default=False,
+        description="Send every listed model its own request, even duplicates, and skip the response cache (to sample several answers from one model). By default duplicate models share one request."
+    )
 
 class PromptFromFileSchema(BaseModel):
     file: str = Field(..., description="Path to the file containing the prompt")
@@ -56,6 +94,26 @@ class PromptFromFileSchema(BaseModel):
         None, 
         description="List of models with provider prefixes (e.g., 'openai:gpt-4o' or 'o:gpt-4o'). If not provided, uses default models."
     )
+    deadline_seconds: Optional[float] = Field(
+        None,
+        description="Time limit in seconds for the model calls. Models that haven't answered by then are reported as timed out."
+    )
+    cache: Literal["use", "refresh", "bypass"] = Field(
+        default="use",
+        description="Response cache mode when the server runs with a response cache: 'use' serves identical earlier prompts from the cache, 'refresh' calls the models and overwrites the cache, 'bypass' ignores it."
+    )
+    min_responses: Optional[int] = Field(
+        None,
+        description="Return as soon as this many models have answered successfully; slower models are skipped."
+    )
+    return_first: bool = Field(
+        default=False,
+        description="Return as soon as the first model answers successfully (same as min_responses=1)."
+    )
+    sample: bool = Field(
+        default=False,
+        description="Send every listed model its own request, even duplicates, and skip the response cache (to sample several answers from one model). By default duplicate models share one request."
+    )
 
 class PromptFromFileToFileSchema(BaseModel):
     file: str = Field(..., description="Path to the file containing the prompt")
@@ -67,6 +125,14 @@ class PromptFromFileToFileSchema(BaseModel):
         default=".", 
         description="Directory to save the response files to (default: current directory)"
     )
+    deadline_seconds: Optional[float] = Field(
+        None,
+        description="Time limit in seconds for the model calls. Models that haven't answered by then are reported as timed out."
+    )
+    cache: Literal["use", "refresh", "bypass"] = Field(
+        default="use",
+        description="Response cache mode when the server runs with a response cache: 'use' serves identical earlier prompts from the cache, 'refresh' calls the models and overwrites the cache, 'bypass' ignores it."
+    )
 
 class ListProvidersSchema(BaseModel):
     pass
@@ -88,6 +154,14 @@ class CEOAndBoardSchema(BaseModel):
         default=DEFAULT_CEO_MODEL,
         description=f"Model for the CEO to make the final decision (default: {DEFAULT_CEO_MODEL})"
     )
+    deadline_seconds: Optional[float] = Field(
+        None,
+        description="Time limit in seconds for the whole run. The CEO decides with the board members that answered in time."
+    )
+    cache: Literal["use", "refresh", "bypass"] = Field(
+        default="use",
+        description="Response cache mode when the server runs with a response cache: 'use' serves identical earlier prompts from the cache, 'refresh' calls the models and overwrites the cache, 'bypass' ignores it."
+    )
 
 class BusinessAnalystSchema(BaseModel):
     file: str = Field(..., description="Path to the file containing the prompt")
@@ -103,20 +177,417 @@ class BusinessAnalystSchema(BaseModel):
         default=DEFAULT_ANALYST_MODEL,
         description=f"Model for the business analyst to create the final brief (default: {DEFAULT_ANALYST_MODEL})"
     )
+    deadline_seconds: Optional[float] = Field(
+        None,
+        description="Time limit in seconds for the whole run. The brief is consolidated from the analysts that answered in time."
+    )
+    cache: Literal["use", "refresh", "bypass"] = Field(
+        default="use",
+        description="Response cache mode when the server runs with a response cache: 'use' serves identical earlier prompts from the cache, 'refresh' calls the models and overwrites the cache, 'bypass' ignores it."
+    )
+
+
+def _run_tool(token: CancellationToken, context: Optional[CallContext], func: Callable, *args, **kwargs) -> Any:
+    """Run a tool function inside its own call context (retry budget, cancellation, etc.)."""
+    with call_context(context or CallContext()), cancellation_scope(token):
+        token.raise_if_cancelled()
+        return func(*args, **kwargs)
+
+
+def _cache_report(context: CallContext) -> str:
+    """Describe what a tool call got from the response cache and from provider-side prompt caches."""
+    report = ""
+    if context.cache_hits:
+        report += f"\n\nCache: {len(context.cache_hits)} response(s) served from cache ({', '.join(context.cache_hits)})"
+    for match in context.similar_matches:
+        report += f"\n\nCached response to a similar prompt for {match}"
+    for read in context.prompt_cache_reads:
+        report += (
+            f"\nProvider prompt cache: {read['model']} read {read['cached_tokens']} "
+            f"of {read['input_tokens']} input tokens from cache"
+        )
+    return report
+
+
+class ToolRunner:
+    """
+    Runs blocking tool functions off the event loop.
+    
+    At most max_in_flight tools execute at once, each in its own worker thread.
+    Further calls wait in a queue of up to max_queued entries; beyond that they
+    are rejected so a flood of requests cannot grow memory without bound.
+    """
+    
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_CONCURRENT_TOOLS, max_queued: int = DEFAULT_MAX_QUEUED_TOOLS):
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
+        if max_queued < 0:
+            raise ValueError(f"max_queued must not be negative, got {max_queued}")
+        
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._waiting = 0
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="just-prompt-tool"
+        )
+    
+    async def run(self, func: Callable, *args, context: Optional[CallContext] = None, **kwargs) -> Any:
+        """
+        Run a blocking function in a worker thread once an in-flight slot is free.
+        
+        Args:
+            func: The blocking function to run
+            *args: Positional arguments for func
+            context: Call context for the tool call (a fresh one if omitted)
+            **kwargs: Keyword arguments for func
+            
+        Returns:
+            The function's return value
+        """
+        if self._slots.locked():
+            if self._waiting >= self.max_queued:
+                raise ValueError(
+                    f"Server busy: {self.max_in_flight} tool calls in flight and {self._waiting} queued"
+                )
+            logger.info(f"Tool call queued ({self._waiting + 1} waiting, {self.max_in_flight} in flight)")
+        
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        
+        token = CancellationToken()
+        started = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            # Model requests made by the tool run on this loop, so cancelling aborts them
+            context = context or CallContext()
+            context.event_loop = loop
+            # Carry context variables over to the worker thread
+            variables = contextvars.copy_context()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(variables.run, _run_tool, token, context, func, *args, **kwargs)
+            )
+        except asyncio.CancelledError:
+            # The MCP client cancelled the request; stop the provider calls made for it
+            token.cancel()
+            logger.warning(
+                f"Tool call {getattr(func, '__name__', func)} cancelled by client after {time.monotonic() - started:.2f}s"
+            )
+            raise
+        finally:
+            self._slots.release()
+    
+    def shutdown(self) -> None:
+        """Stop accepting work and release the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Default models parsed once by serve()
+_default_models: Optional[List[str]] = None
+
+
+def _models_used(models_prefixed_by_provider: Optional[List[str]]) -> List[str]:
+    """Get the models a tool call used: the requested ones, or the server's default models."""
+    if models_prefixed_by_provider:
+        return models_prefixed_by_provider
+    if _default_models is not None:
+        return _default_models
+    return [model.strip() for model in os.environ.get("DEFAULT_MODELS", DEFAULT_MODEL).split(",")]
+
+
+# Tool handlers: called with the validated arguments, in a worker thread unless the tool is inline
+
+def _handle_prompt(args: PromptSchema) -> List[str]:
+    return prompt(
+        args.text,
+        args.models_prefixed_by_provider,
+        deadline_seconds=args.deadline_seconds,
+        min_responses=args.min_responses,
+        return_first=args.return_first,
+        sample=args.sample,
+    )
+
+
+def _handle_prompt_from_file(args: PromptFromFileSchema) -> List[str]:
+    return prompt_from_file(
+        args.file,
+        args.models_prefixed_by_provider,
+        deadline_seconds=args.deadline_seconds,
+        min_responses=args.min_responses,
+        return_first=args.return_first,
+        sample=args.sample,
+    )
+
+
+def _handle_prompt_from_file_to_file(args: PromptFromFileToFileSchema) -> List[str]:
+    return prompt_from_file_to_file(
+        args.file,
+        args.models_prefixed_by_provider,
+        args.output_dir,
+        deadline_seconds=args.deadline_seconds,
+    )
+
+
+def _handle_ceo_and_board(args: CEOAndBoardSchema) -> str:
+    return ceo_and_board_prompt(
+        args.file,
+        output_dir=args.output_dir,
+        models_prefixed_by_provider=args.models_prefixed_by_provider,
+        ceo_model=args.ceo_model,
+        deadline_seconds=args.deadline_seconds,
+    )
+
+
+def _handle_business_analyst(args: BusinessAnalystSchema) -> str:
+    return business_analyst_prompt(
+        args.file,
+        output_dir=args.output_dir,
+        models_prefixed_by_provider=args.models_prefixed_by_provider,
+        analyst_model=args.analyst_model,
+        deadline_seconds=args.deadline_seconds,
+    )
+
+
+def _handle_list_providers(args: ListProvidersSchema) -> List[Dict[str, Any]]:
+    return list_providers_func()
+
+
+def _handle_list_models(args: ListModelsSchema) -> List[str]:
+    return list_models_func(args.provider)
+
+
+# Output formatters: turn a handler's result into the text returned to the client
+
+def _format_responses(args: BaseModel, responses: List[str], context: CallContext) -> str:
+    models_used = _models_used(args.models_prefixed_by_provider)
+    return "\n".join([f"Model: {models_used[i]}\nResponse: {resp}" 
+                      for i, resp in enumerate(responses)]) + _cache_report(context)
+
+
+def _format_saved_files(args: PromptFromFileToFileSchema, file_paths: List[str], context: CallContext) -> str:
+    return f"Responses saved to:\n" + "\n".join(file_paths) + _cache_report(context)
+
+
+def _format_ceo_decision(args: CEOAndBoardSchema, ceo_decision_file: str, context: CallContext) -> str:
+    return (
+        f"CEO decision saved to:\n{ceo_decision_file}\n\nBoard responses are available in the same directory."
+        + _cache_report(context)
+    )
+
+
+def _format_analyst_brief(args: BusinessAnalystSchema, analyst_brief_file: str, context: CallContext) -> str:
+    return (
+        f"Business Analyst brief saved to:\n{analyst_brief_file}\n\nAnalyst responses are available in the same directory."
+        + _cache_report(context)
+    )
+
+
+def _format_providers(args: ListProvidersSchema, providers: List[Dict[str, Any]], context: CallContext) -> str:
+    status = warmup_status()
+    provider_text = "\nAvailable Providers:\n"
+    if status is not None:
+        provider_text = f"\nServer warm-up: {'ready' if status['ready'] else 'in progress'}" + provider_text
+    for provider in providers:
+        provider_text += f"- {provider['name']}: full_name='{provider['full_name']}', short_name='{provider['short_name']}'"
+        if provider["source"] != BUILTIN_SOURCE:
+            provider_text += f", plugin from {provider['source']}"
+        provider_text += "\n"
+        if provider["warmup"]:
+            warm = provider["warmup"]
+            provider_text += f"    warm-up: {warm['state']}"
+            if warm["state"] in ("ready", "failed"):
+                provider_text += f" in {warm['seconds']:.2f}s"
+            if warm["state"] == "ready":
+                provider_text += f" ({warm['models']} models)"
+            provider_text += "\n"
+        for circuit in provider["circuits"]:
+            provider_text += f"    circuit {circuit['model']}: {circuit['state']}"
+            if circuit["state"] == "open":
+                provider_text += f" (next probe in {circuit['retry_in_seconds']:.0f}s)"
+            provider_text += f", {circuit['consecutive_failures']} consecutive failure(s)\n"
+        for failure in provider["known_failures"]:
+            provider_text += (
+                f"    known failure {failure['model'] or '(all models)'}: {failure['kind']} "
+                f"(for {failure['expires_in_seconds']:.0f}s)\n"
+            )
+    return provider_text
+
+
+def _format_models(args: ListModelsSchema, models: List[str], context: CallContext) -> str:
+    return f"Models for provider '{args.provider}':\n" + "\n".join([f"- {model}" for model in models])
+
+
+class ToolSpec:
+    """
+    A tool exposed by the server: its argument schema, handler and output formatter.
+    
+    The MCP tool definition, including the JSON schema, is built once here.
+    Inline tools are cheap and run on the event loop instead of taking a
+    ToolRunner slot.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        schema: Type[BaseModel],
+        handler: Callable[[Any], Any],
+        formatter: Callable[[Any, Any, CallContext], str],
+        inline: bool = False,
+    ):
+        self.name = name
+        self.schema = schema
+        self.handler = handler
+        self.formatter = formatter
+        self.inline = inline
+        self.tool = Tool(name=name, description=description, inputSchema=schema.model_json_schema())
+
+
+TOOLS: Dict[str, ToolSpec] = {
+    spec.name: spec
+    for spec in [
+        ToolSpec(
+            JustPromptTools.PROMPT,
+            "Send a prompt to multiple LLM models",
+            PromptSchema,
+            _handle_prompt,
+            _format_responses,
+        ),
+        ToolSpec(
+            JustPromptTools.PROMPT_FROM_FILE,
+            "Send a prompt from a file to multiple LLM models",
+            PromptFromFileSchema,
+            _handle_prompt_from_file,
+            _format_responses,
+        ),
+        ToolSpec(
+            JustPromptTools.PROMPT_FROM_FILE_TO_FILE,
+            "Send a prompt from a file to multiple LLM models and save responses to files",
+            PromptFromFileToFileSchema,
+            _handle_prompt_from_file_to_file,
+            _format_saved_files,
+        ),
+        ToolSpec(
+            JustPromptTools.CEO_AND_BOARD,
+            "Send a prompt to multiple models as a 'board of directors', then have a 'CEO' model make a final decision",
+            CEOAndBoardSchema,
+            _handle_ceo_and_board,
+            _format_ceo_decision,
+        ),
+        ToolSpec(
+            JustPromptTools.BUSINESS_ANALYST,
+            "Send a prompt to multiple models as analysts, then have a business analyst model create a product brief",
+            BusinessAnalystSchema,
+            _handle_business_analyst,
+            _format_analyst_brief,
+        ),
+        ToolSpec(
+            JustPromptTools.LIST_PROVIDERS,
+            "List all available LLM providers",
+            ListProvidersSchema,
+            _handle_list_providers,
+            _format_providers,
+            inline=True,
+        ),
+        ToolSpec(
+            JustPromptTools.LIST_MODELS,
+            "List all available models for a specific LLM provider",
+            ListModelsSchema,
+            _handle_list_models,
+            _format_models,
+        ),
+    ]
+}
+
+# Tool definitions returned by list_tools
+TOOL_LIST: List[Tool] = [spec.tool for spec in TOOLS.values()]
+
+
+async def dispatch_tool(name: str, arguments: Optional[Dict[str, Any]], tool_runner: ToolRunner) -> List[TextContent]:
+    """
+    Validate a tool call's arguments and run its handler.
+    
+    Args:
+        name: Tool name
+        arguments: Raw arguments from the MCP client
+        tool_runner: Runner executing the handler off the event loop
+        
+    Returns:
+        The tool's output as MCP text content
+    """
+    logger.info(f"Tool call: {name}, arguments: {arguments}")
+    
+    spec = TOOLS.get(name)
+    if spec is None:
+        return [TextContent(
+            type="text",
+            text=f"Unknown tool: {name}"
+        )]
+    
+    try:
+        args = spec.schema.model_validate(arguments or {})
+        tool_context = CallContext(cache_mode=validate_cache_mode(getattr(args, "cache", None)))
+        if spec.inline:
+            result = spec.handler(args)
+        else:
+            result = await tool_runner.run(spec.handler, args, context=tool_context)
+        return [TextContent(
+            type="text",
+            text=spec.formatter(args, result, tool_context)
+        )]
+    except Exception as e:
+        logger.error(f"Error handling tool call: {name}, error: {e}")
+        return [TextContent(
+            type="text",
+            text=f"Error: {str(e)}"
+        )]
 
 
-async def serve(default_models: str = DEFAULT_MODEL) -> None:
+
+async def serve(
+    default_models: str = DEFAULT_MODEL,
+    max_concurrent_tools: int = DEFAULT_MAX_CONCURRENT_TOOLS,
+    max_queued_tools: int = DEFAULT_MAX_QUEUED_TOOLS,
+    provider_concurrency: Optional[Dict[str, int]] = None,
+    hedge_requests: Optional[bool] = None,
+    catalog_ttl: Optional[float] = None,
+    catalog_snapshot: Optional[str] = None,
+    correction_db: Optional[str] = None,
+    response_cache: Optional[str] = None,
+    response_cache_ttl: Optional[float] = None,
+    similarity_threshold: Optional[float] = None,
+    similar_prompts: str = "serve",
+    warmup: bool = True,
+) -> None:
     """
     Start the MCP server.
     
     Args:
         default_models: Comma-separated list of default models to use for prompts and corrections
+        max_concurrent_tools: Maximum number of tool calls executing at the same time
+        max_queued_tools: Maximum number of tool calls waiting for a free slot
+        provider_concurrency: Per-provider concurrency limits, overriding the defaults
+        hedge_requests: Duplicate calls that outlive their p95 latency (None keeps the environment setting)
+        catalog_ttl: Seconds a provider's model list is cached before being revalidated
+        catalog_snapshot: JSON file the model catalogs are persisted to across restarts
+        correction_db: SQLite file remembering model name corrections (None uses the default location)
+        response_cache: SQLite file caching model responses, ":memory:" for a memory-only cache (None disables it)
+        response_cache_ttl: Seconds a cached response stays valid
+        similarity_threshold: Jaccard similarity above which a near-duplicate prompt matches a cached one (None disables it)
+        similar_prompts: "serve" answers near-duplicates from the cache, "offer" calls the model and reports the cached response
+        warmup: Import the configured providers, build their clients, open connections and prefetch catalogs
+                in the background once the server is up
     """
     # Set global default models for prompts and corrections
     os.environ["DEFAULT_MODELS"] = default_models
     
-    # Parse default models into a list
+    # Parse default models into a list, once for every tool call
+    global _default_models
     default_models_list = [model.strip() for model in default_models.split(",")]
+    _default_models = default_models_list
     
     # Set the first model as the correction model
     correction_model = default_models_list[0] if default_models_list else "o:gpt-4o-mini"
@@ -128,169 +599,58 @@ async def serve(default_models: str = DEFAULT_MODEL) -> None:
     # Check and log provider availability
     print_provider_availability()
     
+    # Provider calls from every tool share one set of long-lived per-provider pools
+    configure_execution_layer(provider_concurrency)
+    if hedge_requests is not None:
+        configure_hedging(hedge_requests)
+    if catalog_ttl is not None or catalog_snapshot is not None:
+        configure_model_catalog(catalog_ttl, catalog_snapshot)
+    if correction_db is not None:
+        configure_correction_memo(correction_db)
+    if response_cache:
+        configure_response_cache(response_cache, response_cache_ttl)
+        if similarity_threshold is not None:
+            configure_similarity_cache(
+                similarity_threshold,
+                similar_prompts,
+                path=None if response_cache == MEMORY_ONLY else response_cache,
+            )
+    elif similarity_threshold is not None:
+        logger.warning("Near-duplicate prompt lookup needs --response-cache, ignoring --similarity-threshold")
+    
+    # Blocking tool work runs in worker threads so the stdio loop stays responsive
+    tool_runner = ToolRunner(max_concurrent_tools, max_queued_tools)
+    logger.info(f"Tool concurrency: {max_concurrent_tools} in flight, {max_queued_tools} queued")
+    
     # Create the MCP server
     server = Server("just-prompt")
     
     @server.list_tools()
     async def list_tools() -> List[Tool]:
         """Register all available tools with the MCP server."""
-        return [
-            Tool(
-                name=JustPromptTools.PROMPT,
-                description="Send a prompt to multiple LLM models",
-                inputSchema=PromptSchema.schema(),
-            ),
-            Tool(
-                name=JustPromptTools.PROMPT_FROM_FILE,
-                description="Send a prompt from a file to multiple LLM models",
-                inputSchema=PromptFromFileSchema.schema(),
-            ),
-            Tool(
-                name=JustPromptTools.PROMPT_FROM_FILE_TO_FILE,
-                description="Send a prompt from a file to multiple LLM models and save responses to files",
-                inputSchema=PromptFromFileToFileSchema.schema(),
-            ),
-            Tool(
-                name=JustPromptTools.CEO_AND_BOARD,
-                description="Send a prompt to multiple models as a 'board of directors', then have a 'CEO' model make a final decision",
-                inputSchema=CEOAndBoardSchema.schema(),
-            ),
-            Tool(
-                name=JustPromptTools.BUSINESS_ANALYST,
-                description="Send a prompt to multiple models as analysts, then have a business analyst model create a product brief",
-                inputSchema=BusinessAnalystSchema.schema(),
-            ),
-            Tool(
-                name=JustPromptTools.LIST_PROVIDERS,
-                description="List all available LLM providers",
-                inputSchema=ListProvidersSchema.schema(),
-            ),
-            Tool(
-                name=JustPromptTools.LIST_MODELS,
-                description="List all available models for a specific LLM provider",
-                inputSchema=ListModelsSchema.schema(),
-            ),
-        ]
+        return TOOL_LIST
     
     @server.call_tool()
     async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         """Handle tool calls from the MCP client."""
-        logger.info(f"Tool call: {name}, arguments: {arguments}")
-        
-        try:
-            if name == JustPromptTools.PROMPT:
-                models_to_use = arguments.get("models_prefixed_by_provider")
-                responses = prompt(arguments["text"], models_to_use)
-                
-                # Get the model names that were actually used
-                models_used = models_to_use if models_to_use else [model.strip() for model in os.environ.get("DEFAULT_MODELS", DEFAULT_MODEL).split(",")]
-                
-                return [TextContent(
-                    type="text",
-                    text="\n".join([f"Model: {models_used[i]}\nResponse: {resp}" 
-                                  for i, resp in enumerate(responses)])
-                )]
-                
-            elif name == JustPromptTools.PROMPT_FROM_FILE:
-                models_to_use = arguments.get("models_prefixed_by_provider")
-                responses = prompt_from_file(arguments["file"], models_to_use)
-                
-                # Get the model names that were actually used
-                models_used = models_to_use if models_to_use else [model.strip() for model in os.environ.get("DEFAULT_MODELS", DEFAULT_MODEL).split(",")]
-                
-                return [TextContent(
-                    type="text",
-                    text="\n".join([f"Model: {models_used[i]}\nResponse: {resp}" 
-                                  for i, resp in enumerate(responses)])
-                )]
-                
-            elif name == JustPromptTools.PROMPT_FROM_FILE_TO_FILE:
-                output_dir = arguments.get("output_dir", ".")
-                models_to_use = arguments.get("models_prefixed_by_provider")
-                file_paths = prompt_from_file_to_file(
-                    arguments["file"], 
-                    models_to_use,
-                    output_dir
-                )
-                return [TextContent(
-                    type="text",
-                    text=f"Responses saved to:\n" + "\n".join(file_paths)
-                )]
-                
-            elif name == JustPromptTools.LIST_PROVIDERS:
-                providers = list_providers_func()
-                provider_text = "\nAvailable Providers:\n"
-                for provider in providers:
-                    provider_text += f"- {provider['name']}: full_name='{provider['full_name']}', short_name='{provider['short_name']}'\n"
-                return [TextContent(
-                    type="text",
-                    text=provider_text
-                )]
-                
-            elif name == JustPromptTools.LIST_MODELS:
-                models = list_models_func(arguments["provider"])
-                return [TextContent(
-                    type="text",
-                    text=f"Models for provider '{arguments['provider']}':\n" + 
-                         "\n".join([f"- {model}" for model in models])
-                )]
-
-            elif name == JustPromptTools.CEO_AND_BOARD:
-                file_path = arguments["file"]
-                output_dir = arguments.get("output_dir", ".")
-                models_to_use = arguments.get("models_prefixed_by_provider")
-                ceo_model = arguments.get("ceo_model", DEFAULT_CEO_MODEL)
-                
-                # Run the CEO and board prompt process
-                ceo_decision_file = ceo_and_board_prompt(
-                    file_path,
-                    output_dir=output_dir,
-                    models_prefixed_by_provider=models_to_use,
-                    ceo_model=ceo_model
-                )
-                
-                return [TextContent(
-                    type="text",
-                    text=f"CEO decision saved to:\n{ceo_decision_file}\n\nBoard responses are available in the same directory."
-                )]
-                
-            elif name == JustPromptTools.BUSINESS_ANALYST:
-                file_path = arguments["file"]
-                output_dir = arguments.get("output_dir", ".")
-                models_to_use = arguments.get("models_prefixed_by_provider")
-                analyst_model = arguments.get("analyst_model", DEFAULT_ANALYST_MODEL)
-                
-                # Run the Business Analyst prompt process
-                analyst_brief_file = business_analyst_prompt(
-                    file_path,
-                    output_dir=output_dir,
-                    models_prefixed_by_provider=models_to_use,
-                    analyst_model=analyst_model
-                )
-                
-                return [TextContent(
-                    type="text",
-                    text=f"Business Analyst brief saved to:\n{analyst_brief_file}\n\nAnalyst responses are available in the same directory."
-                )]
-                
-            else:
-                return [TextContent(
-                    type="text",
-                    text=f"Unknown tool: {name}"
-                )]
-                
-        except Exception as e:
-            logger.error(f"Error handling tool call: {name}, error: {e}")
-            return [TextContent(
-                type="text",
-                text=f"Error: {str(e)}"
-            )]
+        return await dispatch_tool(name, arguments, tool_runner)
     
     # Initialize and run the server
     try:
         options = server.create_initialization_options()
         async with stdio_server() as (read_stream, write_stream):
+            if warmup:
+                # Import and initialize the configured providers in daemon threads while the
+                # client completes the handshake, so first prompts don't pay for SDK imports;
+                # async connections are opened on this loop, where the tools use them
+                start_warmup(
+                    providers_to_warm(default_models_list, validate_provider_api_keys()),
+                    asyncio.get_running_loop(),
+                )
             await server.run(read_stream, write_stream, options, raise_exceptions=True)
     except Exception as e:
         logger.error(f"Error running server: {e}")
-        raise
\ No newline at end of file
+        raise
+    finally:
+        tool_runner.shutdown()
+        shutdown_execution_layer()
\ No newline at end of file
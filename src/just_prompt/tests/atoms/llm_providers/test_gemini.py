@@ -84,4 +84,14 @@ def test_prompt_with_thinking():
     # Assertions
     assert isinstance(response, str)
     assert len(response) > 0
-    assert "paris" in response.lower() or "Paris" in response
\ No newline at end of file
+    assert "paris" in response.lower() or "Paris" in response
+
+def test_list_models_falls_back_when_client_fails(monkeypatch):
+    """Test that a client that can't be built yields the known models instead of an error."""
+    from just_prompt.atoms.shared.lazy import Lazy
+
+    def broken():
+        raise ImportError("google-genai is not installed")
+
+    monkeypatch.setattr(gemini, "_genai", Lazy(broken))
+    assert "gemini-2.5-pro-preview-03-25" in gemini.list_models()
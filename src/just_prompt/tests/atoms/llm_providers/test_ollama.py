@@ -29,3 +29,62 @@ def test_prompt():
     assert isinstance(response, str)
     assert len(response) > 0
     assert "paris" in response.lower() or "Paris" in response
+
+
+def test_prompt_deadline_uses_shared_timeout_clients(monkeypatch):
+    """Test that calls inside a deadline share clients built with a matching timeout."""
+    import httpx
+    import ollama as ollama_sdk
+    from just_prompt.atoms.shared.deadline import deadline_scope
+
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={
+            "model": "llama3:latest",
+            "message": {"role": "assistant", "content": "Paris"},
+            "done": True,
+        })
+
+    built = []
+
+    def build_client(**options):
+        built.append(options)
+        return ollama_sdk.Client(host="http://ollama.test", transport=httpx.MockTransport(handler), **options)
+
+    monkeypatch.setattr(ollama, "_build_client", build_client)
+    monkeypatch.setattr(ollama, "_deadline_clients", {})
+    monkeypatch.setattr(ollama, "get_client", lambda: build_client())
+    with deadline_scope(4.5):
+        assert ollama.prompt("Capital of France?", "llama3:latest") == "Paris"
+        assert ollama.prompt("Capital of France?", "llama3:latest") == "Paris"
+    assert ollama.prompt("Capital of France?", "llama3:latest") == "Paris"
+
+    # Both deadline calls reuse one client with the remaining time rounded up
+    assert built == [{"timeout": 5}, {}]
+    assert timeouts[:2] == [5, 5]
+    # Outside a deadline the client's own timeout applies
+    assert timeouts[2] is None
+
+
+async def test_aprompt_deadline_cancels_request(monkeypatch):
+    """Test that an async call still running at the deadline is cancelled."""
+    import asyncio
+    from just_prompt.atoms.shared.deadline import deadline_scope
+
+    cancelled = asyncio.Event()
+
+    class SlowClient:
+        async def chat(self, model, messages):
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+    monkeypatch.setattr(ollama, "get_async_client", lambda: SlowClient())
+    with deadline_scope(0.1):
+        with pytest.raises(ValueError, match="Failed to get response from Ollama"):
+            await ollama.aprompt("Capital of France?", "llama3:latest")
+    assert cancelled.is_set()
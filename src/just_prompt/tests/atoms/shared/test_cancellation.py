@@ -0,0 +1,90 @@
+"""
+Tests for tool-call cancellation.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from just_prompt.atoms.shared.cancellation import (
+    CancellationToken,
+    OperationCancelled,
+    cancellation_scope,
+    check_cancelled,
+    sleep,
+)
+from just_prompt.atoms.shared.retry import call_with_retry, classify_error
+from just_prompt.molecules.prompt import prompt
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_token_runs_callbacks_once():
+    """Test that callbacks run on cancel, and immediately once cancelled."""
+    token = CancellationToken()
+    calls = []
+    token.add_callback(lambda: calls.append("first"))
+
+    assert token.cancel()
+    assert not token.cancel()
+    assert token.cancelled
+    assert token.future.done()
+
+    token.add_callback(lambda: calls.append("late"))
+    assert calls == ["first", "late"]
+
+    with pytest.raises(OperationCancelled):
+        token.raise_if_cancelled()
+    assert not classify_error(OperationCancelled("x")).retryable
+
+
+def test_sleep_wakes_on_cancel():
+    """Test that a backoff sleep ends as soon as the call is cancelled."""
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+
+    start = time.monotonic()
+    with cancellation_scope(token):
+        with pytest.raises(OperationCancelled):
+            sleep(5.0, time.sleep)
+    assert time.monotonic() - start < 1.0
+
+
+def test_no_retry_after_cancel():
+    """Test that a cancelled call is not retried."""
+    token = CancellationToken()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        token.cancel()
+        raise FakeStatusError(503)
+
+    with cancellation_scope(token):
+        with pytest.raises(OperationCancelled):
+            call_with_retry(failing)
+        with pytest.raises(OperationCancelled):
+            check_cancelled()
+    assert len(calls) == 1
+
+
+def test_prompt_stops_waiting_when_cancelled():
+    """Test that prompt returns control as soon as its tool call is cancelled."""
+    token = CancellationToken()
+
+    def slow_route(model_string, text):
+        time.sleep(0.5)
+        return "late"
+
+    threading.Timer(0.05, token.cancel).start()
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+         patch("just_prompt.molecules.prompt.ModelRouter.route_prompt", side_effect=slow_route):
+        start = time.monotonic()
+        with cancellation_scope(token):
+            with pytest.raises(OperationCancelled):
+                prompt("hi", ["o:gpt-4o", "a:claude"])
+        assert time.monotonic() - start < 0.4
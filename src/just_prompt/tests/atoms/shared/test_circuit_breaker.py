@@ -0,0 +1,120 @@
+"""
+Tests for the per provider/model circuit breaker.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from just_prompt.atoms.shared.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CLOSED,
+    OPEN,
+    HALF_OPEN,
+    DEFAULT_FAILURE_THRESHOLD,
+    reset_circuit_breakers,
+)
+from just_prompt.atoms.shared import retry
+from just_prompt.atoms.shared.model_router import ModelRouter
+from just_prompt.molecules.list_providers import list_providers
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    """Start every test with closed breakers."""
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+def test_opens_after_consecutive_failures():
+    """Test that health failures open the breaker and open calls fail fast."""
+    breaker = CircuitBreaker("openai:gpt-4o", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.before_call(now=0)
+        breaker.record_failure("server_error", now=0)
+    assert breaker.state == CLOSED
+
+    breaker.before_call(now=0)
+    breaker.record_failure("timeout", now=0)
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError, match="Circuit open"):
+        breaker.before_call(now=10)
+
+
+def test_client_errors_do_not_open():
+    """Test that rate limits and bad requests don't count against the provider."""
+    breaker = CircuitBreaker("openai:gpt-4o", failure_threshold=2)
+    for kind in ("rate_limited", "bad_request", "auth_failed", "cancelled"):
+        breaker.record_failure(kind)
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_half_open_allows_single_probe():
+    """Test that after the reset timeout exactly one probe goes through."""
+    breaker = CircuitBreaker("openai:gpt-4o", failure_threshold=1, reset_timeout=30)
+    breaker.record_failure("connection", now=0)
+
+    breaker.before_call(now=31)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError, match="probe"):
+        breaker.before_call(now=31)
+
+    # A failed probe re-opens the breaker
+    breaker.record_failure("connection", now=31)
+    assert breaker.state == OPEN
+
+    # A successful probe closes it
+    breaker.before_call(now=62)
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call(now=62)
+
+
+# patch.object: a string target would be resolved through the mocked import_module
+@patch.object(retry.time, "sleep")
+@patch("just_prompt.atoms.shared.model_router.ModelRouter.validate_and_correct_model", side_effect=lambda p, m: m)
+@patch("importlib.import_module")
+def test_router_fails_fast_when_open(mock_import, mock_validate, mock_sleep):
+    """Test that the router stops calling a provider once its breaker is open, counting calls rather than attempts."""
+    failing = MagicMock(side_effect=ConnectionError("connection refused"))
+    mock_import.return_value = MagicMock(prompt=failing)
+
+    for _ in range(DEFAULT_FAILURE_THRESHOLD - 1):
+        with pytest.raises(Exception):
+            ModelRouter.route_prompt("openai:gpt-4o", "hi")
+    # Retried attempts don't count separately
+    assert failing.call_count > DEFAULT_FAILURE_THRESHOLD
+    openai = next(p for p in list_providers() if p["full_name"] == "openai")
+    assert openai["circuits"][0]["state"] == CLOSED
+
+    with pytest.raises(Exception):
+        ModelRouter.route_prompt("openai:gpt-4o", "hi")
+    calls = failing.call_count
+
+    with pytest.raises(CircuitOpenError):
+        ModelRouter.route_prompt("openai:gpt-4o", "hi")
+    assert failing.call_count == calls
+
+    openai = next(p for p in list_providers() if p["full_name"] == "openai")
+    assert openai["circuits"][0]["model"] == "gpt-4o"
+    assert openai["circuits"][0]["state"] == OPEN
+
+
+# patch.object: a string target would be resolved through the mocked import_module
+@patch.object(retry.time, "sleep")
+@patch("just_prompt.atoms.shared.model_router.ModelRouter.validate_and_correct_model", side_effect=lambda p, m: "gpt-4o")
+@patch("importlib.import_module")
+def test_corrected_model_fails_fast_before_validation(mock_import, mock_validate, mock_sleep):
+    """Test that failures of a corrected model open the breaker checked for the requested name."""
+    mock_import.return_value = MagicMock(prompt=MagicMock(side_effect=ConnectionError("connection refused")))
+
+    for _ in range(DEFAULT_FAILURE_THRESHOLD):
+        with pytest.raises(Exception):
+            ModelRouter.route_prompt("openai:gpt4o", "hi")
+    validations = mock_validate.call_count
+
+    with pytest.raises(CircuitOpenError):
+        ModelRouter.route_prompt("openai:gpt4o", "hi")
+    assert mock_validate.call_count == validations
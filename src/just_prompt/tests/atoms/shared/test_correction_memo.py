@@ -0,0 +1,67 @@
+"""
+Tests for the persistent model name correction memo.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from just_prompt.atoms.shared.correction_memo import CorrectionMemo, configure_correction_memo
+from just_prompt.atoms.shared.model_catalog import ModelCatalog, catalog_version
+from just_prompt.atoms.shared.model_router import ModelRouter
+
+
+def test_memo_persists_across_instances(tmp_path):
+    """Test that a correction survives reopening the database."""
+    path = str(tmp_path / "corrections.sqlite3")
+    CorrectionMemo(path).put("anthropic", "sonnet", "v1", "claude-sonnet-4")
+
+    memo = CorrectionMemo(path)
+    assert memo.get("anthropic", "sonnet", "v1") == "claude-sonnet-4"
+    assert memo.get("anthropic", "sonnet", "v2") is None
+
+
+def test_invalidate_keeps_current_version():
+    """Test that invalidation drops corrections made against other catalog versions."""
+    memo = CorrectionMemo(":memory:")
+    memo.put("openai", "gpt4", "v1", "gpt-4o")
+    memo.put("openai", "mini", "v2", "gpt-4o-mini")
+    memo.put("groq", "llama", "v1", "llama-3.3-70b")
+
+    assert memo.invalidate("openai", keep_version="v2") == 1
+    assert memo.get("openai", "gpt4", "v1") is None
+    assert memo.get("openai", "mini", "v2") == "gpt-4o-mini"
+    assert memo.get("groq", "llama", "v1") == "llama-3.3-70b"
+
+
+@pytest.fixture
+def catalog_and_memo():
+    """Route corrections through an in-memory memo and a fake catalog."""
+    catalog = ModelCatalog(loader=lambda provider: ["gpt-4o", "gpt-4o-mini"])
+    memo = configure_correction_memo(":memory:")
+    with patch("just_prompt.atoms.shared.model_router.get_model_catalog", return_value=catalog):
+        yield catalog, memo
+
+
+@patch("importlib.import_module")
+def test_correction_made_once_per_catalog_version(mock_import_module, catalog_and_memo):
+    """Test that the correction model is only asked once for the same typo."""
+    catalog, memo = catalog_and_memo
+    correction_module = MagicMock()
+    correction_module.prompt.return_value = "gpt-4o-mini"
+    mock_import_module.return_value = correction_module
+
+    for _ in range(3):
+        assert ModelRouter.magic_model_correction("openai", "the small one", "openai:gpt-4o") == "gpt-4o-mini"
+    assert correction_module.prompt.call_count == 1
+    assert memo.get("openai", "the small one", catalog_version(["gpt-4o", "gpt-4o-mini"])) == "gpt-4o-mini"
+
+
+def test_catalog_refresh_invalidates_memo(catalog_and_memo):
+    """Test that a catalog refresh with new models forgets older corrections."""
+    catalog, memo = catalog_and_memo
+    catalog.get("openai")
+    old_version = catalog.version("openai")
+    memo.put("openai", "gpt4o-mini", old_version, "gpt-4o-mini")
+
+    catalog._loader = lambda provider: ["gpt-4o", "gpt-4o-mini", "gpt-5"]
+    catalog.refresh("openai")
+    assert memo.get("openai", "gpt4o-mini", old_version) is None
@@ -0,0 +1,67 @@
+"""
+Tests for per-call deadlines.
+"""
+
+import pytest
+from unittest.mock import patch
+from just_prompt.atoms.shared.deadline import (
+    deadline_scope,
+    remaining_time,
+    timeout_options,
+    check_deadline,
+    DeadlineExceeded,
+)
+from just_prompt.atoms.shared.retry import call_with_retry, classify_error
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_no_deadline_by_default():
+    """Test that calls are unbounded outside a deadline scope."""
+    assert remaining_time() is None
+    assert timeout_options() == {}
+    check_deadline()
+
+
+def test_nested_scope_only_shortens():
+    """Test that an inner scope can't extend the enclosing deadline."""
+    with deadline_scope(0.5) as outer:
+        with deadline_scope(10) as inner:
+            assert inner == outer
+        with deadline_scope(0.1) as inner:
+            assert inner < outer
+            assert 0 < timeout_options()["timeout"] <= 0.1
+        with deadline_scope(None) as inner:
+            assert inner == outer
+    assert remaining_time() is None
+
+
+def test_expired_deadline():
+    """Test that an expired deadline stops new requests and isn't retried."""
+    with deadline_scope(0):
+        with pytest.raises(DeadlineExceeded):
+            check_deadline()
+        try:
+            check_deadline()
+        except DeadlineExceeded as e:
+            assert not classify_error(e).retryable
+
+
+@patch("just_prompt.atoms.shared.retry.time.sleep")
+def test_retry_stops_at_deadline(mock_sleep):
+    """Test that no retry is scheduled past the deadline."""
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise FakeStatusError(503)
+
+    with deadline_scope(0):
+        with pytest.raises(FakeStatusError):
+            call_with_retry(failing)
+    assert len(calls) == 1
+    mock_sleep.assert_not_called()
@@ -0,0 +1,83 @@
+"""
+Tests for the execution layer.
+"""
+
+import threading
+import time
+import pytest
+from just_prompt.atoms.shared.execution import (
+    ExecutionLayer,
+    parse_provider_concurrency,
+    FALLBACK_PROVIDER_CONCURRENCY,
+)
+
+
+def test_parse_provider_concurrency():
+    """Test parsing per-provider concurrency specs."""
+    assert parse_provider_concurrency("ollama=1,openai=32") == {"ollama": 1, "openai": 32}
+    assert parse_provider_concurrency("l=2, a=4") == {"ollama": 2, "anthropic": 4}
+    assert parse_provider_concurrency("") == {}
+    assert parse_provider_concurrency(None) == {}
+
+    with pytest.raises(ValueError):
+        parse_provider_concurrency("unknown=1")
+
+    with pytest.raises(ValueError):
+        parse_provider_concurrency("openai")
+
+    with pytest.raises(ValueError):
+        parse_provider_concurrency("openai=0")
+
+
+def test_bulkhead_limits_provider_concurrency():
+    """Test that a provider never exceeds its configured limit."""
+    layer = ExecutionLayer({"ollama": 1})
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def call():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    try:
+        futures = [layer.submit("ollama", call) for _ in range(4)]
+        for future in futures:
+            future.result()
+    finally:
+        layer.shutdown()
+
+    assert peak == 1
+
+
+def test_slow_provider_does_not_starve_others():
+    """Test that a burst against one provider leaves other providers unaffected."""
+    layer = ExecutionLayer({"ollama": 1, "openai": 4})
+    try:
+        for _ in range(5):
+            layer.submit("ollama", time.sleep, 0.2)
+
+        start = time.monotonic()
+        layer.submit("openai", time.sleep, 0.01).result()
+        elapsed = time.monotonic() - start
+    finally:
+        layer.shutdown()
+
+    assert elapsed < 0.15
+
+
+def test_executor_is_reused():
+    """Test that provider pools are long-lived rather than created per call."""
+    layer = ExecutionLayer()
+    try:
+        assert layer.executor_for("openai") is layer.executor_for("openai")
+        assert layer.executor_for("openai") is not layer.executor_for("anthropic")
+        assert layer.limit_for("openai") == 32
+        assert layer.limit_for("custom") == FALLBACK_PROVIDER_CONCURRENCY
+    finally:
+        layer.shutdown()
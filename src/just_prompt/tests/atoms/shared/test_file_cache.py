@@ -0,0 +1,49 @@
+"""
+Tests for the prompt file content cache.
+"""
+
+import os
+from unittest.mock import patch
+from just_prompt.atoms.shared.file_cache import FileCache
+
+
+def test_unchanged_file_served_from_memory(tmp_path):
+    """Test that a second read of an unchanged file doesn't open it again."""
+    path = tmp_path / "prompt.txt"
+    path.write_text("hello", encoding="utf-8")
+    cache = FileCache()
+
+    assert cache.read_text(str(path)) == "hello"
+    with patch("builtins.open", side_effect=AssertionError("file was reopened")):
+        assert cache.read_text(str(path)) == "hello"
+
+
+def test_modified_file_read_again(tmp_path):
+    """Test that a change to the file's size or mtime invalidates its entry."""
+    path = tmp_path / "prompt.txt"
+    path.write_text("first", encoding="utf-8")
+    cache = FileCache()
+    assert cache.read_text(str(path)) == "first"
+
+    path.write_text("second version", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.read_text(str(path)) == "second version"
+    assert len(cache._entries) == 1
+
+
+def test_byte_cap_evicts_least_recently_used(tmp_path):
+    """Test that the cache stays under its byte cap and skips oversized files."""
+    cache = FileCache(max_bytes=10)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).write_text(name * 4, encoding="utf-8")
+    (tmp_path / "big").write_text("x" * 11, encoding="utf-8")
+
+    cache.read_text(str(tmp_path / "a"))
+    cache.read_text(str(tmp_path / "b"))
+    cache.read_text(str(tmp_path / "c"))
+    cache.read_text(str(tmp_path / "big"))
+
+    cached = {os.path.basename(key[0]) for key in cache._entries}
+    assert cached == {"b", "c"}
+    assert cache._bytes == 8
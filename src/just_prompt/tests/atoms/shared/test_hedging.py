@@ -0,0 +1,176 @@
+"""
+Tests for hedged requests.
+"""
+
+import asyncio
+import time
+import pytest
+from just_prompt.atoms.shared import hedging
+from just_prompt.atoms.shared.execution import ExecutionLayer
+from just_prompt.atoms.shared.hedging import (
+    LatencyTracker,
+    HedgeBudget,
+    MIN_LATENCY_SAMPLES,
+    ahedged_call,
+    timed_call,
+)
+
+
+@pytest.fixture
+def hedging_on(monkeypatch):
+    """Enable hedging with a fresh tracker and a budget that always allows one hedge."""
+    tracker = LatencyTracker()
+    for _ in range(MIN_LATENCY_SAMPLES):
+        tracker.record("openai", "gpt-4o", 0.05)
+    budget = HedgeBudget(budget_ratio=1.0)
+    monkeypatch.setattr(hedging, "latency_tracker", tracker)
+    monkeypatch.setattr(hedging, "hedge_budget", budget)
+    monkeypatch.setattr(hedging, "_hedging_enabled", True)
+    return budget
+
+
+def test_percentile_needs_samples():
+    """Test that no threshold is reported until enough latencies are known."""
+    tracker = LatencyTracker()
+    for i in range(MIN_LATENCY_SAMPLES - 1):
+        tracker.record("openai", "gpt-4o", 1.0)
+    assert tracker.percentile("openai", "gpt-4o") is None
+
+    for i in range(100):
+        tracker.record("openai", "gpt-4o", i / 100)
+    assert 0.9 <= tracker.percentile("openai", "gpt-4o") <= 1.0
+
+
+def test_budget_limits_hedges():
+    """Test that hedges are capped at a fraction of primary requests."""
+    budget = HedgeBudget(budget_ratio=0.5)
+    budget.deposit("openai")
+    assert not budget.try_spend("openai")
+    budget.deposit("openai")
+    assert budget.try_spend("openai")
+    assert not budget.try_spend("openai")
+    # Budgets are per provider
+    assert not budget.try_spend("anthropic")
+
+
+async def test_fast_call_is_not_hedged(hedging_on):
+    """Test that calls finishing under p95 run once."""
+    calls = []
+
+    async def fast():
+        calls.append(1)
+        return "ok"
+
+    assert await ahedged_call("openai", "gpt-4o", fast) == "ok"
+    assert len(calls) == 1
+
+
+def test_sync_calls_are_timed_not_hedged(hedging_on):
+    """Test that a slow blocking call runs once and only feeds the latency tracker."""
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "ok"
+
+    assert timed_call("openai", "gpt-4o", slow) == "ok"
+    assert len(calls) == 1
+    assert hedging.latency_tracker.percentile("openai", "gpt-4o", 1.0) >= 0.2
+
+
+def test_failed_sync_call_on_single_worker_bulkhead(hedging_on):
+    """Test that a slow failing call on a one-worker bulkhead raises rather than waiting on queued work."""
+    for _ in range(MIN_LATENCY_SAMPLES):
+        hedging.latency_tracker.record("ollama", "llama3", 0.05)
+    layer = ExecutionLayer({"ollama": 1})
+    calls = []
+
+    def slow_then_fails():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError("primary failed")
+
+    try:
+        future = layer.submit("ollama", timed_call, "ollama", "llama3", slow_then_fails)
+        with pytest.raises(ValueError):
+            future.result(timeout=2)
+        assert calls == [1]
+    finally:
+        layer.shutdown()
+
+
+async def test_no_hedge_without_budget(hedging_on, monkeypatch):
+    """Test that an exhausted budget waits for the primary call instead."""
+    monkeypatch.setattr(hedging, "hedge_budget", HedgeBudget(budget_ratio=0.0))
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return "ok"
+
+    assert await ahedged_call("openai", "gpt-4o", slow) == "ok"
+    assert len(calls) == 1
+
+
+async def test_async_hedge_cancels_loser(hedging_on):
+    """Test that the async hedge cancels the slower request."""
+    cancelled = asyncio.Event()
+    calls = []
+
+    async def first_slow():
+        calls.append(1)
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "slow"
+        return "fast"
+
+    assert await ahedged_call("openai", "gpt-4o", first_slow) == "fast"
+    await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+
+
+async def test_async_hedge_uses_duplicate_when_primary_fails(hedging_on):
+    """Test that a failing primary hands over to the hedge instead of failing the call."""
+    calls = []
+
+    async def first_slow_then_fails():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.2)
+            raise ValueError("primary failed")
+        await asyncio.sleep(0.3)
+        return "hedge"
+
+    assert await ahedged_call("openai", "gpt-4o", first_slow_then_fails) == "hedge"
+    assert len(calls) == 2
+
+
+async def test_cancelling_before_threshold_cancels_primary(hedging_on, monkeypatch):
+    """Test that cancelling the caller before the hedge threshold aborts the primary request."""
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow():
+        started.set()
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "slow"
+
+    tracker = LatencyTracker()
+    for _ in range(MIN_LATENCY_SAMPLES):
+        tracker.record("openai", "gpt-4o", 5.0)
+    monkeypatch.setattr(hedging, "latency_tracker", tracker)
+    caller = asyncio.ensure_future(ahedged_call("openai", "gpt-4o", slow))
+    await started.wait()
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.wait_for(cancelled.wait(), timeout=0.5)
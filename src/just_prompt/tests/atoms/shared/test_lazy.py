@@ -0,0 +1,117 @@
+"""
+Tests for lazily built values and lazy provider clients.
+"""
+
+import subprocess
+import sys
+import threading
+import json
+import pytest
+from unittest.mock import patch
+from just_prompt.atoms.shared import startup_profile
+from just_prompt.atoms.shared.lazy import Lazy
+from just_prompt.atoms.shared.startup_profile import format_startup_profile, profile_startup
+
+
+def test_built_once_across_threads():
+    """Test that concurrent first uses run the factory once."""
+    calls = []
+    gate = threading.Event()
+
+    def factory():
+        calls.append(1)
+        gate.wait(1)
+        return object()
+
+    lazy = Lazy(factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(lazy.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({id(result) for result in results}) == 1
+
+
+def test_different_values_build_concurrently():
+    """Test that one slow factory doesn't hold up another value's first use."""
+    slow_started = threading.Event()
+    release = threading.Event()
+
+    def slow_factory():
+        slow_started.set()
+        release.wait(2)
+        return "slow"
+
+    slow = Lazy(slow_factory)
+    fast = Lazy(lambda: "fast")
+    thread = threading.Thread(target=slow.get)
+    thread.start()
+    slow_started.wait(1)
+    try:
+        assert fast.get() == "fast"
+        assert not slow.built
+    finally:
+        release.set()
+        thread.join()
+    assert slow.get() == "slow"
+
+
+def test_failed_build_is_retried():
+    """Test that a factory error isn't cached."""
+    attempts = iter([RuntimeError("no key"), "client"])
+
+    def factory():
+        outcome = next(attempts)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    lazy = Lazy(factory)
+    with pytest.raises(RuntimeError):
+        lazy.get()
+    assert not lazy.built
+    assert lazy.get() == "client"
+
+
+def test_provider_modules_defer_sdk_imports():
+    """Test that importing the provider modules loads no SDK."""
+    code = (
+        "import sys\n"
+        "from just_prompt.atoms.llm_providers import openai, anthropic, gemini, groq, deepseek, ollama\n"
+        "print(sorted(m for m in ('openai', 'anthropic', 'google.genai', 'groq', 'ollama') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_format_startup_profile():
+    """Test that profiled steps are laid out as a table with errors appended."""
+    table = format_startup_profile([
+        {"step": "just_prompt.server", "seconds": 0.5, "rss_mib": 30.0, "modules": 400, "error": None},
+        {"step": "openai clients", "seconds": 0.6, "rss_mib": None, "modules": 560, "error": "OpenAIError: no key"},
+    ])
+    lines = table.splitlines()
+    assert lines[0].split() == ["step", "seconds", "rss", "modules"]
+    assert "30.0 MiB" in lines[1]
+    assert lines[2].endswith("OpenAIError: no key")
+    assert " - " in lines[2]
+
+
+def test_profile_startup_keeps_server_row_after_failed_provider():
+    """Test that the server row is reported even when the first provider's profiler fails."""
+    def step(name):
+        return {"step": name, "seconds": 0.1, "rss_mib": None, "modules": 10, "error": None}
+
+    failed = subprocess.CompletedProcess([], 1, stdout="", stderr="Traceback\nImportError: no sdk")
+    succeeded = subprocess.CompletedProcess(
+        [], 0, stdout=json.dumps([step("just_prompt.server"), step("openai"), step("openai clients")]), stderr=""
+    )
+    with patch.object(startup_profile.subprocess, "run", side_effect=[failed, succeeded]):
+        rows = profile_startup(["anthropic", "openai"])
+
+    assert [row["step"] for row in rows] == ["just_prompt.server", "anthropic", "openai", "openai clients"]
+    assert rows[1]["error"] == "ImportError: no sdk"
@@ -0,0 +1,105 @@
+"""
+Tests for the cached model catalogs.
+"""
+
+import json
+import threading
+import time
+from just_prompt.atoms.shared.model_catalog import ModelCatalog, catalog_version
+
+
+class FakeLoader:
+    """Loader returning a fixed model list and counting calls."""
+
+    def __init__(self, models):
+        self.models = models
+        self.calls = 0
+
+    def __call__(self, provider):
+        self.calls += 1
+        return list(self.models)
+
+
+def test_fresh_catalog_served_from_memory():
+    """Test that a fresh catalog is fetched once and then served from memory."""
+    loader = FakeLoader(["gpt-4o", "gpt-4o-mini"])
+    catalog = ModelCatalog(ttl_seconds=60, loader=loader)
+
+    assert catalog.get("openai") == ["gpt-4o", "gpt-4o-mini"]
+    assert catalog.get("openai") == ["gpt-4o", "gpt-4o-mini"]
+    assert loader.calls == 1
+    assert catalog.version("openai") == catalog_version(["gpt-4o-mini", "gpt-4o"])
+    assert catalog.version("anthropic") is None
+
+
+def test_stale_catalog_served_while_refreshing():
+    """Test that a stale catalog is returned at once and refreshed in the background."""
+    loader = FakeLoader(["gpt-4o"])
+    catalog = ModelCatalog(ttl_seconds=0, loader=loader)
+    catalog.get("openai")
+
+    loader.models = ["gpt-4o", "gpt-5"]
+    assert catalog.get("openai") == ["gpt-4o"]
+
+    for _ in range(100):
+        if catalog.get("openai") == ["gpt-4o", "gpt-5"]:
+            break
+        time.sleep(0.01)
+    assert catalog.version("openai") == catalog_version(["gpt-4o", "gpt-5"])
+
+
+def test_empty_catalog_not_cached():
+    """Test that an empty model list is returned but not cached."""
+    loader = FakeLoader([])
+    catalog = ModelCatalog(loader=loader)
+
+    assert catalog.get("openai") == []
+    assert catalog.version("openai") is None
+    catalog.get("openai")
+    assert loader.calls == 2
+
+
+def test_concurrent_first_fetch_is_shared():
+    """Test that concurrent callers of an uncached provider share one fetch."""
+    release = threading.Event()
+
+    def slow_loader(provider):
+        release.wait(1.0)
+        slow_loader.calls += 1
+        return ["claude-3-5-haiku"]
+
+    slow_loader.calls = 0
+    catalog = ModelCatalog(loader=slow_loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(catalog.get("anthropic"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [["claude-3-5-haiku"]] * 5
+    assert slow_loader.calls == 1
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test that catalogs persisted to a snapshot warm a new catalog without fetching."""
+    snapshot = tmp_path / "catalogs.json"
+    catalog = ModelCatalog(snapshot_path=str(snapshot), loader=FakeLoader(["gemini-2.5-pro"]))
+    catalog.get("gemini")
+    assert json.loads(snapshot.read_text())["gemini"]["models"] == ["gemini-2.5-pro"]
+
+    loader = FakeLoader(["unused"])
+    restarted = ModelCatalog(snapshot_path=str(snapshot), loader=loader)
+    assert restarted.get("gemini") == ["gemini-2.5-pro"]
+    assert loader.calls == 0
+
+
+def test_invalidate_forces_fetch():
+    """Test that invalidating a provider makes the next lookup fetch again."""
+    loader = FakeLoader(["deepseek-chat"])
+    catalog = ModelCatalog(loader=loader)
+    catalog.get("deepseek")
+    catalog.invalidate("deepseek")
+    catalog.get("deepseek")
+    assert loader.calls == 2
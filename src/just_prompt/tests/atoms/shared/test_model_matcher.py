@@ -0,0 +1,100 @@
+"""
+Tests for the local model name matcher.
+"""
+
+from unittest.mock import patch, MagicMock
+from just_prompt.atoms.shared.model_catalog import ModelCatalog
+from just_prompt.atoms.shared.model_matcher import (
+    ModelMatcher,
+    alias_key,
+    edit_distance,
+    normalize_model_name,
+)
+from just_prompt.atoms.shared import model_router
+from just_prompt.atoms.shared.model_router import ModelRouter
+
+ANTHROPIC_MODELS = [
+    "claude-3-7-sonnet-20250219",
+    "claude-3-5-sonnet-20241022",
+    "claude-3-5-haiku-20241022",
+    "claude-sonnet-4-20250514",
+    "claude-opus-4-20250514",
+    "claude-3-opus-latest",
+]
+
+
+def test_normalization_and_aliases():
+    """Test name normalization and alias rules."""
+    assert normalize_model_name(" Claude_3.5 Sonnet ") == "claude-3-5-sonnet"
+    assert normalize_model_name("models/gemini-2.5-pro") == "gemini-2-5-pro"
+    assert alias_key("claude-3-7-sonnet-20250219") == "claude-3-7-sonnet"
+    assert alias_key("gpt-4o-2024-08-06") == "gpt-4o"
+    assert alias_key("claude-3-opus-latest") == "claude-3-opus"
+    assert edit_distance("sonet", "sonnet") == 1
+
+
+def test_confident_matches():
+    """Test that near misses resolve locally with high confidence."""
+    matcher = ModelMatcher(ANTHROPIC_MODELS)
+    for name, expected in [
+        ("claude-3.7-sonnet", "claude-3-7-sonnet-20250219"),
+        ("claude-3-7-sonnet-latest", "claude-3-7-sonnet-20250219"),
+        ("3.7-sonnet", "claude-3-7-sonnet-20250219"),
+        ("claude-3-5-sonet", "claude-3-5-sonnet-20241022"),
+        ("claude-3-opus", "claude-3-opus-latest"),
+    ]:
+        result = matcher.match(name)
+        assert result.model == expected, name
+        assert result.confidence >= 0.8, name
+
+
+def test_alias_prefers_undated_model():
+    """Test that a bare alias resolves to the undated model rather than a snapshot."""
+    matcher = ModelMatcher(["gpt-4o-2024-08-06", "gpt-4o", "gpt-4o-mini"])
+    assert matcher.match("gpt4o").model == "gpt-4o"
+
+
+def test_ambiguous_names_have_low_confidence():
+    """Test that names the matcher can't decide get a low confidence."""
+    matcher = ModelMatcher(ANTHROPIC_MODELS)
+    assert matcher.match("opus").confidence < 0.8
+    # Reordered tokens are left to the correction model
+    assert matcher.match("sonnet.3.7").confidence < 0.8
+    assert matcher.match("gemini-pro").confidence < 0.8
+
+
+def test_tokens_must_match_in_order():
+    """Test that other models sharing a name's tokens aren't confident matches."""
+    matcher = ModelMatcher(["gpt-4o-mini", "gpt-4o", "o3-mini", "gpt-4.1"])
+    assert matcher.match("o4-mini").confidence < 0.8
+    assert matcher.match("o3").confidence < 0.8
+    assert matcher.match("4o-mini").model == "gpt-4o-mini"
+
+
+@patch("importlib.import_module")
+def test_correction_uses_local_match(mock_import_module):
+    """Test that a confident local match skips the correction model and keeps suffixes."""
+    catalog = ModelCatalog(loader=lambda provider: ANTHROPIC_MODELS)
+    correction_module = MagicMock()
+    mock_import_module.return_value = correction_module
+
+    # patch.object: a string target would be resolved through the mocked import_module
+    with patch.object(model_router, "get_model_catalog", return_value=catalog):
+        corrected = ModelRouter.magic_model_correction("anthropic", "claude-3.7-sonnet:4k", "openai:gpt-4o")
+
+    assert corrected == "claude-3-7-sonnet-20250219:4k"
+    correction_module.prompt.assert_not_called()
+
+
+@patch("importlib.import_module")
+def test_correction_keeps_ollama_tags(mock_import_module):
+    """Test that an ollama name:tag model is matched whole rather than split at the tag."""
+    catalog = ModelCatalog(loader=lambda provider: ["llama3:8b", "llama3:70b", "mistral:7b"])
+    correction_module = MagicMock()
+    mock_import_module.return_value = correction_module
+
+    with patch.object(model_router, "get_model_catalog", return_value=catalog):
+        corrected = ModelRouter.magic_model_correction("ollama", "Llama3:8B", "openai:gpt-4o")
+
+    assert corrected == "llama3:8b"
+    correction_module.prompt.assert_not_called()
@@ -4,10 +4,13 @@ Tests for model router.
 
 import pytest
 import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import importlib
+from just_prompt.atoms.shared import model_router
+from just_prompt.atoms.shared.model_catalog import ModelCatalog
 from just_prompt.atoms.shared.model_router import ModelRouter
 from just_prompt.atoms.shared.data_types import ModelProviders
+from just_prompt.atoms.shared.utils import parse_model_spec
 
 
 @patch('importlib.import_module')
@@ -21,18 +24,41 @@ def test_route_prompt(mock_import_module):
     # Test with full provider name
     response = ModelRouter.route_prompt("openai:gpt-4o-mini", "What is the capital of France?")
     assert response == "Paris is the capital of France."
-    mock_import_module.assert_called_with("just_prompt.atoms.llm_providers.openai")
-    mock_module.prompt.assert_called_with("What is the capital of France?", "gpt-4o-mini")
+    mock_import_module.assert_any_call("just_prompt.atoms.llm_providers.openai")
+    mock_module.prompt.assert_called_with("What is the capital of France?", parse_model_spec("openai:gpt-4o-mini"))
     
     # Test with short provider name
     response = ModelRouter.route_prompt("o:gpt-4o-mini", "What is the capital of France?")
     assert response == "Paris is the capital of France."
     
+    # The provider module is imported once, not per request
+    openai_imports = [
+        call for call in mock_import_module.call_args_list
+        if call.args == ("just_prompt.atoms.llm_providers.openai",)
+    ]
+    assert len(openai_imports) == 1
+    
     # Test invalid provider
     with pytest.raises(ValueError):
         ModelRouter.route_prompt("unknown:model", "What is the capital of France?")
 
 
+@patch('importlib.import_module')
+async def test_aroute_prompt(mock_import_module):
+    """Test routing prompts to a provider's async adapter."""
+    mock_module = MagicMock()
+    mock_module.aprompt = AsyncMock(return_value="Paris is the capital of France.")
+    mock_import_module.return_value = mock_module
+    
+    response = await ModelRouter.aroute_prompt("o:gpt-4o-mini", "What is the capital of France?")
+    assert response == "Paris is the capital of France."
+    mock_module.aprompt.assert_awaited_with("What is the capital of France?", parse_model_spec("openai:gpt-4o-mini"))
+    
+    # Test invalid provider
+    with pytest.raises(ValueError):
+        await ModelRouter.aroute_prompt("unknown:model", "What is the capital of France?")
+
+
 @patch('importlib.import_module')
 def test_route_list_models(mock_import_module):
     """Test routing list_models requests to the appropriate provider."""
@@ -78,3 +104,20 @@ def test_validate_and_correct_model_shorthand():
         pytest.fail(f"Test failed with error: {e}")
 
 
+@patch('importlib.import_module')
+def test_correction_model_gets_model_spec(mock_import_module):
+    """Test that the correction model is called with a ModelSpec, like every other routed prompt."""
+    catalog = ModelCatalog(loader=lambda provider: ["claude-sonnet-4-20250514", "claude-opus-4-20250514"])
+    correction_module = MagicMock()
+    correction_module.prompt.return_value = "claude-sonnet-4-20250514\n"
+    mock_import_module.return_value = correction_module
+
+    with patch.object(model_router, "get_model_catalog", return_value=catalog), \
+            patch.dict(os.environ, {"CORRECTION_MODEL": "openai:o4-mini:high"}):
+        # A misspelling of the thinking model gets no special treatment
+        result = ModelRouter.validate_and_correct_model("anthropic", "claude-3-7-sonnet-20250219-typo")
+
+    assert result == "claude-sonnet-4-20250514"
+    model_arg = correction_module.prompt.call_args[0][1]
+    assert model_arg == parse_model_spec("openai:o4-mini:high")
+    assert model_arg.reasoning_effort == "high"
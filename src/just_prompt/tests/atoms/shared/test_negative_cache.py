@@ -0,0 +1,108 @@
+"""
+Tests for the negative cache of permanent failures.
+"""
+
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+from just_prompt.atoms.shared.negative_cache import (
+    NegativeCache,
+    KnownFailureError,
+    AUTH_FAILED,
+    NOT_FOUND,
+    PERMISSION_DENIED,
+    negative_cache,
+)
+from just_prompt.atoms.shared.circuit_breaker import reset_circuit_breakers
+from just_prompt.atoms.shared.model_router import ModelRouter
+from just_prompt.atoms.shared.validator import validate_provider_api_keys
+from just_prompt.molecules.list_providers import list_providers
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    """Start every test without remembered failures or open breakers."""
+    negative_cache.clear()
+    reset_circuit_breakers()
+    yield
+    negative_cache.clear()
+    reset_circuit_breakers()
+
+
+class NotFoundError(Exception):
+    status_code = 404
+
+
+class PermissionDeniedError(Exception):
+    status_code = 403
+
+
+def test_entries_scoped_and_expire():
+    """Test that unknown models are per model, auth failures per provider, and both expire."""
+    cache = NegativeCache()
+    cache.record("openai", "gpt-5o", NOT_FOUND, "no such model", now=0)
+    cache.record("groq", "llama3", AUTH_FAILED, "bad key", now=0)
+
+    with pytest.raises(KnownFailureError, match="no such model"):
+        cache.raise_if_known("openai", "gpt-5o", now=1)
+    cache.raise_if_known("openai", "gpt-4o", now=1)
+    assert cache.lookup("groq", "mixtral", now=1).kind == AUTH_FAILED
+
+    assert cache.lookup("groq", "mixtral", now=61) is None
+    assert cache.lookup("openai", "gpt-5o", now=299).kind == NOT_FOUND
+    assert cache.lookup("openai", "gpt-5o", now=300) is None
+
+
+def test_unconfigured_providers_fail_fast():
+    """Test that providers found without a key fail without importing their module."""
+    with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}, clear=True):
+        validate_provider_api_keys()
+
+    with patch("importlib.import_module") as mock_import:
+        with pytest.raises(KnownFailureError, match="ANTHROPIC_API_KEY"):
+            ModelRouter.route_prompt("anthropic:claude-3-5-haiku", "hi")
+    mock_import.assert_not_called()
+    assert negative_cache.lookup("openai", "gpt-4o") is None
+    # Ollama works without OLLAMA_HOST
+    assert negative_cache.lookup("ollama", "llama3") is None
+
+
+@patch.object(ModelRouter, "validate_and_correct_model", side_effect=lambda p, m: m)
+@patch("importlib.import_module")
+def test_router_remembers_unknown_model(mock_import, mock_validate):
+    """Test that a 404 is remembered and the repeat skips validation and the provider."""
+    failing = MagicMock(side_effect=NotFoundError("model gpt-5o does not exist"))
+    mock_import.return_value = MagicMock(prompt=failing)
+
+    with pytest.raises(NotFoundError):
+        ModelRouter.route_prompt("openai:gpt-5o", "hi")
+    with pytest.raises(KnownFailureError, match="not found"):
+        ModelRouter.route_prompt("openai:gpt-5o", "hi again")
+
+    assert failing.call_count == 1
+    assert mock_validate.call_count == 1
+    assert ModelRouter.magic_model_correction("openai", "gpt-5o", "anthropic:claude-3-5-haiku") == "gpt-5o"
+
+    openai = next(p for p in list_providers() if p["full_name"] == "openai")
+    assert openai["known_failures"][0]["model"] == "gpt-5o"
+    assert openai["known_failures"][0]["kind"] == NOT_FOUND
+
+
+@patch.object(ModelRouter, "validate_and_correct_model", side_effect=lambda p, m: m)
+@patch("importlib.import_module")
+def test_permission_error_only_blocks_its_model(mock_import, mock_validate):
+    """Test that a 403 for one model is remembered for that model, not the whole provider."""
+    def prompt(text, model):
+        if model.model == "claude-opus-4":
+            raise PermissionDeniedError("model not permitted")
+        return "ok"
+    mock_import.return_value = MagicMock(prompt=MagicMock(side_effect=prompt))
+
+    with pytest.raises(PermissionDeniedError):
+        ModelRouter.route_prompt("anthropic:claude-opus-4", "hi")
+    with pytest.raises(KnownFailureError, match="permission denied"):
+        ModelRouter.route_prompt("anthropic:claude-opus-4", "hi again")
+
+    assert negative_cache.lookup("anthropic", "claude-opus-4").kind == PERMISSION_DENIED
+    assert negative_cache.lookup("anthropic", "claude-3-5-haiku") is None
+    assert ModelRouter.route_prompt("anthropic:claude-3-5-haiku", "hi") == "ok"
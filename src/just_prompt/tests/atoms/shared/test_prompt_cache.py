@@ -0,0 +1,67 @@
+"""
+Tests for stable-prefix prompts and prompt cache reporting.
+"""
+
+from types import SimpleNamespace
+from just_prompt.atoms.shared.call_context import CallContext, call_context
+from just_prompt.atoms.shared.prompt_cache import CacheablePrompt, format_cacheable
+from just_prompt.atoms.llm_providers import anthropic as anthropic_provider
+from just_prompt.atoms.llm_providers import openai as openai_provider
+from just_prompt.molecules.ceo_and_board_prompt import DEFAULT_CEO_DECISION_PROMPT
+from just_prompt.molecules.business_analyst_prompt import CONSOLIDATION_PROMPT
+
+
+def test_format_cacheable_splits_at_first_placeholder():
+    """Test that the static text before the first placeholder becomes the prefix."""
+    text = format_cacheable("Rules {{strict}}.\n<q>{question}</q>\n<a>{answers}</a>", question="Why?", answers="42")
+    assert text == "Rules {strict}.\n<q>Why?</q>\n<a>42</a>"
+    assert text.prefix == "Rules {strict}.\n<q>"
+    assert text.suffix == "Why?</q>\n<a>42</a>"
+
+
+def test_templates_have_stable_prefixes():
+    """Test that the same instructions prefix every run of the CEO and consolidation templates."""
+    first = format_cacheable(DEFAULT_CEO_DECISION_PROMPT, original_prompt="A", board_responses="B")
+    second = format_cacheable(DEFAULT_CEO_DECISION_PROMPT, original_prompt="C", board_responses="D")
+    assert first.prefix == second.prefix
+    assert "</instructions>" in first.prefix
+
+    consolidation = format_cacheable(CONSOLIDATION_PROMPT, original_prompt="my idea", individual_briefs="briefs")
+    assert "</output_format>" in consolidation.prefix
+    assert consolidation.suffix.startswith("my idea")
+
+
+def test_anthropic_message_marks_cache_breakpoint():
+    """Test that Anthropic requests put a cache breakpoint after the stable prefix."""
+    instructions = "static instructions\n" * 300
+    message = anthropic_provider._user_message(CacheablePrompt(instructions + "question", len(instructions)))
+    assert message["content"][0] == {
+        "type": "text",
+        "text": instructions,
+        "cache_control": {"type": "ephemeral"},
+    }
+    assert message["content"][1] == {"type": "text", "text": "question"}
+    assert anthropic_provider._user_message("plain") == {"role": "user", "content": "plain"}
+
+
+def test_anthropic_skips_breakpoint_for_short_prefix():
+    """Test that a prefix under Anthropic's cacheable minimum, like the CEO template's, is sent as plain text."""
+    ceo_prompt = format_cacheable(DEFAULT_CEO_DECISION_PROMPT, original_prompt="A", board_responses="B")
+    assert anthropic_provider._user_message(ceo_prompt) == {"role": "user", "content": str(ceo_prompt)}
+
+
+def test_cache_reads_recorded_in_call_context():
+    """Test that cached input tokens reported by providers reach the call context."""
+    anthropic_message = SimpleNamespace(
+        usage=SimpleNamespace(input_tokens=50, cache_read_input_tokens=1500, cache_creation_input_tokens=0)
+    )
+    openai_response = SimpleNamespace(
+        usage=SimpleNamespace(prompt_tokens=2000, prompt_tokens_details=SimpleNamespace(cached_tokens=0))
+    )
+    with call_context(CallContext()) as context:
+        anthropic_provider._record_usage("claude-3-7-sonnet-20250219", anthropic_message)
+        openai_provider._record_usage("gpt-4o", openai_response)
+
+    assert context.prompt_cache_reads == [
+        {"model": "anthropic:claude-3-7-sonnet-20250219", "cached_tokens": 1500, "input_tokens": 1550}
+    ]
@@ -0,0 +1,81 @@
+"""
+Tests for the provider registry.
+"""
+
+import sys
+import types
+from importlib.metadata import EntryPoint
+from unittest.mock import patch
+
+import pytest
+from just_prompt.atoms.shared import provider_registry
+from just_prompt.atoms.shared.model_router import ModelRouter
+from just_prompt.atoms.shared.provider_registry import (
+    ENTRY_POINT_GROUP,
+    ProviderHandle,
+    ProviderRegistry,
+    get_provider_registry,
+)
+from just_prompt.atoms.shared.utils import parse_model_spec
+
+
+@pytest.fixture
+def echo_plugin(monkeypatch):
+    """Install a plugin provider module through a fake entry point, in a fresh registry."""
+    module = types.ModuleType("just_prompt_echo_plugin")
+    module.prompt = lambda text, model: f"{model}: {text}"
+    module.list_models = lambda: ["echo-1"]
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    entry_point = EntryPoint(name="echo", value=module.__name__, group=ENTRY_POINT_GROUP)
+    monkeypatch.setattr(provider_registry, "_registry", None)
+    with patch.object(provider_registry, "entry_points", return_value=[entry_point]):
+        registry = get_provider_registry()
+    return registry
+
+
+def test_builtin_providers_by_full_and_short_name():
+    """Test that built-in providers are found by either name and share one handle."""
+    registry = get_provider_registry()
+
+    handle = registry.resolve("openai")
+    assert registry.get("o") is handle
+    assert handle.module_path == "just_prompt.atoms.llm_providers.openai"
+    assert registry.get("unknown") is None
+    with pytest.raises(ValueError):
+        registry.resolve("unknown")
+
+
+def test_module_imported_once():
+    """Test that a handle imports its module on first use only."""
+    calls = []
+    handle = ProviderHandle("fake", "fake.module", loader=lambda: calls.append(1) or "module")
+
+    assert not handle.loaded
+    assert handle.module == "module"
+    assert handle.module == "module"
+    assert calls == [1]
+
+    handle.reset()
+    assert handle.module == "module"
+    assert calls == [1, 1]
+
+
+def test_name_conflicts_rejected():
+    """Test that a provider can't take a name another provider already uses."""
+    registry = ProviderRegistry()
+    registry.register(ProviderHandle("openai", "a.module", short_name="o"))
+
+    with pytest.raises(ValueError):
+        registry.register(ProviderHandle("other", "b.module", short_name="o"))
+    assert registry.get("other") is None
+    assert [handle.full_name for handle in registry.providers()] == ["openai"]
+
+
+def test_entry_point_provider_routed(echo_plugin):
+    """Test that a provider installed through an entry point is parsed and routed like a built-in one."""
+    assert echo_plugin.resolve("echo").source == "just_prompt_echo_plugin"
+    assert not echo_plugin.resolve("echo").loaded
+    assert parse_model_spec("echo:echo-1").provider == "echo"
+
+    assert ModelRouter.route_prompt("echo:echo-1", "hello") == "echo-1: hello"
+    assert ModelRouter.route_list_models("echo") == ["echo-1"]
@@ -0,0 +1,135 @@
+"""
+Tests for the adaptive rate limiter.
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+from just_prompt.atoms.shared import rate_limiter
+from just_prompt.atoms.shared.deadline import deadline_scope
+from just_prompt.atoms.shared.rate_limiter import (
+    TokenBucket,
+    RateLimiter,
+    parse_reset,
+    estimate_tokens,
+    get_rate_limiter,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters():
+    """Start each test without learned limits."""
+    rate_limiter.reset_rate_limiters()
+    yield
+    rate_limiter.reset_rate_limiters()
+
+
+def test_parse_reset():
+    """Test parsing OpenAI-style durations and Anthropic timestamps."""
+    assert parse_reset("1s") == 1.0
+    assert parse_reset("6m0s") == 360.0
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("2m59.5s") == pytest.approx(179.5)
+    assert parse_reset("12") == 12.0
+    assert parse_reset("2000-01-01T00:00:00Z") == 0.0
+    assert parse_reset(None) is None
+    assert parse_reset("soon") is None
+
+
+def test_estimate_tokens():
+    """Test the rough token estimate."""
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("a" * 400) == 100
+
+
+def test_unknown_limits_never_wait():
+    """Test that a bucket without learned limits lets everything through."""
+    bucket = TokenBucket()
+    assert all(bucket.reserve(1000, now=0.0) == 0.0 for _ in range(100))
+
+
+def test_bucket_paces_once_exhausted():
+    """Test that reservations beyond capacity are paced by the refill rate."""
+    bucket = TokenBucket(capacity=60)  # one per second
+    for _ in range(60):
+        assert bucket.reserve(1, now=0.0) == 0.0
+
+    assert bucket.reserve(1, now=0.0) == pytest.approx(1.0)
+    assert bucket.reserve(1, now=0.0) == pytest.approx(2.0)
+
+
+def test_limiter_learns_openai_headers():
+    """Test that OpenAI-style headers set the limits and current budget."""
+    limiter = RateLimiter("openai")
+    limiter.observe_headers({
+        "x-ratelimit-limit-requests": "60",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2s",
+        "x-ratelimit-limit-tokens": "100000",
+        "x-ratelimit-remaining-tokens": "99000",
+        "x-ratelimit-reset-tokens": "1s",
+    })
+
+    assert limiter.requests.capacity == 60
+    assert limiter.tokens.capacity == 100000
+    # No requests remain, so the next one waits for the reset
+    assert limiter.reserve(10) > 1.0
+
+
+def test_limiter_learns_anthropic_headers():
+    """Test that anthropic-ratelimit-* headers are recognised."""
+    limiter = RateLimiter("anthropic")
+    limiter.observe_headers({
+        "anthropic-ratelimit-requests-limit": "50",
+        "anthropic-ratelimit-requests-remaining": "49",
+        "anthropic-ratelimit-requests-reset": "2999-01-01T00:00:00Z",
+        "anthropic-ratelimit-tokens-limit": "40000",
+        "anthropic-ratelimit-tokens-remaining": "40000",
+        "anthropic-ratelimit-tokens-reset": "2999-01-01T00:00:00Z",
+    })
+
+    assert limiter.requests.capacity == 50
+    assert limiter.tokens.capacity == 40000
+    assert limiter.reserve(10) == 0.0
+
+
+def test_limiters_are_keyed_by_provider_and_api_key():
+    """Test that each provider/API key pair gets its own limiter."""
+    with patch.dict(os.environ, {"OPENAI_API_KEY": "key-one"}):
+        first = get_rate_limiter("openai")
+        assert get_rate_limiter("openai") is first
+        assert get_rate_limiter("groq") is not first
+
+    with patch.dict(os.environ, {"OPENAI_API_KEY": "key-two"}):
+        assert get_rate_limiter("openai") is not first
+
+
+@patch("just_prompt.atoms.shared.rate_limiter.time.sleep")
+def test_acquire_sleeps_when_paced(mock_sleep):
+    """Test that acquire blocks for the computed wait."""
+    get_rate_limiter("groq").observe_headers({
+        "x-ratelimit-limit-requests": "60",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "3s",
+    })
+
+    waited = rate_limiter.acquire("groq", "hello")
+
+    assert waited > 2.0
+    mock_sleep.assert_called_once_with(waited)
+
+
+@patch("just_prompt.atoms.shared.rate_limiter.time.sleep")
+def test_acquire_never_waits_past_deadline(mock_sleep):
+    """Test that pacing stops at the deadline instead of sleeping past it."""
+    get_rate_limiter("deepseek").observe_headers({
+        "x-ratelimit-limit-requests": "60",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "30s",
+    })
+
+    with deadline_scope(0.5):
+        waited = rate_limiter.acquire("deepseek", "hello")
+
+    assert 0 < waited <= 0.5
+    mock_sleep.assert_called_once_with(waited)
@@ -0,0 +1,103 @@
+"""
+Tests for the response cache.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from just_prompt.atoms.shared.call_context import CallContext, call_context
+from just_prompt.atoms.shared.response_cache import (
+    ResponseCache,
+    configure_response_cache,
+    response_cache_key,
+    validate_cache_mode,
+)
+from just_prompt.atoms.shared.model_router import ModelRouter
+
+
+@pytest.fixture
+def memory_cache():
+    """Enable a memory-only response cache, with model names taken as given."""
+    cache = configure_response_cache(":memory:")
+    with patch.object(ModelRouter, "validate_and_correct_model", side_effect=lambda provider, model: model):
+        yield cache
+    configure_response_cache(None)
+
+
+def test_key_separates_suffix_and_text():
+    """Test that the key changes with the model, its reasoning suffix and the prompt."""
+    key = response_cache_key("openai", "o3-mini:high", "hi")
+    assert key == response_cache_key("openai", "o3-mini:high", "hi")
+    assert key != response_cache_key("openai", "o3-mini:low", "hi")
+    assert key != response_cache_key("openai", "o3-mini", "hi")
+    assert key != response_cache_key("openai", "o3-mini:high", "hi!")
+
+
+def test_memory_lru_and_ttl():
+    """Test that the memory tier evicts least recently used and expired entries."""
+    cache = ResponseCache(max_memory_entries=2)
+    cache.put("a", "openai", "gpt-4o", "A")
+    cache.put("b", "openai", "gpt-4o", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "openai", "gpt-4o", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+    cache.ttl_seconds = 0
+    with patch("just_prompt.atoms.shared.response_cache.time.time", return_value=10**12):
+        assert cache.get("a") is None
+
+
+def test_disk_tier_survives_restart_and_is_capped(tmp_path):
+    """Test that the SQLite tier persists responses and keeps at most its size cap."""
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(path, max_disk_entries=2)
+    for key in ["a", "b", "c"]:
+        cache.put(key, "openai", "gpt-4o", key.upper())
+
+    restarted = ResponseCache(path)
+    assert restarted.get("a") is None
+    assert restarted.get("b") == "B"
+    assert restarted.get("c") == "C"
+
+
+def test_invalid_cache_mode():
+    """Test that unknown cache modes are rejected."""
+    assert validate_cache_mode(None) == "use"
+    with pytest.raises(ValueError, match="cache must be one of"):
+        validate_cache_mode("sometimes")
+
+
+@patch("importlib.import_module")
+def test_route_prompt_cache_modes(mock_import_module, memory_cache):
+    """Test use, refresh and bypass modes around route_prompt."""
+    mock_module = MagicMock()
+    mock_module.prompt.side_effect = ["first", "second", "third"]
+    mock_import_module.return_value = mock_module
+
+    with call_context(CallContext()) as context:
+        assert ModelRouter.route_prompt("openai:gpt-4o", "Hello") == "first"
+        assert ModelRouter.route_prompt("openai:gpt-4o", "Hello") == "first"
+        assert context.cache_hits == ["openai:gpt-4o"]
+
+    with call_context(CallContext(cache_mode="refresh")) as context:
+        assert ModelRouter.route_prompt("openai:gpt-4o", "Hello") == "second"
+        assert context.cache_hits == []
+
+    with call_context(CallContext(cache_mode="bypass")):
+        assert ModelRouter.route_prompt("openai:gpt-4o", "Hello") == "third"
+
+    with call_context(CallContext()):
+        assert ModelRouter.route_prompt("openai:gpt-4o", "Hello") == "second"
+    assert mock_module.prompt.call_count == 3
+
+
+@patch("importlib.import_module")
+def test_failures_are_not_cached(mock_import_module, memory_cache):
+    """Test that a failed call leaves nothing in the cache."""
+    mock_module = MagicMock()
+    mock_module.prompt.side_effect = [ValueError("invalid request"), "ok"]
+    mock_import_module.return_value = mock_module
+
+    with pytest.raises(ValueError):
+        ModelRouter.route_prompt("openai:gpt-4o", "Hello")
+    assert ModelRouter.route_prompt("openai:gpt-4o", "Hello") == "ok"
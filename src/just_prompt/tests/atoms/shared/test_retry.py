@@ -0,0 +1,135 @@
+"""
+Tests for the retry engine.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from just_prompt.atoms.shared.retry import (
+    classify_error,
+    call_with_retry,
+    acall_with_retry,
+    RetryBudget,
+    RetryPolicy,
+)
+
+
+class FakeStatusError(Exception):
+    """Mimics an SDK status error with a response carrying headers."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = MagicMock(headers=headers or {})
+
+
+class APIConnectionError(Exception):
+    """Named like the OpenAI/Anthropic SDK connection error."""
+
+
+def wrapped(error):
+    """Wrap an error the way provider modules do."""
+    try:
+        raise error
+    except Exception as e:
+        try:
+            raise ValueError(f"Failed to get response: {e}") from e
+        except ValueError as wrapped_error:
+            return wrapped_error
+
+
+def test_classify_error():
+    """Test classification through the provider's ValueError wrapper."""
+    rate_limited = classify_error(wrapped(FakeStatusError(429, {"retry-after": "7"})))
+    assert rate_limited.kind == "rate_limited"
+    assert rate_limited.retryable
+    assert rate_limited.retry_after == 7.0
+
+    overloaded = classify_error(wrapped(FakeStatusError(529, {"retry-after-ms": "1500"})))
+    assert overloaded.kind == "overloaded"
+    assert overloaded.retry_after == 1.5
+
+    assert classify_error(wrapped(FakeStatusError(502))).retryable
+    assert classify_error(wrapped(APIConnectionError("reset"))).kind == "connection"
+
+    auth = classify_error(wrapped(FakeStatusError(401)))
+    assert auth.kind == "auth_failed"
+    assert not auth.retryable
+
+    forbidden = classify_error(wrapped(FakeStatusError(403)))
+    assert forbidden.kind == "permission_denied"
+    assert not forbidden.retryable
+
+    assert classify_error(wrapped(FakeStatusError(404))).kind == "not_found"
+    assert not classify_error(ValueError("No text content found in response")).retryable
+
+
+@patch("just_prompt.atoms.shared.retry.time.sleep")
+def test_retries_transient_errors(mock_sleep):
+    """Test that transient errors are retried until success."""
+    func = MagicMock(side_effect=[wrapped(FakeStatusError(503)), wrapped(FakeStatusError(500)), "ok"])
+
+    assert call_with_retry(func, "a", policy=RetryPolicy(max_attempts=3)) == "ok"
+    assert func.call_count == 3
+    assert mock_sleep.call_count == 2
+
+
+@patch("just_prompt.atoms.shared.retry.time.sleep")
+def test_does_not_retry_permanent_errors(mock_sleep):
+    """Test that non-retryable errors are raised immediately."""
+    func = MagicMock(side_effect=wrapped(FakeStatusError(400)))
+
+    with pytest.raises(ValueError):
+        call_with_retry(func)
+    assert func.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+@patch("just_prompt.atoms.shared.retry.time.sleep")
+def test_honours_retry_after(mock_sleep):
+    """Test that the server's Retry-After hint sets the delay."""
+    func = MagicMock(side_effect=[wrapped(FakeStatusError(429, {"retry-after": "3"})), "ok"])
+
+    call_with_retry(func)
+    mock_sleep.assert_called_once_with(3.0)
+
+
+@patch("just_prompt.atoms.shared.retry.time.sleep")
+def test_retry_budget_caps_attempts(mock_sleep):
+    """Test that a shared retry budget stops retries across calls."""
+    budget = RetryBudget(max_retries=1)
+    failing = MagicMock(side_effect=wrapped(FakeStatusError(503)))
+
+    with pytest.raises(ValueError):
+        call_with_retry(failing, budget=budget, policy=RetryPolicy(max_attempts=5))
+    # One retry spent, then the budget is empty
+    assert failing.call_count == 2
+    assert budget.remaining == 0
+
+    failing.reset_mock()
+    with pytest.raises(ValueError):
+        call_with_retry(failing, budget=budget, policy=RetryPolicy(max_attempts=5))
+    assert failing.call_count == 1
+
+
+def test_backoff_is_jittered_and_capped():
+    """Test exponential backoff bounds."""
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    no_hint = classify_error(FakeStatusError(500))
+    for attempt in range(1, 10):
+        delay = policy.delay_for(attempt, no_hint)
+        assert 0 <= delay <= min(4.0, 2 ** (attempt - 1))
+
+
+@patch("just_prompt.atoms.shared.retry.asyncio.sleep")
+async def test_async_retry(mock_sleep):
+    """Test the async retry wrapper."""
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise wrapped(FakeStatusError(529))
+        return "ok"
+
+    assert await acall_with_retry(flaky) == "ok"
+    assert len(calls) == 2
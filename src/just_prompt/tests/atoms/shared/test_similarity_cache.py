@@ -0,0 +1,89 @@
+"""
+Tests for near-duplicate prompt lookup.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from just_prompt.atoms.shared.call_context import CallContext, call_context
+from just_prompt.atoms.shared.model_router import ModelRouter
+from just_prompt.atoms.shared.response_cache import configure_response_cache
+from just_prompt.atoms.shared.similarity_cache import (
+    SimilarityIndex,
+    configure_similarity_cache,
+    estimated_similarity,
+    minhash_signature,
+)
+
+PROMPT = " ".join(f"Consider point {i} of the quarterly plan and explain its risks." for i in range(20))
+
+
+def test_signature_ignores_formatting():
+    """Test that whitespace and case changes don't change the signature."""
+    assert minhash_signature(PROMPT) == minhash_signature("  " + PROMPT.upper().replace(" ", "\n"))
+
+
+def test_similarity_estimates():
+    """Test that a small edit stays similar and unrelated text does not."""
+    edited = "Date: 2025-03-01\n" + PROMPT
+    assert estimated_similarity(minhash_signature(PROMPT), minhash_signature(edited)) >= 0.9
+    assert estimated_similarity(minhash_signature(PROMPT), minhash_signature("Write a haiku about the sea")) < 0.2
+
+
+def test_index_scoped_and_bounded():
+    """Test that matches stay within a scope and the index evicts old entries."""
+    index = SimilarityIndex(threshold=0.8, max_entries=2)
+    index.add("openai:gpt-4o", "k1", PROMPT)
+    assert index.lookup("openai:gpt-4o", "k2", PROMPT + " Thanks.")[0] == "k1"
+    assert index.lookup("anthropic:claude-3-7-sonnet", "k3", PROMPT) is None
+
+    index.add("openai:gpt-4o", "k4", "Write a haiku about the sea")
+    index.add("openai:gpt-4o", "k5", "Summarize the meeting notes")
+    assert len(index) == 2
+    assert index.lookup("openai:gpt-4o", "k6", PROMPT) is None
+
+
+def test_index_persists(tmp_path):
+    """Test that signatures are reloaded from the response cache file."""
+    path = str(tmp_path / "responses.sqlite3")
+    SimilarityIndex(threshold=0.8, path=path).add("openai:gpt-4o", "k1", PROMPT)
+    assert SimilarityIndex(threshold=0.8, path=path).lookup("openai:gpt-4o", "k2", PROMPT + " Thanks.")[0] == "k1"
+
+
+@pytest.fixture
+def near_duplicate_cache():
+    """Enable the response cache with near-duplicate lookup, taking model names as given."""
+    configure_response_cache(":memory:")
+    index = configure_similarity_cache(0.8)
+    with patch.object(ModelRouter, "validate_and_correct_model", side_effect=lambda provider, model: model):
+        yield index
+    configure_similarity_cache(None)
+    configure_response_cache(None)
+
+
+@patch("importlib.import_module")
+def test_near_duplicate_served(mock_import_module, near_duplicate_cache):
+    """Test that a near-duplicate prompt is answered from the cache and reported."""
+    mock_module = MagicMock()
+    mock_module.prompt.side_effect = ["plan review", "fresh"]
+    mock_import_module.return_value = mock_module
+
+    ModelRouter.route_prompt("openai:gpt-4o", PROMPT)
+    with call_context(CallContext()) as context:
+        assert ModelRouter.route_prompt("openai:gpt-4o", "Date: 2025-03-01\n" + PROMPT) == "plan review"
+    assert context.cache_hits[0].startswith("openai:gpt-4o (similar prompt")
+    assert mock_module.prompt.call_count == 1
+
+
+@patch("importlib.import_module")
+def test_near_duplicate_offered(mock_import_module, near_duplicate_cache):
+    """Test that in offer mode the model is called and the cached answer is reported."""
+    near_duplicate_cache.action = "offer"
+    mock_module = MagicMock()
+    mock_module.prompt.side_effect = ["plan review", "fresh"]
+    mock_import_module.return_value = mock_module
+
+    ModelRouter.route_prompt("openai:gpt-4o", PROMPT)
+    with call_context(CallContext()) as context:
+        assert ModelRouter.route_prompt("openai:gpt-4o", "Date: 2025-03-01\n" + PROMPT) == "fresh"
+    assert context.cache_hits == []
+    assert context.similar_matches[0].endswith(": plan review")
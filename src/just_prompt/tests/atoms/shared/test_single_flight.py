@@ -0,0 +1,121 @@
+"""
+Tests for coalescing identical in-flight requests.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from just_prompt.atoms.shared.deadline import DeadlineExceeded, deadline_scope
+from just_prompt.atoms.shared.single_flight import SingleFlight, independent_requests, requests_are_independent
+
+
+def test_concurrent_identical_calls_share_one_request():
+    """Test that callers arriving while a request is in flight receive its result."""
+    flight = SingleFlight()
+    calls = []
+    
+    def request():
+        calls.append(1)
+        time.sleep(0.2)
+        return "shared"
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", request))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    
+    assert results == ["shared"] * 4
+    assert len(calls) == 1
+    
+    # Once finished, the next call makes a new request
+    assert flight.do("key", request) == "shared"
+    assert len(calls) == 2
+
+
+def test_errors_are_shared_except_leader_deadline():
+    """Test that followers share request errors but retry after the leader's own deadline."""
+    flight = SingleFlight()
+    started = threading.Event()
+    
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("bad request")
+    
+    errors = []
+    
+    def follower():
+        started.wait()
+        try:
+            flight.do("key", lambda: "unused")
+        except ValueError as e:
+            errors.append(str(e))
+    
+    thread = threading.Thread(target=follower)
+    thread.start()
+    with pytest.raises(ValueError):
+        flight.do("key", failing)
+    thread.join()
+    assert errors == ["bad request"]
+    
+    def timed_out():
+        started.set()
+        time.sleep(0.1)
+        raise DeadlineExceeded("leader ran out of time")
+    
+    started.clear()
+    results = []
+    thread = threading.Thread(target=lambda: (started.wait(), results.append(flight.do("key", lambda: "own call"))))
+    thread.start()
+    with pytest.raises(DeadlineExceeded):
+        flight.do("key", timed_out)
+    thread.join()
+    assert results == ["own call"]
+
+
+def test_follower_respects_its_deadline():
+    """Test that a follower stops waiting when its own deadline passes."""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    
+    def slow():
+        started.set()
+        release.wait(2.0)
+        return "late"
+    
+    leader = threading.Thread(target=lambda: flight.do("key", slow))
+    leader.start()
+    started.wait()
+    with deadline_scope(0.05):
+        with pytest.raises(DeadlineExceeded):
+            flight.do("key", lambda: "unused")
+    release.set()
+    leader.join()
+
+
+async def test_async_calls_share_one_request():
+    """Test coalescing of identical requests on the event loop."""
+    flight = SingleFlight()
+    calls = []
+    
+    async def request():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "shared"
+    
+    results = await asyncio.gather(*(flight.ado("key", request) for _ in range(3)))
+    assert results == ["shared"] * 3
+    assert len(calls) == 1
+
+
+def test_independent_requests_scope():
+    """Test the independent requests flag."""
+    assert not requests_are_independent()
+    with independent_requests():
+        assert requests_are_independent()
+    assert not requests_are_independent()
@@ -3,7 +3,8 @@ Tests for utility functions.
 """
 
 import pytest
-from just_prompt.atoms.shared.utils import split_provider_and_model, get_provider_from_prefix
+import dataclasses
+from just_prompt.atoms.shared.utils import split_provider_and_model, get_provider_from_prefix, parse_model_spec, as_model_spec
 
 
 def test_split_provider_and_model():
@@ -48,4 +49,38 @@ def test_get_provider_from_prefix():
     
     # Test invalid prefix
     with pytest.raises(ValueError):
-        get_provider_from_prefix("unknown")
\ No newline at end of file
+        get_provider_from_prefix("unknown")
+
+def test_parse_model_spec():
+    """Test parsing model strings into ModelSpecs."""
+    spec = parse_model_spec("a:claude-3-7-sonnet-20250219:4k")
+    assert spec.provider == "anthropic"
+    assert spec.model == "claude-3-7-sonnet-20250219:4k"
+    assert spec.base_model == "claude-3-7-sonnet-20250219"
+    assert spec.thinking_budget == 4096
+    assert spec.reasoning_effort is None
+    assert spec.model_string == "anthropic:claude-3-7-sonnet-20250219:4k"
+    
+    # Reasoning effort is only kept for models that support it
+    assert parse_model_spec("openai:o3-mini:high").reasoning_effort == "high"
+    assert parse_model_spec("openai:gpt-4o:high").reasoning_effort is None
+    
+    # Colons in plain model names are kept
+    spec = parse_model_spec("ollama:llama3:latest")
+    assert spec.base_model == "llama3:latest"
+    assert spec.thinking_budget == 0
+    
+    with pytest.raises(ValueError):
+        parse_model_spec("unknown:model")
+
+
+def test_parse_model_spec_is_memoized_and_immutable():
+    """Test that each model string is parsed once into a frozen, slotted spec."""
+    spec = parse_model_spec("o:gpt-4o-mini")
+    assert parse_model_spec("o:gpt-4o-mini") is spec
+    assert as_model_spec("openai", spec) is spec
+    assert as_model_spec("openai", "gpt-4o-mini") == spec
+    
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        spec.model = "gpt-4o"
+    assert not hasattr(spec, "__dict__")
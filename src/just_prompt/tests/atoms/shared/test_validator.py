@@ -11,6 +11,15 @@ from just_prompt.atoms.shared.validator import (
     validate_provider_api_keys,
     print_provider_availability
 )
+from just_prompt.atoms.shared.negative_cache import negative_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_negative_cache():
+    """Keep the availability recorded by these tests from failing later tests fast."""
+    negative_cache.clear()
+    yield
+    negative_cache.clear()
 
 
 def test_validate_models_prefixed_by_provider():
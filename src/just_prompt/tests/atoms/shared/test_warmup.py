@@ -0,0 +1,72 @@
+"""
+Tests for the background warm-up.
+"""
+
+import asyncio
+import os
+import types
+from unittest.mock import MagicMock, patch
+from just_prompt.atoms.shared import warmup as warmup_module
+from just_prompt.atoms.shared.model_catalog import ModelCatalog
+from just_prompt.atoms.shared.warmup import Warmup, READY, FAILED, providers_to_warm
+
+
+def fake_loader(provider):
+    if provider == "groq":
+        raise ConnectionError("unreachable")
+    return [f"{provider}-model-a", f"{provider}-model-b"]
+
+
+def test_warmup_reports_each_provider():
+    """Test that warm-up prefetches catalogs and records per-provider status."""
+    catalog = ModelCatalog(loader=fake_loader)
+    keys = {"OPENAI_API_KEY": "test-key", "GROQ_API_KEY": "test-key"}
+    with patch.dict(os.environ, keys), patch.object(warmup_module, "get_model_catalog", return_value=catalog):
+        warmup = Warmup(["openai", "groq"]).start()
+        assert warmup.wait(5.0)
+    
+    status = warmup.status()
+    assert status["ready"] is True
+    assert status["providers"]["openai"]["state"] == READY
+    assert status["providers"]["openai"]["models"] == 2
+    assert status["providers"]["groq"]["state"] == FAILED
+    assert "unreachable" in status["providers"]["groq"]["error"]
+    
+    # The prefetched catalog is served without another fetch
+    assert catalog.version("openai") is not None
+
+
+async def test_warmup_opens_async_connections_on_server_loop():
+    """Test that the async clients are warmed on the server's event loop, where the tools use them."""
+    loop = asyncio.get_running_loop()
+    listed_on = []
+
+    async def alist_models():
+        listed_on.append(asyncio.get_running_loop())
+        return ["echo-1"]
+
+    module = types.SimpleNamespace(alist_models=alist_models)
+    registry = MagicMock()
+    registry.resolve.return_value.module = module
+    catalog = ModelCatalog(loader=lambda provider: ["echo-1"])
+    with patch.object(warmup_module, "get_provider_registry", return_value=registry), \
+            patch.object(warmup_module, "get_model_catalog", return_value=catalog):
+        warmup = Warmup(["echo"], loop).start()
+        assert await asyncio.to_thread(warmup.wait, 5.0)
+
+    assert listed_on == [loop]
+    assert warmup.status()["providers"]["echo"]["state"] == READY
+
+
+def test_warmup_without_providers_is_ready():
+    """Test that an empty warm-up is immediately ready."""
+    assert Warmup([]).start().ready
+
+
+def test_providers_to_warm():
+    """Test that configured providers are warmed, default models' providers first."""
+    availability = {"openai": True, "anthropic": True, "gemini": False, "groq": False, "deepseek": True, "ollama": False}
+    default_models = ["a:claude-3-7-sonnet-20250219", "gemini:gemini-2.5-pro", "ollama:llama3", "o:gpt-4o", "invalid"]
+    
+    assert providers_to_warm(default_models, availability) == ["anthropic", "ollama", "openai", "deepseek"]
+    assert providers_to_warm([], {"openai": False, "ollama": False}) == []
@@ -0,0 +1,23 @@
+"""
+Shared fixtures for just-prompt tests.
+"""
+
+import pytest
+
+from just_prompt.atoms.shared import correction_memo
+from just_prompt.atoms.shared.provider_registry import get_provider_registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_provider_modules():
+    """Import provider modules anew in each test, so patched imports take effect."""
+    get_provider_registry().reset_modules()
+    yield
+    get_provider_registry().reset_modules()
+
+
+@pytest.fixture(autouse=True)
+def in_memory_correction_memo(monkeypatch):
+    """Keep model name corrections in memory, so tests never write the user's cache directory."""
+    monkeypatch.setenv(correction_memo.CORRECTION_DB_ENV, ":memory:")
+    monkeypatch.setattr(correction_memo, "_memo", correction_memo.CorrectionMemo(":memory:"))
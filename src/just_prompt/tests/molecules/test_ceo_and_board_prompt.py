@@ -139,4 +139,31 @@ def test_ceo_and_board_prompt_with_defaults(mock_prompt, mock_prompt_from_file_t
         assert content == "CEO's final decision with defaults"
     
     # Clean up environment
-    del os.environ["DEFAULT_MODELS"]
\ No newline at end of file
+    del os.environ["DEFAULT_MODELS"]
+
+@patch('just_prompt.molecules.ceo_and_board_prompt.prompt_from_file_to_file')
+@patch('just_prompt.molecules.ceo_and_board_prompt.prompt')
+def test_ceo_decides_with_quorum(mock_prompt, mock_prompt_from_file_to_file, temp_dir, prompt_file):
+    """Test that board members that timed out are left out of the CEO prompt."""
+    response_file1 = os.path.join(temp_dir, "prompt_model1.md")
+    response_file2 = os.path.join(temp_dir, "prompt_model2.md")
+    
+    with open(response_file1, 'w') as f:
+        f.write("Response from model 1")
+    with open(response_file2, 'w') as f:
+        f.write("Error (model2): Timed out: no response before the deadline")
+    
+    mock_prompt_from_file_to_file.return_value = [response_file1, response_file2]
+    mock_prompt.return_value = ["CEO's final decision"]
+    
+    ceo_and_board_prompt(
+        prompt_file,
+        output_dir=temp_dir,
+        models_prefixed_by_provider=["model1", "model2"],
+        ceo_model="ceo_model",
+        deadline_seconds=30
+    )
+    
+    ceo_prompt_arg = mock_prompt.call_args[0][0]
+    assert "<model-name>model1</model-name>" in ceo_prompt_arg
+    assert "<model-name>model2</model-name>" not in ceo_prompt_arg
@@ -4,8 +4,10 @@ Tests for prompt functionality.
 
 import pytest
 import os
+import asyncio
+from unittest.mock import patch
 from dotenv import load_dotenv
-from just_prompt.molecules.prompt import prompt
+from just_prompt.molecules.prompt import prompt, async_prompt
 
 # Load environment variables
 load_dotenv()
@@ -43,3 +45,154 @@ def test_prompt_multiple_models():
     # Check all responses contain Paris
     for r in response:
         assert "paris" in r.lower() or "Paris" in r
+
+
+async def test_async_prompt_fans_out_concurrently():
+    """Test that async_prompt runs model calls concurrently and keeps model order."""
+    async def fake_route(model_string, text):
+        # The slower model is first so ordering can't come from completion order
+        await asyncio.sleep(0.2 if model_string.endswith("slow") else 0.01)
+        return f"{model_string} says hi"
+    
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+         patch("just_prompt.molecules.prompt.ModelRouter.aroute_prompt", side_effect=fake_route):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        responses = await async_prompt("hi", ["o:slow", "a:fast", "g:fast"])
+        elapsed = loop.time() - start
+    
+    assert responses == ["o:slow says hi", "a:fast says hi", "g:fast says hi"]
+    assert elapsed < 0.35
+
+
+def test_prompt_deadline_returns_partial_results():
+    """Test that models still running at the deadline are marked as timed out."""
+    import time
+    
+    def fake_route(model_string, text):
+        time.sleep(1.0 if model_string.endswith("slow") else 0.01)
+        return f"{model_string} says hi"
+    
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+         patch("just_prompt.molecules.prompt.ModelRouter.route_prompt", side_effect=fake_route):
+        start = time.monotonic()
+        responses = prompt("hi", ["o:slow", "a:fast"], deadline_seconds=0.3)
+        elapsed = time.monotonic() - start
+    
+    assert responses[0] == "Error (o:slow): Timed out: no response before the deadline"
+    assert responses[1] == "a:fast says hi"
+    assert elapsed < 0.9
+
+
+async def test_async_prompt_deadline_cancels_late_models():
+    """Test that the async fan-out cancels models that miss the deadline."""
+    cancelled = asyncio.Event()
+    
+    async def fake_route(model_string, text):
+        if model_string.endswith("slow"):
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return f"{model_string} says hi"
+    
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+         patch("just_prompt.molecules.prompt.ModelRouter.aroute_prompt", side_effect=fake_route):
+        responses = await async_prompt("hi", ["o:slow", "a:fast"], deadline_seconds=0.2)
+    
+    assert responses == ["Error (o:slow): Timed out: no response before the deadline", "a:fast says hi"]
+    await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+
+
+def test_prompt_returns_after_min_responses():
+    """Test that prompt returns once k models succeeded, skipping failures and slow models."""
+    import time
+    
+    def fake_route(model_string, text):
+        if model_string.endswith("broken"):
+            raise ValueError("boom")
+        time.sleep(1.0 if model_string.endswith("slow") else 0.01)
+        return f"{model_string} says hi"
+    
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+         patch("just_prompt.molecules.prompt.ModelRouter.route_prompt", side_effect=fake_route):
+        start = time.monotonic()
+        responses = prompt("hi", ["o:slow", "a:broken", "g:fast", "q:fast"], min_responses=2)
+        elapsed = time.monotonic() - start
+    
+    assert responses[0] == "Error (o:slow): Skipped: enough responses arrived first"
+    assert responses[1].startswith("Error (a:broken)")
+    assert responses[2:] == ["g:fast says hi", "q:fast says hi"]
+    assert elapsed < 0.9
+
+
+async def test_async_prompt_return_first():
+    """Test that return_first cancels the models still running."""
+    async def fake_route(model_string, text):
+        await asyncio.sleep(1.0 if model_string.endswith("slow") else 0.01)
+        return f"{model_string} says hi"
+    
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+         patch("just_prompt.molecules.prompt.ModelRouter.aroute_prompt", side_effect=fake_route):
+        responses = await async_prompt("hi", ["o:slow", "a:fast"], return_first=True)
+    
+    assert responses == ["Error (o:slow): Skipped: enough responses arrived first", "a:fast says hi"]
+
+
+def test_prompt_rejects_invalid_min_responses():
+    """Test that min_responses must fit the number of models."""
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m):
+        with pytest.raises(ValueError, match="min_responses"):
+            prompt("hi", ["o:gpt-4o"], min_responses=2)
+
+
+def test_prompt_collapses_duplicate_models_unless_sampling():
+    """Test that duplicate models share one request unless sampling is requested."""
+    calls = []
+    
+    def fake_route(model_string, text):
+        calls.append(model_string)
+        return f"{model_string} answer {len(calls)}"
+    
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+         patch("just_prompt.molecules.prompt.ModelRouter.route_prompt", side_effect=fake_route):
+        responses = prompt("hi", ["o:gpt-4o", "a:claude", "o:gpt-4o"])
+        assert len(calls) == 2
+        assert responses[0] == responses[2]
+        
+        calls.clear()
+        responses = prompt("hi", ["o:gpt-4o", "o:gpt-4o"], sample=True)
+        assert len(calls) == 2
+        assert responses[0] != responses[1]
+
+
+def test_prompt_min_responses_counts_duplicate_models():
+    """Test that a collapsed call counts once for every duplicate slot it answers."""
+    import time
+    
+    def fake_route(model_string, text):
+        time.sleep(1.0 if model_string.endswith("slow") else 0.01)
+        return f"{model_string} says hi"
+    
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+         patch("just_prompt.molecules.prompt.ModelRouter.route_prompt", side_effect=fake_route):
+        start = time.monotonic()
+        responses = prompt("hi", ["o:fast", "a:slow", "o:fast"], min_responses=2)
+        elapsed = time.monotonic() - start
+    
+    assert responses == ["o:fast says hi", "Error (a:slow): Skipped: enough responses arrived first", "o:fast says hi"]
+    assert elapsed < 0.9
+
+
+async def test_async_prompt_min_responses_counts_duplicate_models():
+    """Test that the async fan-out counts a collapsed call for each of its slots."""
+    async def fake_route(model_string, text):
+        await asyncio.sleep(1.0 if model_string.endswith("slow") else 0.01)
+        return f"{model_string} says hi"
+    
+    with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+         patch("just_prompt.molecules.prompt.ModelRouter.aroute_prompt", side_effect=fake_route):
+        responses = await async_prompt("hi", ["o:fast", "o:fast", "a:slow"], min_responses=2)
+    
+    assert responses == ["o:fast says hi", "o:fast says hi", "Error (a:slow): Skipped: enough responses arrived first"]
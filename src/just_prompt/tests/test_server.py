@@ -0,0 +1,170 @@
+"""
+Tests for the MCP server helpers.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from just_prompt import server
+from just_prompt.server import ToolRunner, TOOLS, TOOL_LIST, JustPromptTools, PromptSchema, dispatch_tool
+from just_prompt.atoms.shared.cancellation import current_cancellation
+
+
+async def test_tool_runner_overlaps_blocking_calls():
+    """Test that blocking tool calls run concurrently instead of back to back."""
+    runner = ToolRunner(max_in_flight=4, max_queued=4)
+    try:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await asyncio.gather(*[
+            runner.run(lambda i=i: time.sleep(0.2) or i) for i in range(4)
+        ])
+        elapsed = loop.time() - start
+    finally:
+        runner.shutdown()
+
+    assert results == [0, 1, 2, 3]
+    # Close to the slowest call, not the sum of all of them
+    assert elapsed < 0.6
+
+
+async def test_tool_runner_keeps_event_loop_responsive():
+    """Test that the event loop keeps running while a tool blocks."""
+    runner = ToolRunner(max_in_flight=1, max_queued=1)
+    try:
+        tool = asyncio.create_task(runner.run(time.sleep, 0.3))
+        ticks = 0
+        while not tool.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+        await tool
+    finally:
+        runner.shutdown()
+
+    assert ticks > 5
+
+
+async def test_tool_runner_rejects_when_queue_full():
+    """Test that calls beyond the in-flight limit and wait queue are rejected."""
+    runner = ToolRunner(max_in_flight=1, max_queued=1)
+    try:
+        running = asyncio.create_task(runner.run(time.sleep, 0.3))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(runner.run(time.sleep, 0.01))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ValueError, match="Server busy"):
+            await runner.run(time.sleep, 0.01)
+
+        await asyncio.gather(running, queued)
+    finally:
+        runner.shutdown()
+
+
+def test_tool_runner_invalid_limits():
+    """Test that invalid limits are rejected."""
+    with pytest.raises(ValueError):
+        ToolRunner(max_in_flight=0)
+
+    with pytest.raises(ValueError):
+        ToolRunner(max_in_flight=1, max_queued=-1)
+
+
+async def test_tool_runner_cancels_token_on_client_cancel():
+    """Test that cancelling the handler cancels the tool call running in the worker."""
+    observed = {}
+    started = threading.Event()
+
+    def tool():
+        token = current_cancellation()
+        observed["token"] = token
+        started.set()
+        return token.wait(2.0)
+
+    runner = ToolRunner(max_in_flight=1, max_queued=1)
+    try:
+        task = asyncio.create_task(runner.run(tool))
+        await asyncio.to_thread(started.wait, 1.0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    finally:
+        runner.shutdown()
+
+    assert observed["token"].cancelled
+
+
+def test_tool_registry_schemas_built_once():
+    """Test that every tool is registered with a schema generated up front."""
+    assert [tool.name for tool in TOOL_LIST] == list(TOOLS)
+    assert {
+        JustPromptTools.PROMPT, JustPromptTools.PROMPT_FROM_FILE, JustPromptTools.PROMPT_FROM_FILE_TO_FILE,
+        JustPromptTools.CEO_AND_BOARD, JustPromptTools.BUSINESS_ANALYST,
+        JustPromptTools.LIST_PROVIDERS, JustPromptTools.LIST_MODELS,
+    } == set(TOOLS)
+    assert TOOLS[JustPromptTools.PROMPT].tool is TOOL_LIST[0]
+    assert TOOL_LIST[0].inputSchema == PromptSchema.model_json_schema()
+
+
+async def test_dispatch_passes_validated_arguments():
+    """Test that dispatch validates arguments once and hands the handler typed values."""
+    received = {}
+
+    def fake_prompt(text, models, **kwargs):
+        received.update(kwargs, text=text, models=models)
+        return ["4"]
+
+    runner = ToolRunner(max_in_flight=1, max_queued=1)
+    try:
+        with patch.object(server, "prompt", side_effect=fake_prompt):
+            result = await dispatch_tool(
+                JustPromptTools.PROMPT,
+                {"text": "2+2?", "models_prefixed_by_provider": ["o:gpt-4o"], "deadline_seconds": "5"},
+                runner,
+            )
+            invalid = await dispatch_tool(JustPromptTools.PROMPT, {"text": "2+2?", "cache": "never"}, runner)
+        unknown = await dispatch_tool("no_such_tool", {}, runner)
+    finally:
+        runner.shutdown()
+
+    assert result[0].text == "Model: o:gpt-4o\nResponse: 4"
+    assert received["deadline_seconds"] == 5.0
+    assert received["return_first"] is False
+    assert invalid[0].text.startswith("Error:") and "cache" in invalid[0].text
+    assert unknown[0].text == "Unknown tool: no_such_tool"
+
+
+async def test_cancelled_tool_aborts_in_flight_requests():
+    """Test that cancelling a prompt tool call aborts the provider request already sent."""
+    started = threading.Event()
+    aborted = asyncio.Event()
+
+    async def slow_route(model_string, text):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            aborted.set()
+            raise
+        return "too late"
+
+    runner = ToolRunner(max_in_flight=1, max_queued=1)
+    try:
+        with patch("just_prompt.molecules.prompt._correct_model_name", side_effect=lambda p, m, c: m), \
+             patch("just_prompt.molecules.prompt.ModelRouter.aroute_prompt", side_effect=slow_route), \
+             patch("just_prompt.molecules.prompt.ModelRouter.route_prompt") as route_prompt:
+            task = asyncio.create_task(
+                runner.run(server._handle_prompt, PromptSchema(text="2+2?", models_prefixed_by_provider=["o:gpt-4o"]))
+            )
+            await asyncio.to_thread(started.wait, 2.0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.wait_for(aborted.wait(), timeout=2.0)
+    finally:
+        runner.shutdown()
+
+    # The request ran on the event loop, not in a bulkhead thread
+    route_prompt.assert_not_called()